@@ -0,0 +1,72 @@
+"""Add full-text search index for job listings
+
+Revision ID: 3c1f7a9d2b4e
+Revises: 50579087b079
+Create Date: 2026-10-17 09:12:40.218734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f7a9d2b4e'
+down_revision = '50579087b079'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        # SQLite: tabel virtual FTS5 (external content) + trigger sinkronisasi
+        op.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS job_listings_fts USING fts5(
+                title, description, qualifications,
+                content='job_listings', content_rowid='id_job'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS job_listings_fts_ai AFTER INSERT ON job_listings BEGIN
+                INSERT INTO job_listings_fts(rowid, title, description, qualifications)
+                VALUES (new.id_job, new.title, new.description, new.qualifications);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS job_listings_fts_ad AFTER DELETE ON job_listings BEGIN
+                INSERT INTO job_listings_fts(job_listings_fts, rowid, title, description, qualifications)
+                VALUES ('delete', old.id_job, old.title, old.description, old.qualifications);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS job_listings_fts_au
+            AFTER UPDATE OF title, description, qualifications ON job_listings BEGIN
+                INSERT INTO job_listings_fts(job_listings_fts, rowid, title, description, qualifications)
+                VALUES ('delete', old.id_job, old.title, old.description, old.qualifications);
+                INSERT INTO job_listings_fts(rowid, title, description, qualifications)
+                VALUES (new.id_job, new.title, new.description, new.qualifications);
+            END
+        """)
+        # Isi indeks dari lowongan yang sudah ada
+        op.execute("INSERT INTO job_listings_fts(job_listings_fts) VALUES ('rebuild')")
+
+    elif dialect == 'mysql':
+        # MySQL (InnoDB): indeks FULLTEXT disinkronkan otomatis oleh engine
+        op.execute(
+            "ALTER TABLE job_listings "
+            "ADD FULLTEXT INDEX ft_job_listings (title, description, qualifications)"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS job_listings_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS job_listings_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS job_listings_fts_ai")
+        op.execute("DROP TABLE IF EXISTS job_listings_fts")
+
+    elif dialect == 'mysql':
+        op.drop_index('ft_job_listings', table_name='job_listings')
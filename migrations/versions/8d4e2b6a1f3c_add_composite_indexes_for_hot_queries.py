@@ -0,0 +1,73 @@
+"""Add composite indexes for hot queries
+
+Revision ID: 8d4e2b6a1f3c
+Revises: 3c1f7a9d2b4e
+Create Date: 2026-10-17 10:05:12.804417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4e2b6a1f3c'
+down_revision = '3c1f7a9d2b4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Migrasi 9e522d39eb64 menghapus indeks foreign key tanpa membuat penggantinya.
+    # Indeks di bawah ini mengikuti filter yang paling sering dipakai di app.py.
+    with op.batch_alter_table('applicants', schema=None) as batch_op:
+        batch_op.create_index('ix_applicants_id_user', ['id_user'], unique=False)
+
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.create_index('ix_companies_id_user', ['id_user'], unique=False)
+
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.create_index('ix_job_listings_is_open_posted_at', ['is_open', 'posted_at'], unique=False)
+        batch_op.create_index('ix_job_listings_id_company_posted_at', ['id_company', 'posted_at'], unique=False)
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('ix_notifications_id_user_is_read_created_at',
+                              ['id_user', 'is_read', 'created_at'], unique=False)
+
+    # Hapus lamaran ganda (simpan yang paling awal) sebelum memasang constraint UNIQUE.
+    # Subquery dibungkus tabel turunan karena MySQL tidak mengizinkan DELETE
+    # membaca tabel yang sama secara langsung.
+    op.execute("""
+        DELETE FROM applications
+        WHERE id_application NOT IN (
+            SELECT keep_id FROM (
+                SELECT MIN(id_application) AS keep_id
+                FROM applications
+                GROUP BY id_applicant, id_job
+            ) AS keepers
+        )
+    """)
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.create_index('ix_applications_id_job_status', ['id_job', 'status'], unique=False)
+        batch_op.create_index('ix_applications_id_applicant_applied_at', ['id_applicant', 'applied_at'], unique=False)
+        batch_op.create_unique_constraint('uq_applications_applicant_job', ['id_applicant', 'id_job'])
+
+
+def downgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_applications_applicant_job', type_='unique')
+        batch_op.drop_index('ix_applications_id_applicant_applied_at')
+        batch_op.drop_index('ix_applications_id_job_status')
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_id_user_is_read_created_at')
+
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_listings_id_company_posted_at')
+        batch_op.drop_index('ix_job_listings_is_open_posted_at')
+
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.drop_index('ix_companies_id_user')
+
+    with op.batch_alter_table('applicants', schema=None) as batch_op:
+        batch_op.drop_index('ix_applicants_id_user')
@@ -0,0 +1,39 @@
+"""Add indexes for admin list sorting
+
+Revision ID: a4d7e2c8b915
+Revises: f5c19d7e3a42
+Create Date: 2026-10-17 15:37:02.541186
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d7e2c8b915'
+down_revision = 'f5c19d7e3a42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Urutan default daftar admin (terbaru dulu), supaya LIMIT/OFFSET tidak perlu sort seluruh tabel
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_created_at', ['created_at'], unique=False)
+
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.create_index('ix_companies_created_at', ['created_at'], unique=False)
+
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.create_index('ix_job_listings_posted_at', ['posted_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_listings_posted_at')
+
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.drop_index('ix_companies_created_at')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_created_at')
@@ -0,0 +1,33 @@
+"""Add updated_at indexes for suggest index sync
+
+Revision ID: c29a7d4e8f16
+Revises: b83e5f1a6c27
+Create Date: 2026-10-17 19:12:45.087213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c29a7d4e8f16'
+down_revision = 'b83e5f1a6c27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Sinkronisasi index autocomplete mengambil baris dengan updated_at >= watermark
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.create_index('ix_companies_updated_at', ['updated_at'], unique=False)
+
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.create_index('ix_job_listings_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_listings_updated_at')
+
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.drop_index('ix_companies_updated_at')
@@ -0,0 +1,56 @@
+"""Add broadcast notifications
+
+Revision ID: c7a3e91f5d20
+Revises: 8d4e2b6a1f3c
+Create Date: 2026-10-17 11:31:47.552093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7a3e91f5d20'
+down_revision = '8d4e2b6a1f3c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Watermark baca/hapus notifikasi broadcast per pengguna
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('broadcast_read_id', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('broadcast_cleared_id', sa.Integer(), server_default='0', nullable=False))
+
+    # Notifikasi broadcast: id_user NULL, target ditentukan oleh kolom audience
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('audience', sa.Enum('applicant', 'company'), nullable=True))
+        batch_op.alter_column('id_user',
+               existing_type=sa.Integer(),
+               nullable=True)
+        batch_op.create_index('ix_notifications_audience_id', ['audience', 'id'], unique=False)
+
+    op.create_table('notification_reads',
+    sa.Column('id_user', sa.Integer(), nullable=False),
+    sa.Column('id_notification', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['id_notification'], ['notifications.id'], ),
+    sa.ForeignKeyConstraint(['id_user'], ['users.id_user'], ),
+    sa.PrimaryKeyConstraint('id_user', 'id_notification')
+    )
+
+
+def downgrade():
+    op.drop_table('notification_reads')
+
+    # Broadcast tidak punya pemilik, jadi tidak bisa dipertahankan saat id_user kembali NOT NULL
+    op.execute("DELETE FROM notifications WHERE id_user IS NULL")
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_audience_id')
+        batch_op.alter_column('id_user',
+               existing_type=sa.Integer(),
+               nullable=False)
+        batch_op.drop_column('audience')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('broadcast_cleared_id')
+        batch_op.drop_column('broadcast_read_id')
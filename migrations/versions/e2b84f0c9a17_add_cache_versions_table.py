@@ -0,0 +1,29 @@
+"""Add cache_versions table
+
+Revision ID: e2b84f0c9a17
+Revises: c7a3e91f5d20
+Create Date: 2026-10-17 13:02:19.370145
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b84f0c9a17'
+down_revision = 'c7a3e91f5d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    cache_versions = op.create_table('cache_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(cache_versions, [{'name': 'jobs', 'version': 1}])
+
+
+def downgrade():
+    op.drop_table('cache_versions')
@@ -0,0 +1,47 @@
+"""Add application counters to job_listings
+
+Revision ID: f5c19d7e3a42
+Revises: e2b84f0c9a17
+Create Date: 2026-10-17 14:21:47.118903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5c19d7e3a42'
+down_revision = 'e2b84f0c9a17'
+branch_labels = None
+depends_on = None
+
+COUNTERS = (
+    ('applications_total', None),
+    ('applications_pending', 'pending'),
+    ('applications_accepted', 'accepted'),
+    ('applications_rejected', 'rejected'),
+)
+
+
+def upgrade():
+    with op.batch_alter_table('job_listings', schema=None) as batch_op:
+        for column, _ in COUNTERS:
+            batch_op.add_column(sa.Column(column, sa.Integer(), nullable=False, server_default='0'))
+
+    # Isi penghitung dari data lamaran yang sudah ada (updated_at tidak ikut berubah)
+    assignments = []
+    for column, status in COUNTERS:
+        condition = f" AND a.status = '{status}'" if status else ''
+        assignments.append(
+            f"{column} = (SELECT COUNT(*) FROM applications a "
+            f"WHERE a.id_job = job_listings.id_job{condition})"
+        )
+    op.execute(f"UPDATE job_listings SET {', '.join(assignments)}, updated_at = updated_at")
+
+
+def downgrade():
+    # SQLite >= 3.35 mendukung DROP COLUMN langsung. recreate='never' mencegah batch
+    # membuat ulang tabel, yang akan menghapus trigger sinkronisasi job_listings_fts.
+    with op.batch_alter_table('job_listings', schema=None, recreate='never') as batch_op:
+        for column, _ in reversed(COUNTERS):
+            batch_op.drop_column(column)
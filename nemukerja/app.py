@@ -1,7 +1,6 @@
-import os
-import uuid
+import time
 import click
-from flask import Flask, render_template, redirect, url_for, flash, request, jsonify, send_from_directory, current_app
+from flask import Flask, render_template, redirect, url_for, flash, request, jsonify, make_response, current_app, Response, stream_with_context
 from nemukerja.extensions import db, login_manager, bcrypt, mail
 from flask_migrate import Migrate
 from flask_login import login_user, login_required, logout_user, current_user
@@ -12,21 +11,221 @@ from nemukerja.forms import (
     CompanyProfileForm,
     AddJobForm, 
     ApplyForm, 
+    ImportJobsForm,
     ReactiveForm,
     ResetPasswordForm,
     ApplicantProfileForm
 )
-from werkzeug.utils import secure_filename
 import json
-from sqlalchemy import or_, desc
-from sqlalchemy.orm import joinedload
+from sqlalchemy import or_, desc, func, case, true, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, contains_eager
 from itsdangerous import URLSafeTimedSerializer as Serializer
-from flask_mail import Message
 from flask import current_app
 from nemukerja.config import Config
+from nemukerja.search import apply_search, rebuild_search_index
+from nemukerja.pagination import keyset_paginate, paginate_query, paginate_ids, sort_query
+from nemukerja import notifications
+from nemukerja import counters
+from nemukerja import bench
+from nemukerja.query_budget import query_budget, init_query_budget
+from nemukerja import metrics
+from nemukerja import exports
+from nemukerja import imports
+from nemukerja import mail_queue
+from nemukerja.passwords import hasher, HashingBusy
+from nemukerja.identity import load_identity
+from nemukerja.page_cache import page_cache, normalized_query
+from nemukerja.facets import job_facets
+from nemukerja.suggest import suggest_index, SUGGEST_FIELDS
+from nemukerja.recommend import recommended_jobs
+from nemukerja.ranking import job_fit_scores, fit_breakdown
+from nemukerja.review import bulk_set_status, REVIEW_STATUSES
+from nemukerja.cv_storage import store_cv, migrate_legacy_files, cv_response, CVRejected
+from werkzeug.exceptions import RequestEntityTooLarge
+from nemukerja.caching import TTLCache, JOBS_VERSION, get_version, make_etag, is_public_request, conditional_response
 
 PER_PAGE = 6
+
+# Urutan daftar lowongan untuk paginasi keyset: terbaru dulu, id_job sebagai pemecah seri
+JOB_SORT_KEYS = ((JobListing.posted_at, 'desc'), (JobListing.id, 'desc'))
+
+# Daftar admin: jumlah baris per halaman dan kolom yang boleh dipakai untuk ?sort=
+ADMIN_PER_PAGE = 25
+APPLICATIONS_PER_PAGE = 50
+ADMIN_USER_SORTS = {
+    'id': User.id,
+    'email': User.email,
+    'role': User.role,
+    'registered': User.created_at,
+}
+ADMIN_COMPANY_SORTS = {
+    'id': Company.id,
+    'name': Company.company_name,
+    'registered': Company.created_at,
+}
+ADMIN_JOB_SORTS = {
+    'id': JobListing.id,
+    'title': JobListing.title,
+    'company': Company.company_name,
+    'slots': JobListing.slots,
+    'applicants': JobListing.applications_total,
+    'posted': JobListing.posted_at,
+}
+
+def build_job_query(args):
+    """Membangun kueri lowongan terbuka dari parameter filter (q, location, company, salary).
+
+    Mengembalikan tuple (query, sort_keys) untuk dipakai oleh keyset_paginate().
+    Hasil pencarian kata kunci diurutkan dulu berdasarkan relevansi.
+    """
+    q = args.get('q', '').strip()
+    location = args.get('location', '')
+    company_name = args.get('company', '')
+    min_salary_str = args.get('salary', '')
+
+    # Mulai kueri dasar
+    query = JobListing.query.filter_by(is_open=True)
+    sort_keys = list(JOB_SORT_KEYS)
+
+    # 1. Filter Kata Kunci (q) - memakai indeks full-text, diurutkan berdasarkan relevansi
+    if q:
+        query, score_key = apply_search(query, q)
+        if score_key is not None:
+            sort_keys.insert(0, score_key)
+
+    # 2. Filter Lokasi
+    if location:
+        query = query.filter(JobListing.location.ilike(f"%{location}%"))
+
+    # 3. Filter Perusahaan (Membutuhkan JOIN)
+    if company_name:
+        query = query.join(Company).filter(Company.company_name.ilike(f"%{company_name}%"))
+
+    # 4. Filter Gaji Minimal
+    if min_salary_str:
+        try:
+            min_salary = int(min_salary_str)
+            # Filter pekerjaan yang gaji minimalnya (salary_min) lebih besar
+            # atau sama dengan yang diminta pengguna.
+            query = query.filter(JobListing.salary_min >= min_salary)
+        except ValueError:
+            pass # Abaikan jika input gajinya tidak valid
+
+    return query, sort_keys
     
+def job_detail_data(job, used_slots):
+    """Data JSON untuk modal detail lowongan."""
+    return {
+        'id': job.id,
+        'title': job.title,
+        'location': job.location,
+        'description': job.description,
+        'qualifications': job.qualifications,
+        'company': job.company.company_name if job.company else "N/A",
+        'company_id': job.company.id if job.company else None,
+        'applied_count': used_slots,
+        'slots': job.slots,
+        'is_open': job.is_open,
+        'salary_min': job.salary_min,
+        'salary_max': job.salary_max
+    }
+
+# Statistik dashboard admin di-cache sebentar agar refresh berulang tidak menghitung ulang
+_admin_stats_cache = TTLCache(maxsize=1)
+
+# Peta status untuk terjemahan
+STATUS_LABELS = {
+    'pending': {'en': 'Status Pending', 'id': 'Status Menunggu'},
+    'accepted': {'en': 'Status Accepted', 'id': 'Status Diterima'},
+    'rejected': {'en': 'Status Rejected', 'id': 'Status Ditolak'}
+}
+
+def admin_dashboard_stats():
+    """Menghitung semua angka dan aktivitas terbaru untuk dashboard admin.
+
+    Semua COUNT dihitung dalam satu kueri (agregasi bersyarat per tabel),
+    ditambah tiga kueri "terbaru" dengan relasi yang di-eager-load.
+    """
+    user_stats = db.session.query(
+        func.count(User.id).label('total_users'),
+        func.coalesce(func.sum(case((User.role == 'applicant', 1), else_=0)), 0).label('user_count'),
+        func.coalesce(func.sum(case((User.role == 'company', 1), else_=0)), 0).label('company_user_count')
+    ).subquery()
+    job_stats = db.session.query(
+        func.count(JobListing.id).label('total_jobs'),
+        func.coalesce(func.sum(case((JobListing.is_open == True, 1), else_=0)), 0).label('open_jobs')
+    ).subquery()
+    company_stats = db.session.query(func.count(Company.id).label('total_companies')).subquery()
+    application_stats = db.session.query(func.count(Application.id).label('total_applications')).subquery()
+
+    # Setiap subquery menghasilkan satu baris, jadi join "ON true" tetap satu baris
+    counts = db.session.query(user_stats, job_stats, company_stats, application_stats).select_from(
+        user_stats.join(job_stats, true()).join(company_stats, true()).join(application_stats, true())
+    ).one()
+
+    recent_users = User.query.options(
+        joinedload(User.applicant_profile), joinedload(User.company_profile)
+    ).order_by(desc(User.created_at)).limit(10).all()
+    recent_jobs = JobListing.query.options(
+        joinedload(JobListing.company)
+    ).order_by(desc(JobListing.posted_at)).limit(10).all()
+    recent_applications = Application.query.options(
+        joinedload(Application.applicant), joinedload(Application.job)
+    ).order_by(desc(Application.applied_at)).limit(10).all()
+
+    recent_activity = []
+
+    for user in recent_users:
+        role_type = 'user' if user.role == 'applicant' else ('company' if user.role == 'company' else 'user')
+        role_name_en = user.role.capitalize()
+        role_name_id = 'Pencari Kerja' if user.role == 'applicant' else ('Perusahaan' if user.role == 'company' else user.role.capitalize())
+
+        recent_activity.append({
+            'type': role_type,
+            'desc_en': f"User '{user.name}' ({role_name_en}) registered.",
+            'desc_id': f"Pengguna '{user.name}' ({role_name_id}) telah terdaftar.",
+            'date': user.created_at
+        })
+
+    for job in recent_jobs:
+        company_name = job.company.company_name if job.company else 'N/A'
+        recent_activity.append({
+            'type': 'job',
+            'desc_en': f"New job '{job.title}' posted by {company_name}.",
+            'desc_id': f"Pekerjaan baru '{job.title}' diposting oleh {company_name}.",
+            'date': job.posted_at
+        })
+
+    for app in recent_applications:
+        # Dapatkan terjemahan status dari peta
+        status_translation = STATUS_LABELS.get(app.status, {'en': f'Status {app.status}', 'id': f'Status {app.status}'})
+
+        recent_activity.append({
+            'type': 'application',
+            'desc_en': f"'{app.applicant.full_name}' applied for '{app.job.title}' ({status_translation['en']}).",
+            'desc_id': f"'{app.applicant.full_name}' melamar untuk '{app.job.title}' ({status_translation['id']}).",
+            'date': app.applied_at
+        })
+
+    recent_activity = [a for a in recent_activity if a['date'] is not None]
+    recent_activity.sort(key=lambda x: x['date'], reverse=True)
+    recent_activity = recent_activity[:20]
+    for activity in recent_activity:
+        activity['date'] = activity['date'].strftime('%Y-%m-%d %H:%M')
+
+    return {
+        'total_users': counts.total_users,
+        'total_companies': counts.total_companies,
+        'total_jobs': counts.total_jobs,
+        'total_applications': counts.total_applications,
+        'user_count': counts.user_count,
+        'company_user_count': counts.company_user_count,
+        'open_jobs': counts.open_jobs,
+        'closed_jobs': counts.total_jobs - counts.open_jobs,
+        'recent_activity': recent_activity
+    }
+
 def get_reset_token(user, expires_sec=1800):
     """Membuat token reset password yang aman dan berbatas waktu."""
     s = Serializer(current_app.config['SECRET_KEY'], salt='password-reset-salt')
@@ -42,18 +241,17 @@ def verify_reset_token(token, expires_sec=1800):
     return User.query.get(user_id)
 
 def send_reset_email(user):
-    """Membuat dan mengirim email reset password."""
+    """Membuat email reset password dan memasukkannya ke antrean (dikirim oleh flask mail-worker)."""
     token = get_reset_token(user)
-    msg = Message('Permintaan Reset Password - NemuKerja',
-                  sender=current_app.config['MAIL_USERNAME'],
-                  recipients=[user.email])
-    msg.body = f'''Untuk mereset password Anda, silakan kunjungi link berikut:
+    body = f'''Untuk mereset password Anda, silakan kunjungi link berikut:
 {url_for('reset_token', token=token, _external=True)}
 
 Jika Anda tidak merasa meminta reset password ini, abaikan email ini.
 Link ini akan kedaluwarsa dalam 30 menit.
 '''
-    mail.send(msg)
+    mail_queue.enqueue('Permintaan Reset Password - NemuKerja', [user.email], body,
+                       sender=current_app.config['MAIL_USERNAME'])
+    db.session.commit()
 
 def create_app():
     app = Flask(__name__)
@@ -61,14 +259,18 @@ def create_app():
 
     db.init_app(app)
     bcrypt.init_app(app)
+    hasher.init_app(app)
+    page_cache.init_app(app)
     login_manager.init_app(app)
     mail.init_app(app)
     login_manager.login_view = 'login'
     migrate = Migrate(app, db)
+    metrics.init_metrics(app)
+    init_query_budget(app)
 
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        return load_identity(int(user_id))
 
     # Admin authorization decorator - INSIDE create_app
     def admin_required(f):
@@ -86,154 +288,127 @@ def create_app():
     @login_required
     @admin_required
     def admin_dashboard():
-        total_users = User.query.count()
-        total_companies = Company.query.count()
-        total_jobs = JobListing.query.count()
-        total_applications = Application.query.count()
-        user_count = User.query.filter_by(role='applicant').count()
-        company_user_count = User.query.filter_by(role='company').count()
-        
-        # PERBAIKAN: Kueri job stats yang lebih efisien
-        open_jobs = JobListing.query.filter_by(is_open=True).count()
-        closed_jobs = JobListing.query.filter_by(is_open=False).count()
-        
-        recent_users = User.query.order_by(desc(User.created_at)).limit(10).all()
-        recent_jobs = JobListing.query.join(Company).order_by(desc(JobListing.posted_at)).limit(10).all()
-        recent_applications = Application.query.join(Applicant).join(JobListing).order_by(desc(Application.applied_at)).limit(10).all()
-        
-        recent_activity = []
-        
-        # Peta status untuk terjemahan
-        status_map = {
-            'pending': {'en': 'Status Pending', 'id': 'Status Menunggu'},
-            'accepted': {'en': 'Status Accepted', 'id': 'Status Diterima'},
-            'rejected': {'en': 'Status Rejected', 'id': 'Status Ditolak'}
-        }
-        
-        for user in recent_users:
-            role_type = 'user' if user.role == 'applicant' else ('company' if user.role == 'company' else 'user')
-            role_name_en = user.role.capitalize()
-            role_name_id = 'Pencari Kerja' if user.role == 'applicant' else ('Perusahaan' if user.role == 'company' else user.role.capitalize())
-
-            # PERBAIKAN: Buat string EN dan ID secara langsung
-            recent_activity.append({
-                'type': role_type,
-                'desc_en': f"User '{user.name}' ({role_name_en}) registered.",
-                'desc_id': f"Pengguna '{user.name}' ({role_name_id}) telah terdaftar.",
-                'date': user.created_at
-            })
-            
-        for job in recent_jobs:
-            # PERBAIKAN: Buat string EN dan ID secara langsung
-            recent_activity.append({
-                'type': 'job',
-                'desc_en': f"New job '{job.title}' posted by {job.company.company_name}.",
-                'desc_id': f"Pekerjaan baru '{job.title}' diposting oleh {job.company.company_name}.",
-                'date': job.posted_at
-            })
-            
-        for app in recent_applications:
-            # Dapatkan terjemahan status dari peta
-            status_translation = status_map.get(app.status, {'en': f'Status {app.status}', 'id': f'Status {app.status}'})
-
-            # PERBAIKAN: Buat string EN dan ID secara langsung
-            recent_activity.append({
-                'type': 'application',
-                'desc_en': f"'{app.applicant.full_name}' applied for '{app.job.title}' ({status_translation['en']}).",
-                'desc_id': f"'{app.applicant.full_name}' melamar untuk '{app.job.title}' ({status_translation['id']}).",
-                'date': app.applied_at
-            })
-            
-        recent_activity.sort(key=lambda x: x['date'], reverse=True)
-        recent_activity = recent_activity[:20]
-            
-        recent_activity.sort(key=lambda x: x['date'], reverse=True)
-        recent_activity = recent_activity[:20]
-        for activity in recent_activity:
-            activity['date'] = activity['date'].strftime('%Y-%m-%d %H:%M')
-        
-        return render_template('admin_dashboard.html',
-                             total_users=total_users,
-                             total_companies=total_companies,
-                             total_jobs=total_jobs,
-                             total_applications=total_applications,
-                             user_count=user_count,
-                             company_user_count=company_user_count,
-                             open_jobs=open_jobs,
-                             closed_jobs=closed_jobs,
-                             recent_activity=recent_activity)
+        stats = _admin_stats_cache.get_or_set(
+            'admin_dashboard', admin_dashboard_stats, ttl=current_app.config['ADMIN_STATS_TTL']
+        )
+        return render_template('admin_dashboard.html', **stats)
 
     @app.route('/admin/users')
+    @query_budget(3)
     @login_required
     @admin_required
     def admin_users():
-        # from sqlalchemy.orm import joinedload (Pindah ke atas)
-        users = User.query.options(joinedload(User.applicant_profile), joinedload(User.company_profile)).all()
-        return render_template('admin_users.html', users=users)
+        # Proyeksi kolom yang ditampilkan saja (bukan objek User + profil), per halaman
+        name = func.coalesce(Applicant.full_name, Company.company_name)
+        query = (db.session.query(
+                    User.id, User.email, User.role, User.created_at,
+                    name.label('name'),
+                    func.coalesce(Applicant.phone, Company.phone).label('phone'),
+                    # UserMixin: belum ada kolom status, semua akun dianggap aktif
+                    true().label('is_active'))
+                 .outerjoin(Applicant, Applicant.id_user == User.id)
+                 .outerjoin(Company, Company.id_user == User.id))
+
+        q = request.args.get('q', '').strip()
+        if q:
+            query = query.filter(or_(User.email.ilike(f"%{q}%"), name.ilike(f"%{q}%")))
+        role = request.args.get('role')
+        if role in ('applicant', 'company', 'admin'):
+            query = query.filter(User.role == role)
+
+        query, sort, direction = sort_query(query, ADMIN_USER_SORTS, request.args.get('sort'),
+                                            request.args.get('dir'), ('registered', 'desc'), User.id)
+        users = paginate_query(query, per_page=ADMIN_PER_PAGE, count_ttl=current_app.config['ADMIN_STATS_TTL'])
+        return render_template('admin_users.html', users=users, sort=sort, direction=direction)
 
     @app.route('/admin/companies')
+    @query_budget(3)
     @login_required
     @admin_required
     def admin_companies():
-        companies = Company.query.all()
-        return render_template('admin_companies.html', companies=companies)
+        base = db.session.query(Company).join(User, User.id == Company.id_user)
+        q = request.args.get('q', '').strip()
+        if q:
+            base = base.filter(or_(Company.company_name.ilike(f"%{q}%"), User.email.ilike(f"%{q}%")))
+
+        # Jumlah lowongan hanya dihitung untuk baris di halaman ini (subquery berkorelasi)
+        jobs_count = (select(func.count(JobListing.id))
+                      .where(JobListing.id_company == Company.id)
+                      .scalar_subquery())
+        query = base.with_entities(Company.id, Company.company_name, User.email, Company.phone,
+                                   Company.created_at, jobs_count.label('jobs_count'))
+        query, sort, direction = sort_query(query, ADMIN_COMPANY_SORTS, request.args.get('sort'),
+                                            request.args.get('dir'), ('registered', 'desc'), Company.id)
+        companies = paginate_query(query, per_page=ADMIN_PER_PAGE, count_query=base.with_entities(Company.id),
+                                   count_ttl=current_app.config['ADMIN_STATS_TTL'])
+        return render_template('admin_companies.html', companies=companies, sort=sort, direction=direction)
 
     @app.route('/admin/jobs')
+    @query_budget(3)
     @login_required
     @admin_required
     def admin_jobs():
-        jobs = JobListing.query.all()
-        return render_template('admin_jobs.html', jobs=jobs)
+        base = JobListing.query.join(Company, Company.id == JobListing.id_company)
+        q = request.args.get('q', '').strip()
+        if q:
+            base, _ = apply_search(base, q)
+        status = request.args.get('status')
+        if status in ('open', 'closed'):
+            base = base.filter(JobListing.is_open == (status == 'open'))
+
+        query = base.with_entities(JobListing.id, JobListing.title, Company.company_name,
+                                   JobListing.location, JobListing.salary_min, JobListing.salary_max,
+                                   JobListing.slots, JobListing.applications_total,
+                                   JobListing.is_open, JobListing.posted_at)
+        query, sort, direction = sort_query(query, ADMIN_JOB_SORTS, request.args.get('sort'),
+                                            request.args.get('dir'), ('posted', 'desc'), JobListing.id)
+        jobs = paginate_query(query, per_page=ADMIN_PER_PAGE, count_query=base.with_entities(JobListing.id),
+                              count_ttl=current_app.config['ADMIN_STATS_TTL'])
+        return render_template('admin_jobs.html', jobs=jobs, sort=sort, direction=direction)
+
+    @app.route('/admin/metrics')
+    @login_required
+    @admin_required
+    def admin_metrics():
+        # Format teks Prometheus; metrik per proses worker
+        return Response(metrics.render_prometheus(db.engine),
+                        content_type='text/plain; version=0.0.4; charset=utf-8')
 
     @app.route('/')
     def index():
         # Ambil parameter filter dari URL (GET request)
-        page = request.args.get('page', 1, type=int)
-        q = request.args.get('q', '')
-        location = request.args.get('location', '')
-        company_name = request.args.get('company', '')
-        min_salary_str = request.args.get('salary', '')
+        cursor = request.args.get('cursor')
 
-        # Mulai kueri dasar
-        query = JobListing.query.filter_by(is_open=True)
+        def render():
+            # Eksekusi kueri
+            query, sort_keys = build_job_query(request.args)
+            # Nama perusahaan ditampilkan di setiap kartu lowongan
+            jobs_pagination = keyset_paginate(query.options(joinedload(JobListing.company)), sort_keys,
+                                              cursor=cursor, per_page=PER_PAGE)
+
+            # Kirim 'request.args' ke template agar formulir tetap terisi
+            return render_template('index.html',
+                                   jobs_pagination=jobs_pagination,
+                                   facets=job_facets(query, request.args),
+                                   guest=True,
+                                   request=request)
 
-        # 1. Filter Kata Kunci (q)
-        if q:
-            search_term = f"%{q}%"
-            query = query.filter(or_(
-                JobListing.title.ilike(search_term),
-                JobListing.description.ilike(search_term),
-                JobListing.qualifications.ilike(search_term)
-            ))
-
-        # 2. Filter Lokasi
-        if location:
-            query = query.filter(JobListing.location.ilike(f"%{location}%"))
-
-        # 3. Filter Perusahaan (Membutuhkan JOIN)
-        if company_name:
-            query = query.join(Company).filter(Company.company_name.ilike(f"%{company_name}%"))
-
-        # 4. Filter Gaji Minimal
-        if min_salary_str:
-            try:
-                min_salary = int(min_salary_str)
-                # Filter pekerjaan yang gaji minimalnya (salary_min) lebih besar
-                # atau sama dengan yang diminta pengguna.
-                query = query.filter(JobListing.salary_min >= min_salary)
-            except ValueError:
-                pass # Abaikan jika input gajinya tidak valid
-
-        # Eksekusi kueri
-        jobs_pagination = query.order_by(JobListing.posted_at.desc()).paginate(
-            page=page, per_page=PER_PAGE, error_out=False
-        )
-        
-        # Kirim 'request.args' ke template agar formulir tetap terisi
-        return render_template('index.html', 
-                               jobs_pagination=jobs_pagination, 
-                               guest=True, 
-                               request=request)
+        # Pengunjung anonim: halaman hanya berubah jika ada lowongan yang berubah, jadi HTML-nya
+        # di-cache per kombinasi filter dan versi data lowongan
+        if is_public_request():
+            version = get_version(JOBS_VERSION)
+            query_string = normalized_query(request.args)
+            etag = make_etag('index', version, query_string)
+            cache_key = f"index|{current_app.config['HTTP_CACHE_VERSION']}|{version}|{query_string}"
+            return conditional_response(etag, lambda: page_cache.get_or_render(cache_key, render))
+        return render()
+
+    def password_busy(template, form):
+        """Antrean hashing penuh: tampilkan form lagi dengan 503 agar klien mencoba sebentar lagi."""
+        flash('password_busy', 'warning')
+        response = make_response(render_template(template, form=form), 503)
+        response.headers['Retry-After'] = '5'
+        return response
 
     @app.route('/login', methods=['GET', 'POST'])
     def login():
@@ -242,7 +417,15 @@ def create_app():
         form = LoginForm()
         if form.validate_on_submit():
             user = User.query.filter_by(email=form.email.data.lower()).first()
-            if user and bcrypt.check_password_hash(user.password, form.password.data):
+            try:
+                valid = hasher.check(user.password if user else None, form.password.data)
+                if valid and hasher.needs_rehash(user.password):
+                    # Cost factor sudah dinaikkan sejak hash ini dibuat
+                    user.password = hasher.hash(form.password.data)
+                    db.session.commit()
+            except HashingBusy:
+                return password_busy('login.html', form)
+            if valid:
                 login_user(user, remember=form.remember.data)
                 return redirect(url_for('dashboard'))
             flash('login_invalid', 'danger')
@@ -258,7 +441,10 @@ def create_app():
                 flash('register_email_exists', 'danger')
                 return redirect(url_for('register'))
 
-            pw_hash = bcrypt.generate_password_hash(form.password.data).decode('utf-8')
+            try:
+                pw_hash = hasher.hash(form.password.data)
+            except HashingBusy:
+                return password_busy('register.html', form)
             new_user = User(
                 email=form.email.data.lower(),
                 password=pw_hash,
@@ -311,8 +497,10 @@ def create_app():
         
         form = ResetPasswordForm()
         if form.validate_on_submit():
-            pw_hash = bcrypt.generate_password_hash(form.password.data).decode('utf-8')
-            user.password = pw_hash
+            try:
+                user.password = hasher.hash(form.password.data)
+            except HashingBusy:
+                return password_busy('reset_token.html', form)
             db.session.commit()
             flash('reset_success', 'success') # DISESUAIKAN
             return redirect(url_for('login'))
@@ -320,6 +508,7 @@ def create_app():
         return render_template('reset_token.html', form=form)
 
     @app.route('/my-applications')
+    @query_budget(3)
     @login_required
     def my_applications():
         if current_user.role != 'applicant':
@@ -331,11 +520,14 @@ def create_app():
             flash('applicant_profile_not_found', 'danger') # DISESUAIKAN
             return redirect(url_for('dashboard'))
         
-        applications = Application.query.filter_by(id_applicant=applicant.id).order_by(Application.applied_at.desc()).all()
+        applications = (Application.query.filter_by(id_applicant=applicant.id)
+                        .options(joinedload(Application.job).joinedload(JobListing.company))
+                        .order_by(Application.applied_at.desc()).all())
         
         return render_template('my_applications.html', applications=applications, title_suffix="All Applications")
 
     @app.route('/my-pending')
+    @query_budget(3)
     @login_required
     def my_pending_applications():
         if current_user.role != 'applicant':
@@ -351,11 +543,12 @@ def create_app():
         applications = Application.query.filter_by(
             id_applicant=applicant.id,
             status='pending'
-        ).order_by(Application.applied_at.desc()).all()
+        ).options(joinedload(Application.job).joinedload(JobListing.company)).order_by(Application.applied_at.desc()).all()
         
         return render_template('my_applications.html', applications=applications, title_suffix="Pending Applications")
 
     @app.route('/my-accepted')
+    @query_budget(3)
     @login_required
     def my_accepted_applications():
         if current_user.role != 'applicant':
@@ -371,7 +564,7 @@ def create_app():
         applications = Application.query.filter_by(
             id_applicant=applicant.id,
             status='accepted'
-        ).order_by(Application.applied_at.desc()).all()
+        ).options(joinedload(Application.job).joinedload(JobListing.company)).order_by(Application.applied_at.desc()).all()
         
         return render_template('my_applications.html', applications=applications, title_suffix="Accepted Applications")
 
@@ -380,9 +573,74 @@ def create_app():
     @app.route('/notifications')
     @login_required
     def get_notifications():
-        notifications = Notification.query.filter_by(id_user=current_user.id).order_by(Notification.created_at.desc()).limit(10).all()
-        return jsonify([n.to_dict() for n in notifications])
+        # Notifikasi personal + broadcast digabung saat dibaca.
+        # ?since=<id> hanya mengembalikan notifikasi yang lebih baru (delta)
+        since = request.args.get('since', 0, type=int)
+        return jsonify(notifications.get_user_notifications(current_user, limit=10, since=since))
+
+    @app.route('/notifications/stream')
+    @login_required
+    def notification_stream():
+        """Server-Sent Events: mengirim notifikasi baru begitu tersedia (satu koneksi per tab)."""
+        # EventSource mengirim Last-Event-ID saat menyambung ulang
+        since = request.headers.get('Last-Event-ID', type=int)
+        if since is None:
+            since = request.args.get('since', 0, type=int)
+
+        config = current_app.config
+        if not notifications.open_stream(config['NOTIFICATION_MAX_STREAMS']):
+            # Semua slot stream terpakai: browser beralih ke polling ?since= (lihat script.js)
+            retry = config['NOTIFICATION_STREAM_RETRY']
+            return Response(f'retry: {retry * 1000}\n\n', status=503, mimetype='text/event-stream',
+                            headers={'Retry-After': str(retry), 'Cache-Control': 'no-cache'})
+
+        viewer = notifications.viewer_snapshot(current_user)
+        lifetime = config['NOTIFICATION_STREAM_TIMEOUT']
+        recheck = config['NOTIFICATION_RECHECK_SECONDS']
+
+        def events(last_id):
+            # Browser menunggu 5 detik sebelum menyambung ulang
+            yield 'retry: 5000\n\n'
+            deadline = time.monotonic() + lifetime
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                items, last_id = notifications.wait_for_notifications(
+                    viewer, last_id, timeout=min(remaining, recheck), recheck=recheck
+                )
+                if items:
+                    yield f"id: {last_id}\nevent: notifications\ndata: {json.dumps(items)}\n\n"
+                else:
+                    # Heartbeat agar proxy tidak menutup koneksi yang diam
+                    yield ': keep-alive\n\n'
+
+        response = Response(stream_with_context(events(since)), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+        # Dipanggil server saat koneksi selesai atau klien memutus, juga jika body belum sempat dibaca
+        response.call_on_close(notifications.close_stream)
+        return response
     
+    @app.route('/api/suggest')
+    @query_budget(3)
+    def suggest():
+        # Autocomplete lokasi / nama perusahaan dari index prefix in-memory (lihat nemukerja/suggest.py)
+        field = request.args.get('field', '')
+        if field not in SUGGEST_FIELDS:
+            return jsonify({'error': 'field must be one of: ' + ', '.join(SUGGEST_FIELDS)}), 400
+        limit = min(max(request.args.get('limit', 8, type=int), 1), 20)
+        suggest_index.ensure_fresh(app.config['SUGGEST_SYNC_SECONDS'], app.config['SUGGEST_REBUILD_SECONDS'])
+        response = jsonify(suggest_index.search(field, request.args.get('q', ''), limit))
+        if suggest_index.built_at is None:
+            # Index pertama masih dibangun di thread latar: jawaban kosong ini jangan di-cache
+            response.cache_control.no_store = True
+        else:
+            response.cache_control.public = True
+            response.cache_control.max_age = 60
+        return response
+
     # NEW API: Mendapatkan Job ID dari Application ID (untuk navigasi notifikasi)
     @app.route('/api/get_job_id/<int:application_id>')
     @login_required
@@ -405,16 +663,15 @@ def create_app():
     @login_required
     def mark_notification_read(notification_id):
         notification = Notification.query.get_or_404(notification_id)
-        if notification.id_user != current_user.id:
+        if not notifications.mark_read(current_user, notification):
             return jsonify({'error': 'Unauthorized'}), 403
-        notification.is_read = True
         db.session.commit()
         return jsonify({'success': True})
 
     @app.route('/notifications/read-all', methods=['POST'])
     @login_required
     def mark_all_notifications_read():
-        Notification.query.filter_by(id_user=current_user.id, is_read=False).update({'is_read': True})
+        notifications.mark_all_read(current_user)
         db.session.commit()
         return jsonify({'success': True})
 
@@ -447,9 +704,10 @@ def create_app():
         return redirect(url_for('index'))
 
     @app.route('/dashboard')
+    @query_budget(10)
     @login_required
     def dashboard():
-        page = request.args.get('page', 1, type=int)
+        cursor = request.args.get('cursor')
         if current_user.role == 'admin':
             return redirect(url_for('admin_dashboard'))
         elif current_user.role == 'company':
@@ -458,13 +716,17 @@ def create_app():
                 flash('company_profile_required', 'warning') # DISESUAIKAN
                 return redirect(url_for('company_profile'))
 
-            jobs_query = JobListing.query.filter_by(id_company=company.id).order_by(JobListing.posted_at.desc())
-            jobs_pagination = jobs_query.paginate(
-                page=page, per_page=PER_PAGE, error_out=False
+            jobs_query = JobListing.query.filter_by(id_company=company.id)
+            # count_ttl=0: perusahaan harus langsung melihat jumlah yang tepat setelah menambah lowongan
+            jobs_pagination = keyset_paginate(
+                jobs_query, JOB_SORT_KEYS, cursor=cursor, per_page=PER_PAGE, count_ttl=0
             )
             total_jobs = jobs_pagination.total # Ambil total dari pagination
-            total_applications = sum(len(job.applications) for job in jobs_pagination.items) # Hitung dari item halaman ini (atau bisa di-query terpisah jika perlu)
-            recent_applications = db.session.query(Application).join(JobListing).filter(JobListing.id_company == company.id).order_by(Application.applied_at.desc()).limit(5).all()
+            total_applications = sum(job.applications_total for job in jobs_pagination.items) # Hitung dari item halaman ini, dari kolom penghitung
+            recent_applications = (db.session.query(Application).join(JobListing)
+                                   .filter(JobListing.id_company == company.id)
+                                   .options(contains_eager(Application.job), joinedload(Application.applicant))
+                                   .order_by(Application.applied_at.desc()).limit(5).all())
 
             return render_template('dashboard_company.html',
                                      jobs_pagination=jobs_pagination,
@@ -474,54 +736,26 @@ def create_app():
                                      recent_applications=recent_applications,
                                      request=request)
         else: 
-            # Ambil parameter filter dari URL (GET request)
-            q = request.args.get('q', '')
-            location = request.args.get('location', '')
-            company_name = request.args.get('company', '')
-            min_salary_str = request.args.get('salary', '')
-
-            # Mulai kueri dasar
-            query = JobListing.query.filter_by(is_open=True)
-
-            # 1. Filter Kata Kunci (q)
-            if q:
-                search_term = f"%{q}%"
-                query = query.filter(or_(
-                    JobListing.title.ilike(search_term),
-                    JobListing.description.ilike(search_term),
-                    JobListing.qualifications.ilike(search_term)
-                ))
-
-            # 2. Filter Lokasi
-            if location:
-                query = query.filter(JobListing.location.ilike(f"%{location}%"))
-
-            # 3. Filter Perusahaan (Membutuhkan JOIN)
-            if company_name:
-                query = query.join(Company).filter(Company.company_name.ilike(f"%{company_name}%"))
-
-            # 4. Filter Gaji Minimal
-            if min_salary_str:
-                try:
-                    min_salary = int(min_salary_str)
-                    query = query.filter(JobListing.salary_min >= min_salary)
-                except ValueError:
-                    pass # Abaikan jika input gajinya tidak valid
-
             # Eksekusi kueri
-            jobs_pagination = query.order_by(JobListing.posted_at.desc()).paginate(
-                page=page, per_page=PER_PAGE, error_out=False
-            )
+            query, sort_keys = build_job_query(request.args)
+            # Nama perusahaan ditampilkan di setiap kartu lowongan
+            jobs_pagination = keyset_paginate(query.options(joinedload(JobListing.company)), sort_keys,
+                                              cursor=cursor, per_page=PER_PAGE)
             
+            # Jumlah lamaran per status dalam satu GROUP BY, tanpa memuat semua lamaran
             applicant_profile = current_user.applicant_profile
-            total_app = applicant_profile.applications if applicant_profile else []
-            pending_app_count = len([app for app in total_app if app.status == 'pending'])
-            accepted_app_count = len([app for app in total_app if app.status == 'accepted'])
+            status_counts = dict(db.session.query(Application.status, func.count(Application.id))
+                                 .filter(Application.id_applicant == applicant_profile.id)
+                                 .group_by(Application.status).all()) if applicant_profile else {}
+            pending_app_count = status_counts.get('pending', 0)
+            accepted_app_count = status_counts.get('accepted', 0)
 
             return render_template('dashboard_user.html', 
                                    jobs_pagination=jobs_pagination, 
+                                   facets=job_facets(query, request.args),
+                                   recommended=recommended_jobs(applicant_profile, app.config['RECOMMEND_TOP_K']),
                                    guest=False,
-                                   total_app_count=len(total_app),
+                                   total_app_count=sum(status_counts.values()),
                                    pending_app_count=pending_app_count,
                                    accepted_app_count=accepted_app_count,
                                    request=request)
@@ -577,39 +811,33 @@ def create_app():
     @app.route('/company/<int:company_id>')
     def public_company_profile(company_id):
         """Halaman profil publik untuk sebuah perusahaan."""
-        company = Company.query.get_or_404(company_id)
-        # Ambil hanya lowongan yang sedang dibuka oleh perusahaan ini
-        open_jobs = JobListing.query.filter_by(
-            id_company=company_id, 
-            is_open=True
-        ).order_by(JobListing.posted_at.desc()).all()
-        
-        return render_template('public_company_profile.html', company=company, jobs=open_jobs)
+        def render():
+            company = Company.query.get_or_404(company_id)
+            # Hanya lowongan yang sedang dibuka, per halaman, dan hanya kolom yang ditampilkan
+            open_jobs = (db.session.query(JobListing.id, JobListing.title, JobListing.location,
+                                          JobListing.salary_min, JobListing.posted_at)
+                         .filter(JobListing.id_company == company_id, JobListing.is_open == True))
+            jobs_pagination = keyset_paginate(open_jobs, JOB_SORT_KEYS, cursor=request.args.get('cursor'),
+                                              per_page=PER_PAGE)
+
+            return render_template('public_company_profile.html', company=company,
+                                   jobs=jobs_pagination.items, jobs_pagination=jobs_pagination)
+
+        if is_public_request():
+            etag = make_etag('company', company_id, get_version(JOBS_VERSION), request.query_string.decode('utf-8'))
+            return conditional_response(etag, render)
+        return render()
 
     @app.route('/job/<int:job_id>')
     def job_detail(job_id):
-        job = JobListing.query.get_or_404(job_id)
-        
-        # Hitung pelamar aktif (Pending atau Diterima)
-        used_slots = Application.query.filter_by(id_job=job.id).filter(
-            Application.status.in_(['pending', 'accepted'])
-        ).count()
+        job = JobListing.query.options(joinedload(JobListing.company)).get_or_404(job_id)
         
-        data = {
-            'id': job.id,
-            'title': job.title,
-            'location': job.location,
-            'description': job.description,
-            'qualifications': job.qualifications,
-            'company': job.company.company_name if job.company else "N/A",
-            'company_id': job.company.id if job.company else None,
-            'applied_count': used_slots,
-            'slots': job.slots,
-            'is_open': job.is_open,
-            'salary_min': job.salary_min,
-            'salary_max': job.salary_max
-        }
-        return jsonify(data)
+        # Pelamar aktif (Pending atau Diterima), dari kolom penghitung
+        used_slots = counters.used_slots(job)
+
+        # Data tidak bergantung pada pengguna, jadi boleh di-cache CDN / reverse proxy
+        etag = make_etag('job', job.id, job.updated_at, job.company.updated_at if job.company else None, used_slots)
+        return conditional_response(etag, lambda: jsonify(job_detail_data(job, used_slots)))
 
     @app.route('/apply/<int:job_id>', methods=['GET', 'POST'])
     @login_required
@@ -622,12 +850,8 @@ def create_app():
         applicant = current_user.applicant_profile
         
         # --- NEW SLOT CHECK LOGIC ---
-        # Hitung slot yang terpakai (Pending atau Diterima)
-        used_slots = Application.query.filter_by(id_job=job.id).filter(
-            Application.status.in_(['pending', 'accepted'])
-        ).count()
-        
-        if used_slots >= job.slots:
+        # Cek awal dari kolom penghitung; pemesanan slot yang sebenarnya atomik saat submit
+        if counters.used_slots(job) >= job.slots:
             flash('apply_slot_full', 'danger') # DISESUAIKAN
             return redirect(url_for('dashboard'))
 
@@ -649,52 +873,67 @@ def create_app():
             flash('apply_already_applied', 'warning') # DISESUAIKAN
             return redirect(url_for('dashboard'))
 
-        form = ApplyForm()
+        # Batas body untuk route ini: CV + sedikit ruang untuk field lain. Body yang lebih
+        # besar ditolak (413) dari header Content-Length, sebelum dibaca atau ditulis ke disk.
+        request.max_content_length = current_app.config['CV_MAX_BYTES'] + 64 * 1024
+        try:
+            form = ApplyForm()
+        except RequestEntityTooLarge:
+            flash('apply_cv_too_large', 'danger')
+            return redirect(url_for('apply', job_id=job_id))
+
         if form.validate_on_submit():
             # Handle CV upload
             cv_file = form.cv_file.data
             if cv_file:
                 try:
-                    # Generate unique filename
-                    original_filename = secure_filename(cv_file.filename)
-                    file_ext = os.path.splitext(original_filename)[1]
-                    unique_filename = f"{uuid.uuid4().hex}{file_ext}"
-                    
-                    # Ensure upload directory exists
-                    upload_dir = os.path.join(current_app.root_path, 'static', 'uploads', 'cv')
-                    os.makedirs(upload_dir, exist_ok=True)
-                    
-                    # Save file
-                    file_path = os.path.join(upload_dir, unique_filename)
-                    cv_file.save(file_path)
-                    
-                    # Update applicant with CV path (using existing cv_path field)
-                    applicant.cv_path = unique_filename
-                    db.session.commit()
-                    
+                    # Disimpan berdasarkan hash isi: PDF yang sama tidak disimpan dua kali
+                    cv_path = store_cv(cv_file)
+                    if applicant.cv_path != cv_path:
+                        applicant.cv_path = cv_path
+                        db.session.commit()
+                except CVRejected as e:
+                    flash('apply_cv_too_large' if e.reason == 'too_large' else 'apply_cv_not_pdf', 'danger')
+                    return redirect(url_for('apply', job_id=job_id))
                 except Exception as e:
                     flash('apply_cv_error', 'danger') # DISESUAIKAN
                     return redirect(url_for('apply', job_id=job_id))
 
-            # Create application
-            application = Application(
-                id_applicant=applicant.id,
-                id_job=job.id,
-                notes=form.cover_letter.data
-            )
-            db.session.add(application)
-            db.session.commit()
-            
-            # Create notification for company when application is received
-            notification = Notification(
-                id_user=job.company.id_user,
-                title="New Application Received",
-                message=f"{current_user.applicant_profile.full_name} applied for {job.title}",
-                type='application_received',
-                related_id=application.id
-            )
-            db.session.add(notification)
-            db.session.commit()
+            # Nilai yang dipakai di dalam transaksi (rollback saat retry meng-expire objek ORM)
+            applicant_id, applicant_name = applicant.id, applicant.full_name
+            company_user_id, job_title = job.company.id_user, job.title
+            cover_letter = form.cover_letter.data
+
+            def reserve_and_apply():
+                # Pesan slot dulu (UPDATE bersyarat, gagal cepat jika penuh), lalu buat lamaran
+                if not counters.reserve_slot(job_id):
+                    return None
+                application = Application(id_applicant=applicant_id, id_job=job_id, notes=cover_letter)
+                db.session.add(application)
+                db.session.flush()
+
+                # Create notification for company when application is received
+                db.session.add(Notification(
+                    id_user=company_user_id,
+                    title="New Application Received",
+                    message=f"{applicant_name} applied for {job_title}",
+                    type='application_received',
+                    related_id=application.id
+                ))
+                return application
+
+            try:
+                application = counters.run_with_retry(reserve_and_apply)
+            except IntegrityError:
+                # Constraint uq_applications_applicant_job: request ganda yang lolos cek di atas
+                flash('apply_already_applied', 'warning')
+                return redirect(url_for('dashboard'))
+
+            if application is None:
+                # Slot habis atau lowongan ditutup sejak cek di atas
+                job = JobListing.query.get_or_404(job_id)
+                flash('apply_job_closed' if not job.is_open else 'apply_slot_full', 'danger')
+                return redirect(url_for('dashboard'))
             
             flash('apply_success', 'success') # DISESUAIKAN
             return redirect(url_for('dashboard'))
@@ -702,7 +941,7 @@ def create_app():
         return render_template('apply.html', form=form, job=job)
 
     # ADD new route for viewing CV
-    @app.route('/cv/<filename>')
+    @app.route('/cv/<path:filename>')
     @login_required
     def view_cv(filename):
         # Security check - only company can view CV
@@ -710,10 +949,7 @@ def create_app():
             flash('unauthorized', 'danger') # DISESUAIKAN
             return redirect(url_for('dashboard'))
         
-        return send_from_directory(
-            os.path.join(current_app.root_path, 'static', 'uploads', 'cv'),
-            filename
-        )
+        return cv_response(filename)
     
     @app.route('/company/job/<int:job_id>/close', methods=['POST'])
     @login_required
@@ -756,15 +992,18 @@ def create_app():
         job_title = job.title
         
         # Collect IDs of users who applied
-        applicant_users = [app.applicant.user for app in job.applications]
+        applicant_user_ids = [user_id for (user_id,) in db.session.query(Applicant.id_user)
+                              .join(Application).filter(Application.id_job == job.id)]
 
+        # Hapus lamaran dalam satu DELETE, bukan memuat semuanya untuk cascade ORM.
+        # Penghitung ikut terhapus bersama baris lowongannya.
+        Application.query.filter_by(id_job=job.id).delete(synchronize_session=False)
         db.session.delete(job)
-        db.session.commit()
         
         # Create notifications for relevant applicants
-        for user in applicant_users:
+        for user_id in applicant_user_ids:
             notification = Notification(
-                id_user=user.id,
+                id_user=user_id,
                 title="Job Posting Removed",
                 message=f"The job '{job_title}' you applied for has been removed by the company.",
                 type='job_posted',
@@ -801,25 +1040,44 @@ def create_app():
                 salary_max=form.salary_max.data or 0
             )
             db.session.add(new_job)
-            db.session.commit()
+            db.session.flush()
             
-            # Create notifications for all applicants when new job is posted
-            applicants = Applicant.query.all()
-            for applicant in applicants:
-                notification = Notification(
-                    id_user=applicant.id_user,
-                    title="New Job Posted",
-                    message=f"A new job '{new_job.title}' has been posted by {company.company_name}",
-                    type='job_posted',
-                    related_id=new_job.id
-                )
-                db.session.add(notification)
+            # Satu notifikasi broadcast untuk semua pelamar (bukan satu baris per pelamar)
+            notifications.broadcast(
+                'applicant',
+                title="New Job Posted",
+                message=f"A new job '{new_job.title}' has been posted by {company.company_name}",
+                type='job_posted',
+                related_id=new_job.id
+            )
             db.session.commit()
             
             flash('job_added', 'success') # DISESUAIKAN
             return redirect(url_for('dashboard'))
         return render_template('add_job.html', form=form)
 
+    @app.route('/company/jobs/import', methods=['GET', 'POST'])
+    @login_required
+    def import_jobs():
+        if current_user.role != 'company':
+            flash('company_only', 'danger')
+            return redirect(url_for('dashboard'))
+
+        company = current_user.company_profile
+        if not company:
+            flash('company_profile_required', 'warning')
+            return redirect(url_for('company_profile'))
+
+        form = ImportJobsForm()
+        report = None
+        if form.validate_on_submit():
+            upload = form.jobs_file.data
+            rows = imports.read_rows(upload.stream, imports.import_format(upload.filename))
+            report = imports.import_jobs(company, rows,
+                                         batch_size=app.config['JOB_IMPORT_BATCH_SIZE'],
+                                         max_rows=app.config['JOB_IMPORT_MAX_ROWS'])
+        return render_template('import_jobs.html', form=form, report=report)
+
     @app.route('/company/job/<int:job_id>/edit', methods=['GET', 'POST'])
     @login_required
     def edit_job(job_id):
@@ -841,6 +1099,7 @@ def create_app():
         return render_template('edit_job.html', form=form, job=job)
 
     @app.route('/company/applications')
+    @query_budget(7)
     @login_required
     def company_applications():
         if current_user.role != 'company':
@@ -849,8 +1108,74 @@ def create_app():
         if not company:
             return redirect(url_for('dashboard'))
 
-        applications = db.session.query(Application).join(JobListing).filter(JobListing.id_company == company.id).order_by(Application.applied_at.desc()).all()
-        return render_template('company_applications.html', applications=applications)
+        jobs = (db.session.query(JobListing.id, JobListing.title)
+                .filter(JobListing.id_company == company.id)
+                .order_by(JobListing.posted_at.desc()).all())
+        job = None
+        job_id = request.args.get('job_id', type=int)
+        if job_id:
+            job = JobListing.query.filter_by(id=job_id, id_company=company.id).first()
+
+        base = db.session.query(Application).join(JobListing).filter(JobListing.id_company == company.id)
+        if job:
+            base = base.filter(Application.id_job == job.id)
+        query = base.options(contains_eager(Application.job),
+                             joinedload(Application.applicant).joinedload(Applicant.user))
+
+        # Skor kecocokan hanya relatif terhadap satu lowongan, jadi urut "fit" butuh filter lowongan
+        scores, ranked = job_fit_scores(job) if job else ({}, [])
+        sort = 'fit' if job and request.args.get('sort') == 'fit' else 'applied'
+        if sort == 'fit':
+            applications = paginate_ids(ranked, lambda ids: query.filter(Application.id.in_(ids)).all(),
+                                        per_page=APPLICATIONS_PER_PAGE)
+        else:
+            applications = paginate_query(query.order_by(Application.applied_at.desc(), Application.id.desc()),
+                                          per_page=APPLICATIONS_PER_PAGE,
+                                          count_query=base.with_entities(Application.id), count_ttl=0)
+        return render_template('company_applications.html', applications=applications, jobs=jobs,
+                               job=job, scores=scores, sort=sort)
+
+    def export_scope():
+        """Batas data export: perusahaan hanya datanya sendiri, admin boleh memilih ?company_id=.
+
+        Mengembalikan (diizinkan, company_id); company_id None berarti semua perusahaan.
+        """
+        if current_user.role == 'company':
+            company = current_user.company_profile
+            return (company is not None), (company.id if company else None)
+        if current_user.role == 'admin':
+            return True, request.args.get('company_id', type=int)
+        return False, None
+
+    @app.route('/export/applications.<any(csv, ndjson):fmt>')
+    @query_budget(4)
+    @login_required
+    def export_applications(fmt):
+        allowed, company_id = export_scope()
+        if not allowed:
+            flash('unauthorized', 'danger')
+            return redirect(url_for('dashboard'))
+
+        statement = exports.applications_statement(
+            company_id=company_id,
+            job_id=request.args.get('job_id', type=int),
+            status=request.args.get('status')
+        )
+        return exports.export_response(statement, fmt, 'applications')
+
+    @app.route('/export/jobs.<any(csv, ndjson):fmt>')
+    @query_budget(4)
+    @login_required
+    def export_jobs(fmt):
+        allowed, company_id = export_scope()
+        if not allowed:
+            flash('unauthorized', 'danger')
+            return redirect(url_for('dashboard'))
+
+        status = request.args.get('status')
+        is_open = {'open': True, 'closed': False}.get(status)
+        statement = exports.jobs_statement(company_id=company_id, is_open=is_open)
+        return exports.export_response(statement, fmt, 'jobs')
 
     @app.route('/company/application/<int:application_id>/accept', methods=['POST'])
     @login_required
@@ -863,6 +1188,7 @@ def create_app():
             flash('unauthorized_app', 'danger') # DISESUAIKAN
             return redirect(url_for('company_applications'))
         
+        counters.record_status_change(application.id_job, application.status, 'accepted')
         application.status = 'accepted'
         db.session.commit()
         
@@ -891,6 +1217,7 @@ def create_app():
             flash('unauthorized_app', 'danger') # DISESUAIKAN
             return redirect(url_for('company_applications'))
         
+        counters.record_status_change(application.id_job, application.status, 'rejected')
         application.status = 'rejected'
         db.session.commit()
         
@@ -908,6 +1235,41 @@ def create_app():
         flash('app_rejected', 'info') # DISESUAIKAN
         return redirect(url_for('view_application', application_id=application_id))
 
+    @app.route('/company/applications/status', methods=['POST'])
+    @query_budget(8)
+    @login_required
+    def bulk_application_status():
+        if current_user.role != 'company':
+            return redirect(url_for('dashboard'))
+        company = current_user.company_profile
+        if not company:
+            return redirect(url_for('dashboard'))
+
+        # Kembali ke halaman daftar yang sama (filter, urutan, halaman)
+        back = {key: request.form[key] for key in ('job_id', 'sort', 'page') if request.form.get(key)}
+        status = request.form.get('status')
+        job_id = request.form.get('job_id', type=int)
+        application_ids = request.form.getlist('application_ids', type=int)
+        all_pending = job_id is not None and request.form.get('scope') == 'pending'
+        if status not in REVIEW_STATUSES or not (all_pending or application_ids):
+            flash('apps_bulk_none', 'info')
+            return redirect(url_for('company_applications', **back))
+
+        # Kepemilikan dicek di dalam bulk_set_status (lamaran perusahaan lain diabaikan)
+        changed, skipped = bulk_set_status(company.id, status,
+                                           application_ids=None if all_pending else application_ids,
+                                           job_id=job_id,
+                                           from_status='pending' if all_pending else None)
+        db.session.commit()
+        if changed:
+            notifications.notify_waiters()
+            flash('apps_bulk_updated', 'success')
+        elif not skipped:
+            flash('apps_bulk_none', 'info')
+        if skipped:
+            flash('apps_bulk_slots_full', 'warning')
+        return redirect(url_for('company_applications', **back))
+
     @app.route('/company/application/<int:application_id>')
     @login_required
     def view_application(application_id):
@@ -918,7 +1280,9 @@ def create_app():
         if application.job.company.user.id != current_user.id:
             flash('unauthorized_view_app', 'danger') # DISESUAIKAN
             return redirect(url_for('company_applications'))
-        return render_template('view_application.html', application=application)
+        fit, matched, missing = fit_breakdown(application)
+        return render_template('view_application.html', application=application,
+                               fit=fit, matched=matched, missing=missing)
 
     @app.route('/about')
     def about():
@@ -935,9 +1299,8 @@ def create_app():
     @app.route('/notifications/clear-all', methods=['POST'])
     @login_required
     def clear_all_notifications():
-        # Menghapus semua notifikasi milik pengguna
-        # FIX: Menambahkan synchronize_session=False untuk batch delete agar commit berhasil di DB
-        Notification.query.filter_by(id_user=current_user.id).delete(synchronize_session=False)
+        # Menghapus semua notifikasi personal dan menggeser watermark broadcast pengguna
+        notifications.clear_all(current_user)
         db.session.commit()
         return jsonify({'success': True})
     
@@ -952,7 +1315,7 @@ def create_app():
             print(f"Error: Email '{email}' sudah terdaftar.")
             return
 
-        pw_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        pw_hash = hasher.hash(password)
         new_admin = User(
             email=email.lower(),
             password=pw_hash,
@@ -962,6 +1325,135 @@ def create_app():
         db.session.commit()
         print(f"Sukses! Admin user '{email}' telah dibuat.")
 
+    @app.cli.command("reconcile-counters")
+    @click.option("--dry-run", is_flag=True, help="Hanya tampilkan selisih, tanpa memperbaiki.")
+    def reconcile_counters_command(dry_run):
+        """Mencocokkan ulang penghitung lamaran di job_listings dengan tabel applications.
+        Contoh: flask reconcile-counters --dry-run
+        """
+        drift = counters.reconcile_counters()
+        for item in drift:
+            changes = ', '.join(f"{column} {item['before'][column]} -> {item['after'][column]}"
+                                for column in counters.COUNTER_COLUMNS
+                                if item['before'][column] != item['after'][column])
+            print(f"Lowongan {item['id_job']}: {changes}")
+        if dry_run:
+            db.session.rollback()
+            print(f"{len(drift)} lowongan tidak sesuai (dry run, tidak ada perubahan).")
+        else:
+            db.session.commit()
+            print(f"Sukses! {len(drift)} lowongan diperbaiki.")
+
+    @app.cli.command("stress-apply")
+    @click.option("--threads", default=32, help="Jumlah thread yang melamar bersamaan.")
+    @click.option("--applicants", default=400, help="Jumlah pelamar.")
+    @click.option("--slots", default=25, help="Kuota lowongan.")
+    def stress_apply(threads, applicants, slots):
+        """Uji beban pemesanan slot: banyak thread melamar ke satu lowongan (SQLite sementara).
+        Contoh: flask stress-apply --threads 64 --slots 10
+        """
+        stats = bench.stress_reservations(threads=threads, applicants=applicants, slots=slots)
+        print(f"Diterima {stats['reserved']}, penuh {stats['full']}, gagal {stats['failed']}, "
+              f"retry {stats['retries']}, {stats['elapsed_s']:.2f} detik")
+        print(f"Slot {stats['slots']}, penghitung {stats['counter_used']}, baris applications {stats['rows']}")
+        if not (stats['reserved'] == stats['counter_used'] == stats['rows'] == min(slots, applicants)):
+            raise click.ClickException("Jumlah slot tidak sesuai!")
+        print("Sukses! Kuota tidak terlampaui.")
+
+    @app.cli.command("bench-bulk-status")
+    @click.option("--applications", default=2000, help="Jumlah lamaran per jalur.")
+    def bench_bulk_status(applications):
+        """Benchmark ubah status lamaran satu per satu vs bulk (SQLite sementara).
+        Contoh: flask bench-bulk-status --applications 2000
+        """
+        stats = bench.benchmark_bulk_status(applications=applications)
+        print(f"{'path':<8} {'seconds':>9} {'commits':>8} {'notifications':>14} {'rejected':>9}")
+        for name in ('per_row', 'bulk'):
+            row = stats[name]
+            print(f"{name:<8} {row['seconds']:>9.2f} {row['commits']:>8} {row['notifications']:>14} "
+                  f"{row['counter_rejected']:>9}")
+        print(f"Bulk {stats['per_row']['seconds'] / stats['bulk']['seconds']:.0f}x lebih cepat.")
+
+    @app.cli.command("import-jobs")
+    @click.argument("company_email")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--format", "fmt", type=click.Choice(['csv', 'json', 'ndjson']),
+                  help="Format file (default: dari ekstensi).")
+    def import_jobs_command(company_email, path, fmt):
+        """Mengimpor lowongan dari file CSV/JSON/NDJSON untuk perusahaan dengan email login tersebut.
+        Contoh: flask import-jobs hr@example.com lowongan.csv
+        """
+        user = User.query.filter_by(email=company_email, role='company').first()
+        if not user or not user.company_profile:
+            raise click.ClickException(f"Perusahaan dengan email '{company_email}' tidak ditemukan.")
+        fmt = fmt or imports.import_format(path)
+        if fmt is None:
+            raise click.ClickException("Format file tidak dikenali, gunakan --format.")
+        with open(path, 'rb') as source:
+            report = imports.import_jobs(user.company_profile, imports.read_rows(source, fmt),
+                                         batch_size=app.config['JOB_IMPORT_BATCH_SIZE'],
+                                         max_rows=app.config['JOB_IMPORT_MAX_ROWS'])
+        for line, errors in report['errors']:
+            for field, messages in errors.items():
+                print(f"Baris {line if line is not None else '-'}: {field}: {'; '.join(messages)}")
+        print(f"Sukses! {report['imported']} lowongan diimpor dalam {report['batches']} batch, "
+              f"{len(report['errors'])} baris gagal.")
+
+    @app.cli.command("cv-migrate")
+    def cv_migrate():
+        """Memindahkan CV lama (satu direktori datar) ke layout berbasis hash dan memperbarui cv_path."""
+        moved = migrate_legacy_files()
+        updated = 0
+        for old_name, new_path in moved.items():
+            updated += Applicant.query.filter_by(cv_path=old_name).update(
+                {'cv_path': new_path}, synchronize_session=False)
+        db.session.commit()
+        print(f"Sukses! {len(moved)} file dipindahkan, {updated} pelamar diperbarui.")
+
+    @app.cli.command("mail-worker")
+    @click.option("--once", is_flag=True, help="Kirim semua email yang sudah waktunya lalu berhenti.")
+    def mail_worker(once):
+        """Mengirim antrean email keluar dengan satu koneksi SMTP yang dipakai ulang.
+
+        Untuk pengujian lokal: python -m aiosmtpd -n -l localhost:8025 lalu jalankan
+        dengan MAIL_SERVER=localhost MAIL_PORT=8025 MAIL_USE_TLS=0.
+        """
+        worker = mail_queue.MailWorker()
+        stats = worker.run(app.config['MAIL_QUEUE_BATCH_SIZE'], app.config['MAIL_QUEUE_POLL_SECONDS'], once=once)
+        print(f"Selesai: {stats['sent']} terkirim, {stats['retry']} dijadwalkan ulang, {stats['failed']} gagal.")
+
+    @app.cli.command("search-reindex")
+    def search_reindex():
+        """Membangun ulang indeks full-text lowongan (FTS5 / FULLTEXT)."""
+        with db.engine.begin() as conn:
+            rebuild_search_index(conn)
+        print("Sukses! Indeks pencarian telah dibangun ulang.")
+
+    @app.cli.command("bench-search")
+    @click.option("--sizes", default="10000,100000,1000000", help="Jumlah lowongan, dipisah koma.")
+    @click.option("--repeat", default=20, help="Jumlah pengulangan per kueri.")
+    def bench_search(sizes, repeat):
+        """Benchmark latensi pencarian FTS vs LIKE pada database SQLite sementara.
+        Contoh: flask bench-search --sizes 10000,100000
+        """
+        size_list = [int(size) for size in sizes.split(',') if size.strip()]
+        print(f"{'rows':>10} {'query':<14} {'fts (ms)':>10} {'like (ms)':>10}")
+        for row in bench.benchmark_search(size_list, repeat=repeat):
+            print(f"{row['size']:>10} {row['query']:<14} {row['fts_ms']:>10.2f} {row['like_ms']:>10.2f}")
+
+    @app.cli.command("bench-recommend")
+    @click.option("--jobs", default=1000000, help="Jumlah lowongan sintetis.")
+    @click.option("--queries", default=200, help="Jumlah query rekomendasi.")
+    def bench_recommend(jobs, queries):
+        """Benchmark index rekomendasi (memori, waktu bangun, latensi) pada korpus sintetis.
+        Contoh: flask bench-recommend --jobs 200000
+        """
+        stats = bench.benchmark_recommend(jobs=jobs, queries=queries)
+        print(f"{stats['jobs']} lowongan, {stats['postings']} posting, {stats['memory_mb']:.0f} MB, "
+              f"dibangun {stats['build_s']:.1f} detik")
+        print(f"Latensi median {stats['median_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+              f"recall {stats['recall']:.2f}")
+
     return app
 
 if __name__ == '__main__':
@@ -0,0 +1,339 @@
+"""Uji beban dan benchmark di database SQLite sementara (dipakai oleh CLI dan test).
+
+Harness di sini hanya menyiapkan data dan mengukur; logika yang diuji tetap
+diimpor dari modul produksinya (counters, review, search, recommend).
+"""
+import itertools
+import os
+import queue
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.exc import OperationalError, IntegrityError
+from sqlalchemy.orm import Session
+
+from nemukerja import counters, recommend
+from nemukerja.counters import reserve_slot, run_with_retry
+from nemukerja.extensions import db
+from nemukerja.models import User, Applicant, Company, JobListing, Application, Notification
+from nemukerja.review import bulk_set_status, status_notification
+from nemukerja.search import _fts5_query
+
+
+@contextmanager
+def scratch_database(tables, path=None, **connect_args):
+    """Engine SQLite (file, supaya bisa dibagi antar koneksi/thread) dengan `tables` sudah dibuat.
+
+    Tanpa `path` dipakai file sementara yang dihapus setelah selesai.
+    """
+    owned_path = path is None
+    if owned_path:
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args=connect_args)
+    try:
+        db.metadata.create_all(engine, tables=[model.__table__ for model in tables])
+        yield engine
+    finally:
+        engine.dispose()
+        if owned_path:
+            os.remove(path)
+
+
+def stress_reservations(threads=32, applicants=400, slots=25, path=None, attempts=8):
+    """Uji beban reserve_slot(): banyak thread melamar ke satu lowongan sekaligus.
+
+    Mengembalikan dict berisi jumlah lamaran yang diterima, ditolak karena penuh,
+    gagal, jumlah retry, penghitung akhir dan jumlah baris applications.
+    """
+    # Timeout lock dibuat pendek agar jalur retry benar-benar teruji
+    with scratch_database([User, Applicant, Company, JobListing, Application], path, timeout=0.05) as engine:
+        with engine.begin() as conn:
+            conn.execute(User.__table__.insert(), [
+                {'email': f'stress{i}@example.com', 'password': 'x', 'role': 'applicant'}
+                for i in range(applicants + 1)
+            ])
+            conn.execute(Company.__table__.insert(), [{'id_user': 1, 'company_name': 'Stress Corp'}])
+            conn.execute(Applicant.__table__.insert(), [
+                {'id_user': i + 2, 'full_name': f'Pelamar {i}'} for i in range(applicants)
+            ])
+            conn.execute(JobListing.__table__.insert(), [{
+                'id_company': 1, 'title': 'Stress', 'description': '-', 'qualifications': '-',
+                'slots': slots, 'is_open': True,
+            }])
+            job_id = conn.execute(JobListing.__table__.select()).first().id_job
+
+        pending = queue.Queue()
+        for applicant_id in range(1, applicants + 1):
+            pending.put(applicant_id)
+        stats = {'reserved': 0, 'full': 0, 'failed': 0, 'retries': 0}
+        lock = threading.Lock()
+        start_gate = threading.Barrier(threads)
+
+        def worker():
+            session = Session(engine)
+            start_gate.wait()
+            while True:
+                try:
+                    applicant_id = pending.get_nowait()
+                except queue.Empty:
+                    break
+                tries = [0]
+
+                def work():
+                    tries[0] += 1
+                    if not reserve_slot(job_id, session=session):
+                        return False
+                    session.add(Application(id_applicant=applicant_id, id_job=job_id))
+                    session.flush()
+                    return True
+
+                try:
+                    outcome = 'reserved' if run_with_retry(work, session=session, attempts=attempts) else 'full'
+                except (OperationalError, IntegrityError):
+                    outcome = 'failed'
+                with lock:
+                    stats[outcome] += 1
+                    stats['retries'] += tries[0] - 1
+            session.close()
+
+        started = time.perf_counter()
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        stats['elapsed_s'] = time.perf_counter() - started
+
+        with engine.connect() as conn:
+            job = conn.execute(JobListing.__table__.select()).first()
+            stats['slots'] = slots
+            stats['counter_used'] = job.applications_pending + job.applications_accepted
+            stats['rows'] = conn.execute(select(func.count()).select_from(Application.__table__)).scalar()
+    return stats
+
+
+def _set_status_per_row(session, application_id, status):
+    # Langkah yang sama dengan accept_application()/reject_application(): dua commit per lamaran
+    application = session.get(Application, application_id)
+    counters.record_status_change(application.id_job, application.status, status, session=session)
+    application.status = status
+    session.commit()
+    session.add(Notification(**status_notification(application.applicant.id_user, application.id,
+                                                   application.job.title, status)))
+    session.commit()
+
+
+def benchmark_bulk_status(applications=2000, path=None):
+    """Membandingkan perubahan status per lamaran vs bulk_set_status().
+
+    Dua lowongan dengan `applications` lamaran pending masing-masing: satu
+    ditolak satu per satu, satu lagi ditolak sekaligus. Mengembalikan dict
+    berisi waktu (detik), jumlah commit dan jumlah notifikasi per jalur.
+    """
+    tables = [User, Applicant, Company, JobListing, Application, Notification]
+    with scratch_database(tables, path) as engine:
+        with engine.begin() as conn:
+            conn.execute(User.__table__.insert(), [
+                {'email': f'bench{i}@example.com', 'password': 'x', 'role': 'applicant'}
+                for i in range(applications + 1)
+            ])
+            conn.execute(Company.__table__.insert(), [{'id_user': 1, 'company_name': 'Bench Corp'}])
+            conn.execute(Applicant.__table__.insert(), [
+                {'id_user': i + 2, 'full_name': f'Pelamar {i}'} for i in range(applications)
+            ])
+            conn.execute(JobListing.__table__.insert(), [{
+                'id_company': 1, 'title': f'Bench {i}', 'description': '-', 'qualifications': '-',
+                'slots': applications, 'is_open': True,
+                'applications_total': applications, 'applications_pending': applications,
+            } for i in range(2)])
+            job_ids = [row.id_job for row in conn.execute(select(JobListing.__table__.c.id_job))]
+            conn.execute(Application.__table__.insert(), [
+                {'id_applicant': applicant_id, 'id_job': job_id, 'status': 'pending'}
+                for job_id in job_ids for applicant_id in range(1, applications + 1)
+            ])
+
+        stats = {}
+        with Session(engine) as session:
+            per_row_ids = session.scalars(select(Application.id).where(Application.id_job == job_ids[0])).all()
+            started = time.perf_counter()
+            for application_id in per_row_ids:
+                _set_status_per_row(session, application_id, 'rejected')
+            stats['per_row'] = {'seconds': time.perf_counter() - started, 'commits': 2 * len(per_row_ids)}
+
+        with Session(engine) as session:
+            started = time.perf_counter()
+            changed, _ = bulk_set_status(1, 'rejected', job_id=job_ids[1], from_status='pending', session=session)
+            session.commit()
+            stats['bulk'] = {'seconds': time.perf_counter() - started, 'commits': 1, 'changed': changed}
+
+        with Session(engine) as session:
+            for key, job_id in zip(('per_row', 'bulk'), job_ids):
+                stats[key]['counter_rejected'] = session.get(JobListing, job_id).applications_rejected
+                stats[key]['notifications'] = session.scalar(
+                    select(func.count(Notification.id))
+                    .join(Application, Application.id == Notification.related_id)
+                    .where(Application.id_job == job_id)
+                )
+    return stats
+
+
+_BENCH_WORDS = (
+    'python flask django react vue angular java kotlin golang rust php laravel '
+    'marketing sales finance accounting admin design ui ux data analyst engineer '
+    'backend frontend fullstack mobile android ios devops cloud aws network security '
+    'teacher nurse driver warehouse logistics customer service operator technician'
+).split()
+
+# Kata langka yang hanya muncul di sejumlah kecil lowongan, agar jumlah hasil tetap
+_BENCH_NEEDLES = ('kubernetes', 'phlebotomist', 'geodesi')
+
+
+def benchmark_search(sizes, needles=100, repeat=20, path=None):
+    """Mengukur latensi pencarian FTS vs LIKE.
+
+    Data dibuat bertahap hingga setiap ukuran pada `sizes` tercapai. Sebanyak
+    `needles` lowongan berisi kata langka dari _BENCH_NEEDLES, sehingga jumlah
+    hasil tetap sama di semua ukuran: biaya FTS sebanding dengan jumlah hasil,
+    sedangkan LIKE sebanding dengan ukuran tabel. Mengembalikan list dict berisi
+    median latensi (ms) per ukuran dan kueri.
+    """
+    rng = random.Random(42)
+
+    def job_row(extra=''):
+        words = lambda n: ' '.join(rng.choice(_BENCH_WORDS) for _ in range(n))
+        return {
+            'id_company': 1,
+            'title': f"{words(3)} {extra}".strip(),
+            'description': words(40),
+            'qualifications': words(15),
+            'location': 'Batam',
+            'slots': 1,
+            'is_open': True,
+            'salary_min': 0,
+            'salary_max': 0,
+        }
+
+    fts_sql = text(
+        "SELECT j.id_job FROM job_listings j "
+        "JOIN (SELECT rowid AS id_job, bm25(job_listings_fts) AS score "
+        "      FROM job_listings_fts WHERE job_listings_fts MATCH :match) h "
+        "ON h.id_job = j.id_job WHERE j.is_open = 1 "
+        "ORDER BY h.score, j.posted_at DESC LIMIT 6"
+    )
+    like_sql = text(
+        "SELECT id_job FROM job_listings WHERE is_open = 1 AND "
+        "(title LIKE :term OR description LIKE :term OR qualifications LIKE :term) "
+        "ORDER BY posted_at DESC LIMIT 6"
+    )
+
+    # create_all menjalankan DDL indeks full-text lewat event after_create JobListing (lihat search.py)
+    with scratch_database([Company, JobListing], path) as engine:
+        with engine.begin() as conn:
+            conn.execute(Company.__table__.insert(), [{'id_user': 1, 'company_name': 'Bench Corp'}])
+            conn.execute(JobListing.__table__.insert(), [
+                job_row(_BENCH_NEEDLES[i % len(_BENCH_NEEDLES)]) for i in range(needles)
+            ])
+        inserted = needles
+
+        results = []
+        for size in sorted(sizes):
+            with engine.begin() as conn:
+                while inserted < size:
+                    batch = min(10000, size - inserted)
+                    conn.execute(JobListing.__table__.insert(), [job_row() for _ in range(batch)])
+                    inserted += batch
+
+            with engine.connect() as conn:
+                for q in _BENCH_NEEDLES:
+                    timings = {'fts': [], 'like': []}
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        conn.execute(fts_sql, {'match': _fts5_query(q)}).fetchall()
+                        timings['fts'].append((time.perf_counter() - start) * 1000)
+
+                        start = time.perf_counter()
+                        conn.execute(like_sql, {'term': f'%{q}%'}).fetchall()
+                        timings['like'].append((time.perf_counter() - start) * 1000)
+
+                    results.append({
+                        'size': size,
+                        'query': q,
+                        'fts_ms': statistics.median(timings['fts']),
+                        'like_ms': statistics.median(timings['like']),
+                    })
+    return results
+
+
+def corpus_bytes(corpus):
+    """Perkiraan memori satu JobCorpus: array, objek Postings dan kosakata."""
+    arrays = [corpus.doc_job, corpus.doc_length, corpus.doc_terms, corpus.doc_terms_start, corpus.job_doc]
+    size = sys.getsizeof(corpus.postings) + sys.getsizeof(corpus.term_postings)
+    for term, postings in corpus.postings.items():
+        size += sys.getsizeof(term) + sys.getsizeof(postings)
+        arrays += [postings.docs, postings.tfs, postings.top, postings.top_keys]
+    return size + sum(sys.getsizeof(values) for values in arrays if values is not None)
+
+
+def benchmark_recommend(jobs=1000000, queries=200, k=6, vocabulary=30000, title_words=3,
+                        qualification_words=25, exact_queries=20):
+    """Memori, waktu bangun dan latensi RecommendIndex pada korpus sintetis (tanpa database).
+
+    Kata judul/kualifikasi diambil dari kosakata berdistribusi Zipf, jadi ada
+    term yang muncul di sebagian besar lowongan. Setiap query berisi 3-6 skill
+    dari distribusi yang sama. `recall` membandingkan top-k dengan skor tepat
+    (semua posting dijumlahkan) pada `exact_queries` query pertama.
+    """
+    rng = random.Random(42)
+    words = [f'skill{rank}' for rank in range(vocabulary)]
+    weights = list(itertools.accumulate(1 / (rank + 1) ** 1.1 for rank in range(vocabulary)))
+
+    def sample(count):
+        return rng.choices(words, cum_weights=weights, k=count)
+
+    corpus = recommend.JobCorpus()
+    started = time.perf_counter()
+    for job_id in range(1, jobs + 1):
+        corpus.add_job(job_id, ' '.join(sample(title_words)), ' '.join(sample(qualification_words)), loading=True)
+    corpus.finish_loading()
+    build_s = time.perf_counter() - started
+
+    index = recommend.RecommendIndex()
+    index.corpus, index.built_at = corpus, time.monotonic()
+    skill_sets = [set(sample(rng.randint(3, 6))) for _ in range(queries)]
+    timings, results = [], []
+    for terms in skill_sets:
+        exclude = [rng.randint(1, jobs) for _ in range(5)]
+        start = time.perf_counter()
+        results.append(index.recommend(terms, k, exclude=exclude))
+        timings.append((time.perf_counter() - start) * 1000)
+
+    exact_postings = recommend.EXACT_POSTINGS
+    recommend.EXACT_POSTINGS = sys.maxsize
+    try:
+        hits, checked = 0, min(exact_queries, len(skill_sets))
+        for terms, found in zip(skill_sets[:checked], results):
+            expected = index.recommend(terms, k + 5)
+            # Nilai seri di batas top-k boleh tertukar urutannya
+            cutoff = expected[k - 1][1] if len(expected) >= k else 0.0
+            hits += sum(1 for job_id, score in found if score >= cutoff - 1e-9)
+        recall = hits / (k * checked) if checked else None
+    finally:
+        recommend.EXACT_POSTINGS = exact_postings
+
+    timings.sort()
+    return {
+        'jobs': jobs,
+        'postings': len(corpus.doc_terms),
+        'memory_mb': corpus_bytes(corpus) / 1e6,
+        'build_s': build_s,
+        'median_ms': statistics.median(timings),
+        'p95_ms': timings[int(0.95 * (len(timings) - 1))],
+        'recall': recall,
+    }
@@ -0,0 +1,178 @@
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock, Thread
+
+from flask import current_app, request, session, make_response
+from flask_login import current_user
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from werkzeug.http import is_resource_modified
+
+from nemukerja.extensions import db
+from nemukerja.models import CacheVersion, Company, JobListing
+
+class TTLCache:
+    """Cache in-process sederhana dengan batas ukuran (LRU) dan masa berlaku per entri."""
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            if hit[1] <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return hit[0]
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key, compute, ttl=None):
+        """Mengembalikan nilai dari cache, atau menghitungnya dengan compute() lalu menyimpannya."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class BackgroundRefresh:
+    """Menjalankan refresh index in-memory di thread latar, paling banyak satu sekaligus.
+
+    Dipakai oleh nemukerja/suggest.py dan nemukerja/recommend.py supaya request
+    tidak pernah menunggu sync/rebuild; request tetap membaca index yang ada.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = Lock()
+        self._thread = None
+
+    def start(self, refresh):
+        """Menjalankan refresh() dengan app context sendiri. False jika refresh lain masih berjalan."""
+        app = current_app._get_current_object()
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = Thread(target=self._run, args=(app, refresh), name=self.name, daemon=True)
+            self._thread.start()
+        return True
+
+    def _run(self, app, refresh):
+        # App context baru = session database sendiri, dilepas saat context ditutup
+        with app.app_context():
+            try:
+                refresh()
+            except Exception:
+                app.logger.exception('%s: background refresh failed', self.name)
+
+    def wait(self, timeout=None):
+        """Menunggu refresh yang sedang berjalan (untuk CLI dan test)."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+
+# Nama versi yang naik setiap kali data lowongan yang tampil di halaman publik berubah
+JOBS_VERSION = 'jobs'
+
+
+def get_version(name):
+    """Membaca nomor versi cache (satu lookup primary key)."""
+    version = db.session.query(CacheVersion.version).filter_by(name=name).scalar()
+    return version or 0
+
+
+def bump_version(name, session=None):
+    """Menaikkan nomor versi cache di dalam transaksi yang sedang berjalan."""
+    session = session or db.session
+    result = session.execute(
+        update(CacheVersion)
+        .where(CacheVersion.name == name)
+        .values(version=CacheVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        session.add(CacheVersion(name=name, version=1))
+
+
+@event.listens_for(Session, 'before_flush')
+def _bump_jobs_version(session, flush_context, instances):
+    # Lowongan atau nama perusahaan berubah -> halaman daftar lowongan publik ikut berubah
+    changed = list(session.new) + list(session.dirty) + list(session.deleted)
+    if any(isinstance(obj, (JobListing, Company)) for obj in changed):
+        if not session.info.get('jobs_version_bumped'):
+            session.info['jobs_version_bumped'] = True
+            bump_version(JOBS_VERSION, session)
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _reset_jobs_version_flag(session):
+    session.info.pop('jobs_version_bumped', None)
+
+
+def make_etag(*parts):
+    """ETag dari gabungan bagian-bagian versi (plus HTTP_CACHE_VERSION untuk deploy baru)."""
+    raw = '|'.join(str(part) for part in (current_app.config['HTTP_CACHE_VERSION'],) + parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def is_public_request():
+    """True jika respons boleh di-cache bersama (pengunjung anonim tanpa pesan flash)."""
+    return not current_user.is_authenticated and not session.get('_flashes')
+
+
+def _apply_cache_headers(response, etag, last_modified, max_age, s_maxage, public):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    if public:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        # Untuk CDN / reverse proxy
+        response.cache_control.s_maxage = s_maxage
+    else:
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    return response
+
+
+def conditional_response(etag, render, last_modified=None, max_age=None, s_maxage=None, public=True):
+    """Mengembalikan 304 Not Modified jika validator klien masih cocok, tanpa memanggil render().
+
+    Jika tidak cocok, render() dipanggil dan responsnya diberi ETag,
+    Last-Modified dan Cache-Control.
+    """
+    if max_age is None:
+        max_age = current_app.config['HTTP_CACHE_MAX_AGE']
+    if s_maxage is None:
+        s_maxage = current_app.config['HTTP_CACHE_S_MAXAGE']
+
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = current_app.response_class(status=304)
+        return _apply_cache_headers(response, etag, last_modified, max_age, s_maxage, public)
+
+    response = make_response(render())
+    return _apply_cache_headers(response, etag, last_modified, max_age, s_maxage, public)
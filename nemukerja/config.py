@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 
 basedir = os.path.abspath(os.path.dirname(__file__))
@@ -18,8 +19,89 @@ class Config:
     REMEMBER_COOKIE_HTTPONLY = True
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024 
 
-    MAIL_SERVER = 'smtp.googlemail.com'
-    MAIL_PORT = 587
-    MAIL_USE_TLS = True
+    # Penyimpanan CV berbasis hash isi (lihat nemukerja/cv_storage.py)
+    CV_UPLOAD_DIR = os.getenv('CV_UPLOAD_DIR', os.path.join(basedir, 'static', 'uploads', 'cv'))
+    CV_MAX_BYTES = int(os.getenv('CV_MAX_BYTES', 10 * 1024 * 1024))
+    # Pengiriman file CV: 'python' (Flask, mendukung Range/ETag), 'x-accel' (nginx)
+    # atau 'x-sendfile' (Apache mod_xsendfile / lighttpd). Untuk nginx, contoh:
+    #   location /protected-cv/ { internal; alias /path/ke/static/uploads/cv/; }
+    CV_DELIVERY = os.getenv('CV_DELIVERY', 'python')
+    CV_ACCEL_PREFIX = os.getenv('CV_ACCEL_PREFIX', '/protected-cv/')
+    CV_CACHE_MAX_AGE = int(os.getenv('CV_CACHE_MAX_AGE', 3600))
+
+    MAIL_SERVER = os.getenv('MAIL_SERVER', 'smtp.googlemail.com')
+    MAIL_PORT = int(os.getenv('MAIL_PORT', 587))
+    MAIL_USE_TLS = os.getenv('MAIL_USE_TLS', '1') == '1'
     MAIL_USERNAME = os.getenv('MAIL_USERNAME')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
+
+    # Hashing password (nemukerja/passwords.py). Cost bcrypt dikalibrasi saat startup agar satu
+    # hash ~PASSWORD_HASH_TARGET_MS; isi PASSWORD_HASH_ROUNDS untuk memakai nilai tetap.
+    PASSWORD_HASH_ROUNDS = int(os.getenv('PASSWORD_HASH_ROUNDS', 0))
+    PASSWORD_HASH_TARGET_MS = float(os.getenv('PASSWORD_HASH_TARGET_MS', 250))
+    PASSWORD_HASH_MIN_ROUNDS = int(os.getenv('PASSWORD_HASH_MIN_ROUNDS', 10))
+    PASSWORD_HASH_MAX_ROUNDS = int(os.getenv('PASSWORD_HASH_MAX_ROUNDS', 16))
+    # Maksimal hash yang berjalan bersamaan dan yang boleh menunggu; sisanya dijawab 503
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 2))
+    PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', 16))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+
+    # Antrean email keluar (flask mail-worker): percobaan ulang dengan backoff
+    # MAIL_QUEUE_BASE_DELAY * 2^(n-1) detik hingga MAIL_QUEUE_MAX_DELAY
+    MAIL_QUEUE_BATCH_SIZE = int(os.getenv('MAIL_QUEUE_BATCH_SIZE', 50))
+    MAIL_QUEUE_POLL_SECONDS = float(os.getenv('MAIL_QUEUE_POLL_SECONDS', 2))
+    MAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv('MAIL_QUEUE_MAX_ATTEMPTS', 8))
+    MAIL_QUEUE_BASE_DELAY = float(os.getenv('MAIL_QUEUE_BASE_DELAY', 30))
+    MAIL_QUEUE_MAX_DELAY = float(os.getenv('MAIL_QUEUE_MAX_DELAY', 3600))
+    MAIL_QUEUE_LEASE = int(os.getenv('MAIL_QUEUE_LEASE', 300))
+    MAIL_QUEUE_IDLE_CLOSE = float(os.getenv('MAIL_QUEUE_IDLE_CLOSE', 60))
+
+    # Notifikasi real-time (SSE): satu koneksi ditahan hingga NOTIFICATION_STREAM_TIMEOUT
+    # detik lalu browser menyambung ulang. Gunakan worker async/thread (mis. gunicorn
+    # --worker-class gthread) karena setiap tab yang terbuka memegang satu thread.
+    NOTIFICATION_STREAM_TIMEOUT = int(os.getenv('NOTIFICATION_STREAM_TIMEOUT', 300))
+    NOTIFICATION_RECHECK_SECONDS = int(os.getenv('NOTIFICATION_RECHECK_SECONDS', 15))
+    # Maksimal stream SSE terbuka per proses; di atas itu dijawab 503 dan browser memakai polling.
+    # Sisakan thread untuk request biasa (mis. gthread --threads 32 -> 24; worker sync -> 0)
+    NOTIFICATION_MAX_STREAMS = int(os.getenv('NOTIFICATION_MAX_STREAMS', 24))
+    NOTIFICATION_STREAM_RETRY = int(os.getenv('NOTIFICATION_STREAM_RETRY', 30))
+
+    # HTTP caching (ETag / Cache-Control) untuk halaman publik dan detail lowongan.
+    # Naikkan HTTP_CACHE_VERSION saat deploy yang mengubah template agar ETag lama tidak dipakai.
+    HTTP_CACHE_VERSION = os.getenv('HTTP_CACHE_VERSION', '1')
+    HTTP_CACHE_MAX_AGE = int(os.getenv('HTTP_CACHE_MAX_AGE', 30))
+    HTTP_CACHE_S_MAXAGE = int(os.getenv('HTTP_CACHE_S_MAXAGE', 60))
+
+    # Masa berlaku (detik) snapshot pengguna + profil di load_user (per worker, 0 = nonaktif).
+    # Perubahan di worker lain baru terlihat setelah masa ini habis.
+    IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', 60))
+
+    # Cache HTML halaman daftar lowongan untuk pengunjung anonim (nemukerja/page_cache.py):
+    # 'memory' (per worker), 'sqlite' / 'filesystem' (dibagi semua worker di satu mesin) atau 'off'
+    PAGE_CACHE_BACKEND = os.getenv('PAGE_CACHE_BACKEND', 'memory')
+    PAGE_CACHE_DIR = os.getenv('PAGE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'nemukerja-page-cache'))
+    PAGE_CACHE_SIZE = int(os.getenv('PAGE_CACHE_SIZE', 256))
+    PAGE_CACHE_TTL = int(os.getenv('PAGE_CACHE_TTL', 300))
+
+    # Autocomplete /api/suggest: perubahan dari worker lain diambil setiap SUGGEST_SYNC_SECONDS,
+    # index dibangun ulang penuh setiap SUGGEST_REBUILD_SECONDS
+    SUGGEST_SYNC_SECONDS = float(os.getenv('SUGGEST_SYNC_SECONDS', 5))
+    SUGGEST_REBUILD_SECONDS = float(os.getenv('SUGGEST_REBUILD_SECONDS', 600))
+
+    # Rekomendasi lowongan berdasarkan skill di dashboard pelamar (nemukerja/recommend.py)
+    RECOMMEND_TOP_K = int(os.getenv('RECOMMEND_TOP_K', 6))
+    RECOMMEND_SYNC_SECONDS = float(os.getenv('RECOMMEND_SYNC_SECONDS', 10))
+    # Jarak minimal antar rebuild penuh; rebuild hanya jalan jika index perlu dipadatkan
+    # (setiap worker membangun index sendiri, lihat `flask bench-recommend` untuk ukuran dan waktunya)
+    RECOMMEND_REBUILD_SECONDS = float(os.getenv('RECOMMEND_REBUILD_SECONDS', 3600))
+
+    # Import lowongan massal dari CSV/JSON (nemukerja/imports.py)
+    JOB_IMPORT_BATCH_SIZE = int(os.getenv('JOB_IMPORT_BATCH_SIZE', 500))
+    JOB_IMPORT_MAX_ROWS = int(os.getenv('JOB_IMPORT_MAX_ROWS', 5000))
+
+    # Masa berlaku (detik) cache statistik dashboard admin
+    ADMIN_STATS_TTL = int(os.getenv('ADMIN_STATS_TTL', 30))
+
+    # Batas jumlah query SQL per route (@query_budget): 'raise' untuk development/testing,
+    # 'warn' hanya mencatat di log, 'off' untuk mematikan pemeriksaan
+    QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'warn')
@@ -0,0 +1,183 @@
+import random
+import time
+
+from sqlalchemy import func, case, bindparam, or_
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm.util import identity_key
+
+from nemukerja.extensions import db
+from nemukerja.models import JobListing, Application
+
+# Kolom penghitung di job_listings untuk setiap status lamaran
+STATUS_COLUMNS = {
+    'pending': 'applications_pending',
+    'accepted': 'applications_accepted',
+    'rejected': 'applications_rejected',
+}
+COUNTER_COLUMNS = ('applications_total',) + tuple(STATUS_COLUMNS.values())
+
+
+def used_slots(job):
+    """Jumlah slot terpakai (lamaran pending + diterima), dibaca dari kolom penghitung."""
+    return job.applications_pending + job.applications_accepted
+
+
+def _counter_values(table, deltas):
+    values = {table.c[column]: table.c[column] + delta for column, delta in deltas.items()}
+    values[table.c.updated_at] = table.c.updated_at
+    return values
+
+
+def _expire_loaded(session, job_id, columns):
+    # Objek JobListing yang sudah dimuat di session harus membaca ulang nilainya
+    job = session.identity_map.get(identity_key(JobListing, job_id))
+    if job is not None:
+        session.expire(job, list(columns))
+
+
+def _apply_deltas(job_id, deltas, session=None):
+    """UPDATE atomik `kolom = kolom + delta` pada satu lowongan, di transaksi yang sedang berjalan.
+
+    Memakai Core UPDATE (bukan atribut ORM) supaya tidak ada read-modify-write
+    antar request, dan tidak dianggap perubahan isi lowongan: updated_at
+    dipertahankan dan versi cache JOBS_VERSION tidak ikut naik.
+    """
+    session = session or db.session
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    table = JobListing.__table__
+    session.execute(table.update().where(table.c.id_job == job_id).values(_counter_values(table, deltas)))
+    _expire_loaded(session, job_id, deltas)
+
+
+def reserve_slot(job_id, session=None):
+    """Memesan satu slot lamaran secara atomik. Mengembalikan False jika penuh atau ditutup.
+
+    Cek kuota dan penambahan penghitung terjadi dalam satu UPDATE bersyarat,
+    jadi dua request yang bersamaan tidak bisa sama-sama lolos. Di MySQL hanya
+    baris lowongan itu yang terkunci (sampai commit), bukan tabelnya.
+    """
+    session = session or db.session
+    table = JobListing.__table__
+    deltas = {'applications_total': 1, 'applications_pending': 1}
+    result = session.execute(
+        table.update()
+        .where(table.c.id_job == job_id)
+        .where(table.c.is_open == True)
+        .where(table.c.applications_pending + table.c.applications_accepted < table.c.slots)
+        .values(_counter_values(table, deltas))
+    )
+    _expire_loaded(session, job_id, deltas)
+    return result.rowcount == 1
+
+
+
+def reserve_slots(job_id, count, old_status, session=None):
+    """Memindahkan `count` lamaran dari `old_status` ke 'accepted' hanya jika slot masih cukup.
+
+    UPDATE bersyarat seperti reserve_slot(), untuk lamaran yang belum memakai
+    slot (mis. lamaran ditolak yang kemudian diterima). Mengembalikan False
+    (tanpa perubahan) jika sisa kuota kurang dari `count`.
+    """
+    session = session or db.session
+    table = JobListing.__table__
+    deltas = {STATUS_COLUMNS[old_status]: -count, 'applications_accepted': count}
+    result = session.execute(
+        table.update()
+        .where(table.c.id_job == job_id)
+        .where(table.c.applications_pending + table.c.applications_accepted + count <= table.c.slots)
+        .values(_counter_values(table, deltas))
+    )
+    _expire_loaded(session, job_id, deltas)
+    return result.rowcount == 1
+
+# Kode error MySQL yang aman untuk diulang: deadlock dan lock wait timeout
+_MYSQL_RETRY_CODES = (1213, 1205)
+
+
+def is_contention_error(error):
+    """True jika error berasal dari perebutan lock (transaksi boleh diulang)."""
+    if not isinstance(error, OperationalError):
+        return False
+    orig = error.orig
+    if orig is not None and orig.args and orig.args[0] in _MYSQL_RETRY_CODES:
+        return True
+    return 'database is locked' in str(orig)
+
+
+def run_with_retry(work, session=None, attempts=5, base_delay=0.02, max_delay=0.5):
+    """Menjalankan work() lalu commit, diulang dengan backoff jika terjadi perebutan lock.
+
+    Jeda memakai exponential backoff dengan jitter penuh supaya request yang
+    bertabrakan tidak mencoba ulang pada saat yang sama. Error lain (termasuk
+    IntegrityError) langsung dilempar setelah rollback.
+    """
+    session = session or db.session
+    for attempt in range(attempts):
+        try:
+            result = work()
+            session.commit()
+            return result
+        except Exception as error:
+            session.rollback()
+            if attempt == attempts - 1 or not is_contention_error(error):
+                raise
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+
+
+def record_status_change(job_id, old_status, new_status, count=1, session=None):
+    """Memindahkan `count` lamaran dari satu status ke status lain pada penghitung lowongan."""
+    if old_status == new_status:
+        return
+    _apply_deltas(job_id, {STATUS_COLUMNS[old_status]: -count, STATUS_COLUMNS[new_status]: count}, session)
+
+
+def _actual_counts():
+    """Subquery jumlah lamaran sebenarnya per lowongan, dihitung dari tabel applications."""
+    columns = [func.count(Application.id).label('applications_total')]
+    for status, column in STATUS_COLUMNS.items():
+        columns.append(func.sum(case((Application.status == status, 1), else_=0)).label(column))
+    return (db.session.query(Application.id_job.label('id_job'), *columns)
+            .group_by(Application.id_job)
+            .subquery('actual_counts'))
+
+
+def reconcile_counters(batch_size=500):
+    """Memperbaiki penghitung yang tidak sesuai dengan tabel applications.
+
+    Hanya lowongan yang selisih yang di-UPDATE. Mengembalikan list dict berisi
+    id lowongan beserta nilai lama dan nilai yang benar.
+    """
+    actual = _actual_counts()
+    expected = {column: func.coalesce(actual.c[column], 0) for column in COUNTER_COLUMNS}
+    rows = (db.session.query(
+                JobListing.id,
+                *[getattr(JobListing, column) for column in COUNTER_COLUMNS],
+                *[expected[column].label(f'expected_{column}') for column in COUNTER_COLUMNS])
+            .outerjoin(actual, actual.c.id_job == JobListing.id)
+            .filter(or_(*[getattr(JobListing, column) != expected[column] for column in COUNTER_COLUMNS]))
+            .all())
+
+    drift = []
+    for row in rows:
+        mapping = row._mapping
+        drift.append({
+            'id_job': row[0],
+            'before': {column: mapping[column] for column in COUNTER_COLUMNS},
+            'after': {column: mapping[f'expected_{column}'] for column in COUNTER_COLUMNS},
+        })
+
+    table = JobListing.__table__
+    statement = (table.update()
+                 .where(table.c.id_job == bindparam('b_id_job'))
+                 .values({**{column: bindparam(f'b_{column}') for column in COUNTER_COLUMNS},
+                          'updated_at': table.c.updated_at}))
+    for start in range(0, len(drift), batch_size):
+        params = [
+            {'b_id_job': item['id_job'], **{f'b_{k}': v for k, v in item['after'].items()}}
+            for item in drift[start:start + batch_size]
+        ]
+        db.session.execute(statement, params)
+    db.session.expire_all()
+    return drift
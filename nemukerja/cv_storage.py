@@ -0,0 +1,151 @@
+import hashlib
+import os
+import re
+import tempfile
+from urllib.parse import quote
+
+from flask import current_app, abort, send_file
+from werkzeug.security import safe_join
+
+# Semua PDF diawali header ini; dicek dari potongan pertama sebelum apa pun ditulis permanen
+PDF_MAGIC = b'%PDF-'
+CHUNK_SIZE = 64 * 1024
+# Nama file hasil shard_path(): SHA-256 isi file, dipakai langsung sebagai ETag
+DIGEST_NAME = re.compile(r'^[0-9a-f]{64}$')
+
+
+class CVRejected(ValueError):
+    """Upload CV ditolak. `reason` berisi 'not_pdf', 'too_large' atau 'empty'."""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def cv_root():
+    return current_app.config['CV_UPLOAD_DIR']
+
+
+def shard_path(digest, ext='.pdf'):
+    """Path relatif berbasis hash: ab/cd/abcd....pdf (dua level, 65.536 direktori)."""
+    return f"{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+
+def looks_like_pdf(stream):
+    """Cek magic bytes PDF tanpa menggeser posisi stream."""
+    position = stream.tell()
+    try:
+        return stream.read(len(PDF_MAGIC)) == PDF_MAGIC
+    finally:
+        stream.seek(position)
+
+
+def store_cv(file_storage, max_bytes=None):
+    """Menyimpan CV secara streaming (per potongan) sambil menghitung SHA-256.
+
+    File ditulis ke file sementara di direktori CV lalu di-rename secara atomik
+    ke path berbasis hash. Jika isi yang sama sudah ada, file sementara dibuang
+    (dedup). Upload yang bukan PDF atau melebihi `max_bytes` dihentikan begitu
+    terdeteksi. Mengembalikan path relatif untuk Applicant.cv_path.
+    """
+    max_bytes = max_bytes or current_app.config['CV_MAX_BYTES']
+    root = cv_root()
+    os.makedirs(root, exist_ok=True)
+
+    stream = file_storage.stream
+    stream.seek(0)
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=root, prefix='.upload-', suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if size == 0 and not chunk.startswith(PDF_MAGIC):
+                    raise CVRejected('not_pdf')
+                size += len(chunk)
+                if size > max_bytes:
+                    raise CVRejected('too_large')
+                digest.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            raise CVRejected('empty')
+
+        relative_path = shard_path(digest.hexdigest())
+        destination = os.path.join(root, relative_path)
+        if os.path.exists(destination):
+            os.remove(temp_path)
+        else:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.replace(temp_path, destination)
+        return relative_path
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def migrate_legacy_files():
+    """Memindahkan CV lama (nama uuid di root direktori CV) ke layout berbasis hash.
+
+    Mengembalikan dict {nama_lama: path_baru}; pemanggil yang memperbarui
+    Applicant.cv_path.
+    """
+    root = cv_root()
+    moved = {}
+    if not os.path.isdir(root):
+        return moved
+    for entry in os.scandir(root):
+        if not entry.is_file() or entry.name.startswith('.'):
+            continue
+        digest = hashlib.sha256()
+        with open(entry.path, 'rb') as source:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+        ext = os.path.splitext(entry.name)[1].lower() or '.pdf'
+        relative_path = shard_path(digest.hexdigest(), ext)
+        destination = os.path.join(root, relative_path)
+        if os.path.exists(destination):
+            os.remove(entry.path)
+        else:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.replace(entry.path, destination)
+        moved[entry.name] = relative_path
+    return moved
+
+
+def cv_response(filename):
+    """Response untuk file CV `filename` (relatif terhadap cv_root()).
+
+    Otorisasi dilakukan pemanggil. Sesuai CV_DELIVERY, byte file dikirim oleh
+    nginx (X-Accel-Redirect), Apache/lighttpd (X-Sendfile) atau oleh Flask
+    sendiri; mode 'python' mendukung Range, If-None-Match dan 304 sehingga
+    PDF viewer bisa melompat ke halaman tertentu tanpa mengunduh ulang.
+    """
+    path = safe_join(cv_root(), filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    config = current_app.config
+    mode = config['CV_DELIVERY']
+    if mode == 'x-accel':
+        response = current_app.response_class(content_type='application/pdf')
+        response.headers['X-Accel-Redirect'] = config['CV_ACCEL_PREFIX'].rstrip('/') + '/' + quote(filename)
+    elif mode == 'x-sendfile':
+        response = current_app.response_class(content_type='application/pdf')
+        response.headers['X-Sendfile'] = path
+    else:
+        name = os.path.splitext(os.path.basename(path))[0]
+        # File berbasis hash tidak pernah berubah isinya, jadi hash-nya ETag yang kuat;
+        # file lama (nama uuid) memakai ETag bawaan werkzeug (mtime + ukuran)
+        etag = name if DIGEST_NAME.match(name) else True
+        response = send_file(path, mimetype='application/pdf', conditional=True, etag=etag)
+
+    # Hanya cache browser (bukan proxy bersama) karena CV butuh login
+    response.cache_control.private = True
+    response.cache_control.public = False
+    response.cache_control.no_cache = None
+    response.cache_control.max_age = config['CV_CACHE_MAX_AGE']
+    return response
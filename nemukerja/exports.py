@@ -0,0 +1,131 @@
+import csv
+import io
+import json
+from datetime import datetime, date
+
+from flask import Response, stream_with_context
+from sqlalchemy import select
+
+from nemukerja.extensions import db
+from nemukerja.models import User, Applicant, Company, JobListing, Application
+
+# Jumlah baris yang diambil dari database (dan dikirim ke klien) per batch
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+APPLICATION_COLUMNS = (
+    ('id_application', Application.id),
+    ('applied_at', Application.applied_at),
+    ('status', Application.status),
+    ('id_job', JobListing.id),
+    ('job_title', JobListing.title),
+    ('company_name', Company.company_name),
+    ('applicant_name', Applicant.full_name),
+    ('applicant_email', User.email),
+    ('applicant_phone', Applicant.phone),
+    ('cover_letter', Application.notes),
+)
+
+JOB_COLUMNS = (
+    ('id_job', JobListing.id),
+    ('title', JobListing.title),
+    ('company_name', Company.company_name),
+    ('location', JobListing.location),
+    ('slots', JobListing.slots),
+    ('salary_min', JobListing.salary_min),
+    ('salary_max', JobListing.salary_max),
+    ('is_open', JobListing.is_open),
+    ('posted_at', JobListing.posted_at),
+    ('applications_total', JobListing.applications_total),
+    ('applications_pending', JobListing.applications_pending),
+    ('applications_accepted', JobListing.applications_accepted),
+    ('applications_rejected', JobListing.applications_rejected),
+)
+
+
+def applications_statement(company_id=None, job_id=None, status=None):
+    """SELECT lamaran untuk export, diurutkan berdasarkan primary key."""
+    statement = (select(*[expr.label(name) for name, expr in APPLICATION_COLUMNS])
+                 .join(JobListing, JobListing.id == Application.id_job)
+                 .join(Company, Company.id == JobListing.id_company)
+                 .join(Applicant, Applicant.id == Application.id_applicant)
+                 .join(User, User.id == Applicant.id_user)
+                 .order_by(Application.id))
+    if company_id is not None:
+        statement = statement.where(JobListing.id_company == company_id)
+    if job_id is not None:
+        statement = statement.where(Application.id_job == job_id)
+    if status in ('pending', 'accepted', 'rejected'):
+        statement = statement.where(Application.status == status)
+    return statement
+
+
+def jobs_statement(company_id=None, is_open=None):
+    """SELECT lowongan untuk export, diurutkan berdasarkan primary key."""
+    statement = (select(*[expr.label(name) for name, expr in JOB_COLUMNS])
+                 .join(Company, Company.id == JobListing.id_company)
+                 .order_by(JobListing.id))
+    if company_id is not None:
+        statement = statement.where(JobListing.id_company == company_id)
+    if is_open is not None:
+        statement = statement.where(JobListing.is_open == is_open)
+    return statement
+
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str) and value[:1] in ('=', '+', '-', '@'):
+        # Mencegah teks dari pengguna dieksekusi sebagai formula di Excel/Sheets
+        return "'" + value
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def stream_rows(statement, fmt, batch_size=EXPORT_BATCH_SIZE):
+    """Generator potongan teks CSV/NDJSON dari `statement`.
+
+    Baris dibaca dengan yield_per (server-side cursor di MySQL), jadi memori
+    yang dipakai hanya sebesar satu batch, berapapun jumlah barisnya.
+    """
+    result = db.session.execute(statement.execution_options(yield_per=batch_size))
+    columns = list(result.keys())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+
+    if writer:
+        writer.writerow(columns)
+    for batch in result.partitions():
+        for row in batch:
+            if writer:
+                writer.writerow([_csv_cell(value) for value in row])
+            else:
+                buffer.write(json.dumps(dict(zip(columns, row)), default=_json_default))
+                buffer.write('\n')
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+    result.close()
+
+
+def export_response(statement, fmt, filename):
+    """Response streaming (chunked) untuk file export."""
+    response = Response(stream_with_context(stream_rows(statement, fmt)), content_type=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    response.headers['Cache-Control'] = 'no-store'
+    # Matikan buffering nginx supaya batch langsung diteruskan ke klien
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
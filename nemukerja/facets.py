@@ -0,0 +1,81 @@
+from sqlalchemy import select, func, case, cast, literal, union_all, String
+
+from nemukerja.caching import TTLCache, JOBS_VERSION, get_version
+from nemukerja.extensions import db
+from nemukerja.models import Company, JobListing
+
+# Jumlah nilai teratas yang ditampilkan per facet
+FACET_LIMIT = 8
+
+# Batas bawah band gaji (IDR), dicocokkan dengan filter "gaji minimal" (salary_min >= batas)
+SALARY_BANDS = (3_000_000, 5_000_000, 8_000_000, 12_000_000, 20_000_000)
+
+# Parameter filter yang dipakai build_job_query(); tanpa salah satunya berarti himpunan dasar
+FILTER_ARGS = ('q', 'location', 'company', 'salary')
+
+# Facet himpunan dasar (semua lowongan terbuka), per versi data lowongan
+_base_cache = TTLCache(maxsize=4, ttl=3600)
+
+
+def _salary_band():
+    """Indeks band gaji tertinggi yang dicapai salary_min (-1 = di bawah band pertama)."""
+    whens = [(JobListing.salary_min >= bound, index) for index, bound in reversed(list(enumerate(SALARY_BANDS)))]
+    return case(*whens, else_=-1)
+
+
+def _top(facet, value, jobs, limit):
+    """Satu cabang UNION: (facet, nilai, jumlah) teratas untuk satu kolom."""
+    ranked = (select(literal(facet).label('facet'), cast(value, String).label('value'),
+                     func.count().label('total'))
+              .select_from(jobs)
+              .where(value.is_not(None))
+              .group_by(value)
+              .order_by(func.count().desc(), value)
+              .limit(limit)
+              .subquery())
+    return select(ranked.c.facet, ranked.c.value, ranked.c.total)
+
+
+def compute_facets(query, limit=FACET_LIMIT):
+    """Lokasi teratas, perusahaan teratas dan histogram band gaji untuk hasil `query`.
+
+    `query` adalah kueri JobListing yang sudah difilter (dari build_job_query).
+    Ketiga facet dihitung dalam satu statement (UNION ALL dari tiga GROUP BY).
+    """
+    jobs = (query.order_by(None)
+            .with_entities(JobListing.id, JobListing.location, JobListing.id_company,
+                           _salary_band().label('salary_band'))
+            .subquery('faceted_jobs'))
+    with_company = jobs.join(Company, Company.id == jobs.c.id_company)
+    statement = union_all(
+        _top('location', jobs.c.location, jobs, limit),
+        _top('company', Company.company_name, with_company, limit),
+        _top('salary', jobs.c.salary_band, jobs, len(SALARY_BANDS) + 1),
+    )
+
+    facets = {'location': [], 'company': [], 'salary': []}
+    histogram = {}
+    for facet, value, total in db.session.execute(statement):
+        if facet == 'salary':
+            histogram[int(value)] = total
+        elif value:
+            facets[facet].append((value, total))
+
+    # Filter gaji berupa "minimal", jadi tampilkan jumlah kumulatif per batas bawah
+    running = 0
+    for index in reversed(range(len(SALARY_BANDS))):
+        running += histogram.get(index, 0)
+        facets['salary'].insert(0, (SALARY_BANDS[index], running))
+    return facets
+
+
+def is_filtered(args):
+    return any(args.get(name, '').strip() for name in FILTER_ARGS)
+
+
+def job_facets(query, args):
+    """Facet untuk halaman daftar lowongan; himpunan dasar (tanpa filter) diambil dari cache."""
+    if is_filtered(args):
+        return compute_facets(query)
+    version = get_version(JOBS_VERSION)
+    return _base_cache.get_or_set(version, lambda: compute_facets(query))
@@ -2,6 +2,7 @@ from flask_wtf import FlaskForm
 from flask_wtf.file import FileField, FileAllowed, FileRequired
 from wtforms import StringField, PasswordField, BooleanField, SubmitField, TextAreaField, IntegerField, SelectField
 from wtforms.validators import DataRequired, Email, Length, EqualTo, ValidationError, Optional, NumberRange
+from nemukerja.cv_storage import looks_like_pdf
 
 class RegisterForm(FlaskForm):
     name = StringField('Full Name', validators=[DataRequired(), Length(min=2, max=100)])
@@ -43,6 +44,13 @@ class AddJobForm(FlaskForm):
     salary_max = IntegerField('Maximum Salary (Optional)', validators=[Optional(), NumberRange(min=0)])
     submit = SubmitField('Add Job')
 
+class ImportJobsForm(FlaskForm):
+    jobs_file = FileField('Jobs File (CSV, JSON or NDJSON)', validators=[
+        FileRequired(message='Please choose a file'),
+        FileAllowed(['csv', 'json', 'ndjson'], 'Only CSV, JSON or NDJSON files are allowed!')
+    ])
+    submit = SubmitField('Import Jobs')
+
 class ApplyForm(FlaskForm):
     cover_letter = TextAreaField('Cover Letter', validators=[
         DataRequired(), 
@@ -69,6 +77,10 @@ class ApplyForm(FlaskForm):
                 filename = field.data.filename.lower()
                 if not filename.endswith('.pdf'):
                     raise ValidationError('Only PDF files are allowed.')
+
+                # Isi file harus benar-benar PDF (magic bytes), bukan hanya ekstensinya
+                if not looks_like_pdf(field.data.stream):
+                    raise ValidationError('Only PDF files are allowed.')
                     
             except OSError:
                 # Handle case where file pointer cannot be moved
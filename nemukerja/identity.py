@@ -0,0 +1,104 @@
+from flask import current_app
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from nemukerja.caching import TTLCache
+from nemukerja.extensions import db
+from nemukerja.models import User, Applicant, Company
+
+# Snapshot pengguna + profil per worker, agar load_user tidak query di setiap request
+IDENTITY_CACHE_SIZE = 4096
+
+_identity_cache = TTLCache(maxsize=IDENTITY_CACHE_SIZE)
+
+# (relationship di User, model profil)
+PROFILES = (
+    ('applicant_profile', Applicant),
+    ('company_profile', Company),
+)
+
+
+def _columns(obj):
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def _snapshot(user):
+    """Nilai kolom pengguna dan profilnya (tuple/dict biasa, aman dipakai lintas request)."""
+    profiles = {}
+    for name, _ in PROFILES:
+        profile = getattr(user, name)
+        profiles[name] = _columns(profile) if profile is not None else None
+    return _columns(user), profiles
+
+
+def _rebuild(model, values):
+    """Objek ORM dari snapshot, dalam status 'detached' yang bersih (tanpa perubahan tertunda)."""
+    obj = inspect(model).class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(obj, key, value)
+    make_transient_to_detached(obj)
+    return obj
+
+
+def _restore(snapshot):
+    user_values, profile_values = snapshot
+    user = _rebuild(User, user_values)
+    for name, model in PROFILES:
+        profile = _rebuild(model, profile_values[name]) if profile_values[name] is not None else None
+        set_committed_value(user, name, profile)
+        if profile is not None:
+            set_committed_value(profile, 'user', user)
+    # merge(load=False) memasang objek ke session request ini tanpa SELECT,
+    # jadi relasi lain (applications, notifications, ...) tetap bisa di-lazy-load
+    return db.session.merge(user, load=False)
+
+
+def load_identity(user_id):
+    """Pengguna untuk Flask-Login: dari cache worker, atau satu query (user + profil) jika belum ada."""
+    ttl = current_app.config['IDENTITY_CACHE_TTL']
+    snapshot = _identity_cache.get(user_id) if ttl > 0 else None
+    if snapshot is not None:
+        return _restore(snapshot)
+
+    user = db.session.execute(
+        select(User)
+        .options(joinedload(User.applicant_profile), joinedload(User.company_profile))
+        .where(User.id == user_id)
+    ).unique().scalar_one_or_none()
+    if user is not None and ttl > 0:
+        _identity_cache.set(user_id, _snapshot(user), ttl)
+    return user
+
+
+def invalidate_identity(user_id):
+    """Dipanggil setelah perubahan lewat Core (UPDATE/DELETE langsung) yang tidak melewati flush ORM."""
+    _identity_cache.delete(user_id)
+
+
+def _owner_id(obj):
+    if isinstance(obj, User):
+        return obj.id
+    if isinstance(obj, (Applicant, Company)):
+        return obj.id_user
+    return None
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_identities(session, flush_context):
+    # Edit profil, reset/rehash password, perubahan role, watermark notifikasi, hapus akun
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        user_id = _owner_id(obj)
+        if user_id is not None:
+            session.info.setdefault('identity_changed', set()).add(user_id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_identities(session):
+    for user_id in session.info.pop('identity_changed', ()):
+        _identity_cache.delete(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_identities(session):
+    session.info.pop('identity_changed', None)
@@ -0,0 +1,150 @@
+import csv
+import io
+import json
+
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.datastructures import MultiDict
+
+from nemukerja import notifications
+from nemukerja.caching import JOBS_VERSION, bump_version
+from nemukerja.extensions import db
+from nemukerja.forms import AddJobForm
+from nemukerja.models import JobListing
+
+IMPORT_FORMATS = ('csv', 'json', 'ndjson')
+# Kolom yang dibaca dari file (sama dengan field AddJobForm)
+IMPORT_FIELDS = ('title', 'location', 'description', 'qualifications', 'slots', 'salary_min', 'salary_max')
+# Jumlah judul lowongan yang disebut di pesan broadcast satu batch
+BROADCAST_TITLES = 3
+
+
+class ImportRejected(Exception):
+    """File tidak bisa dibaca (encoding, CSV rusak atau struktur JSON salah)."""
+
+
+def import_format(filename):
+    """Format import dari ekstensi file ('csv', 'json', 'ndjson') atau None."""
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return extension if extension in IMPORT_FORMATS else None
+
+
+def read_rows(stream, fmt):
+    """Generator (nomor baris, dict atau None, error atau None) dari file CSV, JSON (array objek) atau NDJSON.
+
+    Baris yang rusak dilaporkan lewat error tanpa menghentikan pembacaan.
+    Nomor baris CSV/NDJSON adalah baris di file; untuk JSON adalah urutan objek (mulai 1).
+    """
+    try:
+        if fmt == 'csv':
+            reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+            for row in reader:
+                yield reader.line_num, row, None
+        elif fmt == 'ndjson':
+            for line, text in enumerate(io.TextIOWrapper(stream, encoding='utf-8-sig'), start=1):
+                if not text.strip():
+                    continue
+                try:
+                    row = json.loads(text)
+                except ValueError as error:
+                    yield line, None, {'row': [f'Invalid JSON: {error.msg}']}
+                    continue
+                yield (line, row, None) if isinstance(row, dict) else (line, None, {'row': ['Expected a JSON object']})
+        elif fmt == 'json':
+            try:
+                rows = json.load(io.TextIOWrapper(stream, encoding='utf-8-sig'))
+            except ValueError as error:
+                raise ImportRejected(f'Invalid JSON: {error}')
+            if not isinstance(rows, list):
+                raise ImportRejected('Expected a JSON array of job objects')
+            for line, row in enumerate(rows, start=1):
+                yield (line, row, None) if isinstance(row, dict) else (line, None, {'row': ['Expected a JSON object']})
+        else:
+            raise ImportRejected(f'Unknown import format: {fmt!r}')
+    except (UnicodeDecodeError, csv.Error) as error:
+        raise ImportRejected(f'Unreadable file: {error}')
+
+
+def validate_row(row):
+    """Memvalidasi satu baris dengan aturan AddJobForm. Mengembalikan (nilai kolom, None) atau (None, error)."""
+    # Nilai kosong tidak dikirim supaya default field (slots=1) dan Optional() berlaku seperti di form
+    data = MultiDict({field: str(row[field]).strip() for field in IMPORT_FIELDS
+                      if row.get(field) is not None and str(row[field]).strip()})
+    form = AddJobForm(formdata=data, meta={'csrf': False})
+    if not form.validate():
+        return None, {field: errors for field, errors in form.errors.items() if field in IMPORT_FIELDS}
+    return {
+        'title': form.title.data,
+        'location': form.location.data,
+        'description': form.description.data,
+        'qualifications': form.qualifications.data,
+        'slots': form.slots.data,
+        'salary_min': form.salary_min.data or 0,
+        'salary_max': form.salary_max.data or 0,
+    }, None
+
+
+def _batch_message(company, titles):
+    if len(titles) == 1:
+        return f"A new job '{titles[0]}' has been posted by {company.company_name}"
+    named = ', '.join(titles[:BROADCAST_TITLES])
+    more = f' and {len(titles) - BROADCAST_TITLES} more' if len(titles) > BROADCAST_TITLES else ''
+    return f"{len(titles)} new jobs have been posted by {company.company_name}: {named}{more}"[:255]
+
+
+def _insert_batch(company, batch, report):
+    """INSERT satu batch (executemany) + satu broadcast + satu commit; batch gagal dilaporkan per baris."""
+    try:
+        db.session.execute(insert(JobListing), [values for _, values in batch])
+        # INSERT massal tidak lewat flush ORM, jadi versi cache daftar lowongan dinaikkan di sini
+        bump_version(JOBS_VERSION)
+        notifications.broadcast(
+            'applicant',
+            title="New Job Posted" if len(batch) == 1 else "New Jobs Posted",
+            message=_batch_message(company, [values['title'] for _, values in batch]),
+            type='job_posted',
+            # Tanpa RETURNING (MySQL) id lowongan baru tidak diketahui; notifikasi tanpa tautan
+            related_id=None
+        )
+        db.session.commit()
+    except SQLAlchemyError as error:
+        db.session.rollback()
+        message = f'Batch not saved: {error.__class__.__name__}'
+        report['errors'].extend((line, {'row': [message]}) for line, _ in batch)
+        return
+    report['imported'] += len(batch)
+    report['batches'] += 1
+
+
+def import_jobs(company, rows, batch_size=500, max_rows=5000):
+    """Mengimpor baris dari read_rows() sebagai lowongan milik `company`.
+
+    Baris yang tidak valid dilewati dan dicatat; baris valid dimasukkan per
+    `batch_size` (satu commit dan satu notifikasi broadcast per batch).
+    Mengembalikan dict: imported, batches, errors (list (nomor baris, {field: [pesan]});
+    nomor baris None berarti error untuk seluruh file).
+    """
+    report = {'imported': 0, 'batches': 0, 'errors': []}
+    batch = []
+    try:
+        for count, (line, row, error) in enumerate(rows, start=1):
+            if count > max_rows:
+                report['errors'].append((line, {'row': [f'Row limit of {max_rows} reached; remaining rows skipped']}))
+                break
+            values = None
+            if error is None:
+                values, error = validate_row(row)
+            if error:
+                report['errors'].append((line, error))
+                continue
+            values['id_company'] = company.id
+            batch.append((line, values))
+            if len(batch) >= batch_size:
+                _insert_batch(company, batch, report)
+                batch = []
+    except ImportRejected as error:
+        # File rusak di tengah jalan: baris valid sebelumnya tetap disimpan
+        report['errors'].append((None, {'file': [str(error)]}))
+    if batch:
+        _insert_batch(company, batch, report)
+    return report
@@ -0,0 +1,214 @@
+import json
+import random
+import smtplib
+import time
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from flask_mail import Message, BadHeaderError
+from sqlalchemy import select, update
+
+from nemukerja.extensions import db, mail
+from nemukerja.models import OutboundMail
+
+# Kode SMTP 421: server menutup koneksi, jadi diperlakukan seperti koneksi putus
+SMTP_SERVICE_CLOSING = 421
+
+
+class ConnectionLost(Exception):
+    """Koneksi SMTP putus; email yang belum terkirim dikembalikan ke antrean."""
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def enqueue(subject, recipients, body, html=None, sender=None):
+    """Menambahkan email ke antrean di transaksi yang sedang berjalan (pemanggil yang commit).
+
+    Request HTTP tidak pernah menunggu SMTP; email dikirim oleh `flask mail-worker`.
+    """
+    outbound = OutboundMail(
+        subject=subject,
+        sender=sender or current_app.config.get('MAIL_DEFAULT_SENDER') or current_app.config['MAIL_USERNAME'],
+        recipients=json.dumps(list(recipients)),
+        body=body,
+        html=html,
+        status='pending',
+        attempts=0,
+        next_attempt_at=utcnow()
+    )
+    db.session.add(outbound)
+    return outbound
+
+
+def retry_delay(attempts):
+    """Jeda sebelum percobaan berikutnya: exponential backoff dengan jitter, dibatasi MAIL_QUEUE_MAX_DELAY."""
+    config = current_app.config
+    delay = min(config['MAIL_QUEUE_MAX_DELAY'], config['MAIL_QUEUE_BASE_DELAY'] * 2 ** (attempts - 1))
+    return timedelta(seconds=random.uniform(delay / 2, delay))
+
+
+def claim_batch(limit):
+    """Mengambil hingga `limit` email yang sudah waktunya dikirim dan menandainya 'sending'.
+
+    Setiap baris diklaim dengan UPDATE bersyarat, jadi beberapa worker bisa
+    berjalan bersamaan tanpa mengirim email yang sama dua kali. Klaim berlaku
+    selama MAIL_QUEUE_LEASE detik; jika worker mati di tengah jalan, email
+    diambil lagi oleh worker lain setelah lease habis.
+    """
+    now = utcnow()
+    lease_until = now + timedelta(seconds=current_app.config['MAIL_QUEUE_LEASE'])
+    due = (OutboundMail.status.in_(('pending', 'sending')), OutboundMail.next_attempt_at <= now)
+    ids = db.session.scalars(
+        select(OutboundMail.id).where(*due).order_by(OutboundMail.id).limit(limit)
+    ).all()
+    claimed = []
+    for mail_id in ids:
+        result = db.session.execute(
+            update(OutboundMail)
+            .where(OutboundMail.id == mail_id, *due)
+            .values(status='sending', next_attempt_at=lease_until)
+        )
+        if result.rowcount == 1:
+            claimed.append(mail_id)
+    db.session.commit()
+    if not claimed:
+        return []
+    return db.session.scalars(
+        select(OutboundMail).where(OutboundMail.id.in_(claimed)).order_by(OutboundMail.id)
+    ).all()
+
+
+def _message(outbound):
+    return Message(outbound.subject, sender=outbound.sender,
+                   recipients=json.loads(outbound.recipients),
+                   body=outbound.body, html=outbound.html)
+
+
+def _is_connection_error(error):
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == SMTP_SERVICE_CLOSING
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return False
+    return isinstance(error, OSError)
+
+
+def _is_permanent(error):
+    """Error 5xx (alamat ditolak, pesan ditolak) atau pesan tidak valid: tidak perlu dicoba ulang."""
+    if isinstance(error, (BadHeaderError, AssertionError)):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+class MailWorker:
+    """Mengirim antrean email memakai satu koneksi SMTP yang dipakai ulang antar batch.
+
+    Koneksi (TLS + login) dibuka saat ada email dan ditutup setelah antrean
+    kosong selama MAIL_QUEUE_IDLE_CLOSE detik atau saat koneksi putus.
+    """
+
+    def __init__(self):
+        self._stack = None
+        self.connection = None
+        self.last_used = 0.0
+        self.connect_failures = 0
+        self.stats = {'sent': 0, 'retry': 0, 'failed': 0}
+
+    def _connect(self):
+        if self.connection is None:
+            self._stack = ExitStack()
+            try:
+                self.connection = self._stack.enter_context(mail.connect())
+            except Exception as error:
+                # Gagal connect/STARTTLS/login bukan kesalahan email-nya
+                self._stack = None
+                raise ConnectionLost(str(error)) from error
+        return self.connection
+
+    def close(self):
+        if self._stack is not None:
+            try:
+                self._stack.close()
+            except (smtplib.SMTPException, OSError):
+                pass
+        self._stack = None
+        self.connection = None
+
+    def close_if_idle(self):
+        if self.connection is not None and time.monotonic() - self.last_used > current_app.config['MAIL_QUEUE_IDLE_CLOSE']:
+            self.close()
+
+    def _send(self, outbound):
+        connection = self._connect()
+        try:
+            connection.send(_message(outbound))
+        except Exception as error:
+            if _is_connection_error(error):
+                raise ConnectionLost(str(error)) from error
+            outbound.attempts += 1
+            outbound.last_error = f'{type(error).__name__}: {error}'[:255]
+            if _is_permanent(error) or outbound.attempts >= current_app.config['MAIL_QUEUE_MAX_ATTEMPTS']:
+                outbound.status = 'failed'
+                self.stats['failed'] += 1
+            else:
+                outbound.status = 'pending'
+                outbound.next_attempt_at = utcnow() + retry_delay(outbound.attempts)
+                self.stats['retry'] += 1
+        else:
+            outbound.status = 'sent'
+            outbound.sent_at = utcnow()
+            outbound.last_error = None
+            self.stats['sent'] += 1
+        finally:
+            self.last_used = time.monotonic()
+        # Commit per email supaya email yang sudah terkirim tidak dikirim ulang jika worker mati
+        db.session.commit()
+
+    def process_batch(self, limit):
+        """Mengirim satu batch. Mengembalikan jumlah email yang diklaim (0 jika antrean kosong)."""
+        batch = claim_batch(limit)
+        for index, outbound in enumerate(batch):
+            try:
+                self._send(outbound)
+            except ConnectionLost as error:
+                self.close()
+                # Kembalikan email ini dan sisanya tanpa menghitung percobaan; worker menunggu dulu
+                for pending in batch[index:]:
+                    pending.status = 'pending'
+                    pending.next_attempt_at = utcnow()
+                    pending.last_error = f'connection: {error}'[:255]
+                db.session.commit()
+                self.connect_failures += 1
+                raise
+        self.connect_failures = 0
+        return len(batch)
+
+    def run(self, batch_size, poll_interval, once=False):
+        """Loop worker. Dengan `once=True` berhenti setelah antrean kosong."""
+        config = current_app.config
+        try:
+            while True:
+                try:
+                    claimed = self.process_batch(batch_size)
+                except ConnectionLost as error:
+                    delay = min(config['MAIL_QUEUE_MAX_DELAY'],
+                                config['MAIL_QUEUE_BASE_DELAY'] * 2 ** (self.connect_failures - 1))
+                    current_app.logger.warning('SMTP connection failed (%s), retrying in %.0fs', error, delay)
+                    if once:
+                        return self.stats
+                    time.sleep(random.uniform(delay / 2, delay))
+                    continue
+                if claimed:
+                    continue
+                self.close_if_idle()
+                if once:
+                    return self.stats
+                time.sleep(poll_interval)
+        finally:
+            self.close()
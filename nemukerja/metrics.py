@@ -0,0 +1,206 @@
+import time
+from collections import deque, defaultdict
+from threading import Lock
+
+from flask import g, request, has_request_context, request_started, request_finished, \
+    before_render_template, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Mapper
+from sqlalchemy.pool import Pool
+
+# Jumlah sampel terakhir yang disimpan per endpoint per metrik (untuk p50/p95/p99)
+WINDOW_SIZE = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+
+# (nama metrik, atribut RequestStats, keterangan)
+REQUEST_METRICS = (
+    ('nemukerja_request_duration_seconds', 'duration', 'Wall time per request.'),
+    ('nemukerja_request_sql_statements', 'sql_count', 'SQL statements per request.'),
+    ('nemukerja_request_sql_seconds', 'sql_time', 'Time spent executing SQL per request.'),
+    ('nemukerja_request_rows_loaded', 'rows', 'ORM rows loaded per request.'),
+    ('nemukerja_request_template_seconds', 'template_time', 'Template render time per request.'),
+)
+
+
+class Window:
+    """Sampel terakhir (jumlah terbatas) beserta total count/sum sejak proses dimulai."""
+
+    def __init__(self, size=WINDOW_SIZE):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.samples.append(value)
+        self.count += 1
+        self.sum += value
+
+    def quantiles(self):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {q: 0.0 for q in QUANTILES}
+        return {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in QUANTILES}
+
+
+class Registry:
+    """Metrik per endpoint di memori proses ini (setiap worker punya registry sendiri)."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._windows = defaultdict(Window)
+        self._requests = defaultdict(int)
+        self.pool_checkouts = 0
+
+    def observe_request(self, endpoint, status, stats):
+        with self._lock:
+            self._requests[(endpoint, status)] += 1
+            for name, attr, _ in REQUEST_METRICS:
+                self._windows[(name, endpoint)].observe(getattr(stats, attr))
+
+    def count_checkout(self):
+        with self._lock:
+            self.pool_checkouts += 1
+
+    def snapshot(self):
+        with self._lock:
+            windows = {key: (window.quantiles(), window.count, window.sum)
+                       for key, window in self._windows.items()}
+            return windows, dict(self._requests), self.pool_checkouts
+
+    def clear(self):
+        with self._lock:
+            self._windows.clear()
+            self._requests.clear()
+
+
+registry = Registry()
+
+
+class RequestStats:
+    __slots__ = ('started', 'duration', 'sql_count', 'sql_time', 'rows', 'template_time', '_template_started')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.rows = 0
+        self.template_time = 0.0
+        self._template_started = []
+
+
+def current_stats():
+    """RequestStats untuk request yang sedang berjalan, atau None di luar request."""
+    if not has_request_context():
+        return None
+    stats = g.get('request_stats')
+    if stats is None:
+        stats = g.request_stats = RequestStats()
+    return stats
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['query_started'].pop()
+    stats = current_stats()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.sql_time += time.perf_counter() - started
+
+
+@event.listens_for(Engine, 'handle_error')
+def _query_failed(exception_context):
+    # after_cursor_execute tidak dipanggil untuk query yang gagal
+    started = exception_context.connection.info.get('query_started') if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+@event.listens_for(Mapper, 'load')
+def _count_loaded_row(target, context):
+    stats = current_stats()
+    if stats is not None:
+        stats.rows += 1
+
+
+def _request_started(sender, **extra):
+    g.request_stats = RequestStats()
+
+
+def _request_finished(sender, response, **extra):
+    stats = current_stats()
+    stats.duration = time.perf_counter() - stats.started
+    registry.observe_request(request.endpoint or 'unknown', response.status_code, stats)
+
+
+def _before_render_template(sender, template, context, **extra):
+    current_stats()._template_started.append(time.perf_counter())
+
+
+def _template_rendered(sender, template, context, **extra):
+    stats = current_stats()
+    if stats._template_started:
+        stats.template_time += time.perf_counter() - stats._template_started.pop()
+
+
+@event.listens_for(Pool, 'checkout')
+def _pool_checkout(dbapi_connection, connection_record, connection_proxy):
+    registry.count_checkout()
+
+
+def init_metrics(app):
+    """Mendaftarkan signal request dan template Flask untuk `app`."""
+    request_started.connect(_request_started, app)
+    request_finished.connect(_request_finished, app)
+    before_render_template.connect(_before_render_template, app)
+    template_rendered.connect(_template_rendered, app)
+
+
+def _labels(**labels):
+    return ','.join(f'{key}="{value}"' for key, value in labels.items())
+
+
+def render_prometheus(engine):
+    """Semua metrik dalam format teks Prometheus (version 0.0.4)."""
+    windows, requests, checkouts = registry.snapshot()
+    lines = [
+        '# HELP nemukerja_requests_total Requests handled by this process.',
+        '# TYPE nemukerja_requests_total counter',
+    ]
+    for (endpoint, status), count in sorted(requests.items()):
+        lines.append(f'nemukerja_requests_total{{{_labels(endpoint=endpoint, status=status)}}} {count}')
+
+    for name, _, help_text in REQUEST_METRICS:
+        lines.append(f'# HELP {name} {help_text} Quantiles over the last {WINDOW_SIZE} requests.')
+        lines.append(f'# TYPE {name} summary')
+        for (metric, endpoint), (quantiles, count, total) in sorted(windows.items()):
+            if metric != name:
+                continue
+            for q, value in quantiles.items():
+                lines.append(f'{name}{{{_labels(endpoint=endpoint, quantile=q)}}} {value:.6g}')
+            lines.append(f'{name}_sum{{{_labels(endpoint=endpoint)}}} {total:.6g}')
+            lines.append(f'{name}_count{{{_labels(endpoint=endpoint)}}} {count}')
+
+    pool = engine.pool
+    gauges = (
+        ('nemukerja_db_pool_size', 'size', 'Configured pool size.'),
+        ('nemukerja_db_pool_checked_out', 'checkedout', 'Connections currently checked out.'),
+        ('nemukerja_db_pool_checked_in', 'checkedin', 'Idle connections in the pool.'),
+        ('nemukerja_db_pool_overflow', 'overflow', 'Connections above the pool size (negative while the pool is not full).'),
+    )
+    for name, method, help_text in gauges:
+        # Tidak semua jenis pool punya statistik ini (mis. StaticPool / SingletonThreadPool)
+        if hasattr(pool, method):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge', f'{name} {getattr(pool, method)()}']
+    lines += [
+        '# HELP nemukerja_db_pool_checkouts_total Connection checkouts from the pool.',
+        '# TYPE nemukerja_db_pool_checkouts_total counter',
+        f'nemukerja_db_pool_checkouts_total {checkouts}',
+    ]
+    return '\n'.join(lines) + '\n'
@@ -5,12 +5,20 @@ from datetime import datetime
 
 class User(db.Model, UserMixin):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Daftar pengguna admin, terbaru dulu
+        db.Index('ix_users_created_at', 'created_at'),
+    )
     id = db.Column('id_user', db.Integer, primary_key=True)
     email = db.Column(db.String(255), unique=True, nullable=False)
     password = db.Column('password', db.String(255), nullable=False)
     role = db.Column(db.Enum('applicant', 'company','admin'), nullable=False)
     created_at = db.Column(db.TIMESTAMP, server_default=func.now())
     updated_at = db.Column(db.TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    # Watermark notifikasi broadcast: id <= broadcast_read_id dianggap sudah dibaca,
+    # id <= broadcast_cleared_id sudah dihapus dari daftar pengguna ini
+    broadcast_read_id = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    broadcast_cleared_id = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     applicant_profile = db.relationship('Applicant', backref='user', uselist=False, cascade="all, delete-orphan")
     company_profile = db.relationship('Company', backref='user', uselist=False, cascade="all, delete-orphan")
@@ -37,6 +45,9 @@ class User(db.Model, UserMixin):
         return None
 class Applicant(db.Model):
     __tablename__ = 'applicants'
+    __table_args__ = (
+        db.Index('ix_applicants_id_user', 'id_user'),
+    )
     id = db.Column('id_applicant', db.Integer, primary_key=True)
     id_user = db.Column(db.Integer, db.ForeignKey('users.id_user'), nullable=False)
     full_name = db.Column(db.String(255))
@@ -59,6 +70,13 @@ class Applicant(db.Model):
 
 class Company(db.Model):
     __tablename__ = 'companies'
+    __table_args__ = (
+        db.Index('ix_companies_id_user', 'id_user'),
+        # Daftar perusahaan admin, terbaru dulu
+        db.Index('ix_companies_created_at', 'created_at'),
+        # Sinkronisasi index autocomplete (nemukerja/suggest.py)
+        db.Index('ix_companies_updated_at', 'updated_at'),
+    )
     id = db.Column('id_company', db.Integer, primary_key=True)
     id_user = db.Column(db.Integer, db.ForeignKey('users.id_user'), nullable=False)
     company_name = db.Column(db.String(255), nullable=False)
@@ -72,6 +90,16 @@ class Company(db.Model):
 
 class JobListing(db.Model):
     __tablename__ = 'job_listings'
+    __table_args__ = (
+        # Daftar lowongan terbuka (index, dashboard pelamar), terbaru dulu
+        db.Index('ix_job_listings_is_open_posted_at', 'is_open', 'posted_at'),
+        # Dashboard perusahaan
+        db.Index('ix_job_listings_id_company_posted_at', 'id_company', 'posted_at'),
+        # Daftar lowongan admin (semua status), terbaru dulu
+        db.Index('ix_job_listings_posted_at', 'posted_at'),
+        # Sinkronisasi index autocomplete (nemukerja/suggest.py)
+        db.Index('ix_job_listings_updated_at', 'updated_at'),
+    )
     id = db.Column('id_job', db.Integer, primary_key=True)
     id_company = db.Column(db.Integer, db.ForeignKey('companies.id_company'), nullable=False)
     title = db.Column(db.String(255), nullable=False)
@@ -84,11 +112,24 @@ class JobListing(db.Model):
     salary_max = db.Column(db.Integer, default=0)
     posted_at = db.Column(db.TIMESTAMP, server_default=func.now())
     updated_at = db.Column(db.TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    # Penghitung lamaran, dijaga oleh nemukerja/counters.py (flask reconcile-counters untuk memperbaiki)
+    applications_total = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    applications_pending = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    applications_accepted = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    applications_rejected = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     applications = db.relationship('Application', backref='job', cascade="all, delete-orphan")
 
 class Application(db.Model):
     __tablename__ = 'applications'
+    __table_args__ = (
+        # Satu pelamar hanya boleh melamar satu kali ke lowongan yang sama
+        db.UniqueConstraint('id_applicant', 'id_job', name='uq_applications_applicant_job'),
+        # Cek slot di apply() dan job_detail()
+        db.Index('ix_applications_id_job_status', 'id_job', 'status'),
+        # Halaman "My Applications"
+        db.Index('ix_applications_id_applicant_applied_at', 'id_applicant', 'applied_at'),
+    )
     id = db.Column('id_application', db.Integer, primary_key=True)
     id_applicant = db.Column(db.Integer, db.ForeignKey('applicants.id_applicant'), nullable=False)
     id_job = db.Column(db.Integer, db.ForeignKey('job_listings.id_job'), nullable=False)
@@ -99,9 +140,15 @@ class Application(db.Model):
 
 class Notification(db.Model):
     __tablename__ = 'notifications'
+    __table_args__ = (
+        db.Index('ix_notifications_id_user_is_read_created_at', 'id_user', 'is_read', 'created_at'),
+        db.Index('ix_notifications_audience_id', 'audience', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    id_user = db.Column(db.Integer, db.ForeignKey('users.id_user'), nullable=False) 
+    # NULL untuk notifikasi broadcast (satu baris untuk semua pengguna dengan role `audience`)
+    id_user = db.Column(db.Integer, db.ForeignKey('users.id_user'), nullable=True)
+    audience = db.Column(db.Enum('applicant', 'company'), nullable=True)
     title = db.Column(db.String(255), nullable=False)
     message = db.Column(db.String(255), nullable=False)
     type = db.Column(db.Enum('job_posted', 'application_received', 'application_status'), nullable=False)
@@ -111,13 +158,53 @@ class Notification(db.Model):
 
     user = db.relationship('User', backref=db.backref('notifications', lazy=True))
 
-    def to_dict(self):
+    @property
+    def is_broadcast(self):
+        return self.id_user is None
+
+    def to_dict(self, is_read=None):
         return {
             'id': self.id,
             'title': self.title,
             'message': self.message,
             'type': self.type,
-            'is_read': self.is_read,
+            'is_read': self.is_read if is_read is None else is_read,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'related_id': self.related_id
-        }
\ No newline at end of file
+        }
+
+# Notifikasi broadcast yang dibaca satu per satu (di atas watermark pengguna)
+class NotificationRead(db.Model):
+    __tablename__ = 'notification_reads'
+
+    id_user = db.Column(db.Integer, db.ForeignKey('users.id_user'), primary_key=True)
+    id_notification = db.Column(db.Integer, db.ForeignKey('notifications.id'), primary_key=True)
+
+# Antrean email keluar, dikirim oleh `flask mail-worker` (lihat nemukerja/mail_queue.py)
+class OutboundMail(db.Model):
+    __tablename__ = 'outbound_mail'
+    __table_args__ = (
+        # Worker mengambil email yang sudah waktunya dikirim
+        db.Index('ix_outbound_mail_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    sender = db.Column(db.String(255))
+    recipients = db.Column(db.Text, nullable=False)  # JSON list alamat
+    body = db.Column(db.Text, nullable=False)
+    html = db.Column(db.Text)
+    # 'sending' = sedang dipegang worker sampai next_attempt_at (lease), setelah itu boleh diambil ulang
+    status = db.Column(db.Enum('pending', 'sending', 'sent', 'failed'), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False)
+    last_error = db.Column(db.String(255))
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    sent_at = db.Column(db.DateTime)
+
+# Nomor versi data untuk invalidasi cache (ETag halaman publik, cache halaman)
+class CacheVersion(db.Model):
+    __tablename__ = 'cache_versions'
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,229 @@
+import heapq
+import threading
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session, object_session
+
+from nemukerja.extensions import db
+from nemukerja.models import Notification, NotificationRead
+
+# Dibangunkan setiap ada notifikasi baru yang di-commit di proses ini
+_new_notification = threading.Condition()
+_generation = 0
+# Koneksi SSE yang sedang terbuka di proses ini (lihat open_stream)
+_stream_lock = threading.Lock()
+_open_streams = 0
+
+
+def open_stream(limit):
+    """Memesan satu slot koneksi SSE. False jika sudah ada `limit` koneksi terbuka di proses ini.
+
+    Setiap koneksi memegang satu thread worker hingga NOTIFICATION_STREAM_TIMEOUT,
+    jadi tanpa batas ini tab yang terbuka bisa menghabiskan semua worker.
+    """
+    global _open_streams
+    with _stream_lock:
+        if _open_streams >= limit:
+            return False
+        _open_streams += 1
+        return True
+
+
+def close_stream():
+    global _open_streams
+    with _stream_lock:
+        _open_streams -= 1
+
+
+def open_stream_count():
+    with _stream_lock:
+        return _open_streams
+
+
+def broadcast(audience, title, message, type, related_id=None):
+    """Membuat satu notifikasi untuk semua pengguna dengan role `audience` (O(1), tanpa fan-out)."""
+    notification = Notification(
+        id_user=None,
+        audience=audience,
+        title=title,
+        message=message,
+        type=type,
+        related_id=related_id
+    )
+    db.session.add(notification)
+    return notification
+
+
+def viewer_snapshot(user):
+    """Salinan ringan atribut pengguna yang dipakai modul ini, aman dipakai di luar sesi DB
+    (misalnya di dalam generator SSE yang berjalan lama)."""
+    return SimpleNamespace(
+        id=user.id,
+        role=user.role,
+        created_at=user.created_at,
+        broadcast_read_id=user.broadcast_read_id,
+        broadcast_cleared_id=user.broadcast_cleared_id
+    )
+
+
+def _personal_query(user):
+    return Notification.query.filter_by(id_user=user.id)
+
+
+def _broadcast_query(user):
+    query = Notification.query.filter(
+        Notification.audience == user.role,
+        Notification.id > user.broadcast_cleared_id
+    )
+    # Pengguna baru tidak perlu melihat broadcast lama sebelum ia mendaftar
+    if user.created_at is not None:
+        query = query.filter(Notification.created_at >= user.created_at)
+    return query
+
+
+def get_user_notifications(user, limit=10, since=None):
+    """Mengembalikan list dict notifikasi terbaru pengguna (personal + broadcast digabung).
+
+    Jika `since` diisi, hanya notifikasi dengan id > since yang dikembalikan (delta).
+    """
+    personal_query = _personal_query(user)
+    broadcast_query = _broadcast_query(user)
+    if since:
+        personal_query = personal_query.filter(Notification.id > since)
+        broadcast_query = broadcast_query.filter(Notification.id > since)
+
+    personal = (personal_query
+                .order_by(Notification.created_at.desc(), Notification.id.desc())
+                .limit(limit).all())
+    broadcasts = (broadcast_query
+                  .order_by(Notification.id.desc())
+                  .limit(limit).all())
+
+    # Broadcast di atas watermark yang sudah dibaca satu per satu
+    unread_candidates = [n.id for n in broadcasts if n.id > user.broadcast_read_id]
+    read_ids = set()
+    if unread_candidates:
+        read_ids = {row.id_notification for row in NotificationRead.query.filter(
+            NotificationRead.id_user == user.id,
+            NotificationRead.id_notification.in_(unread_candidates)
+        )}
+
+    def sort_key(n):
+        return (n.created_at, n.id)
+
+    merged = heapq.merge(personal, broadcasts, key=sort_key, reverse=True)
+    result = []
+    for n in merged:
+        if len(result) >= limit:
+            break
+        if n.is_broadcast:
+            is_read = n.id <= user.broadcast_read_id or n.id in read_ids
+            result.append(n.to_dict(is_read=is_read))
+        else:
+            result.append(n.to_dict())
+    return result
+
+
+def mark_read(user, notification):
+    """Menandai satu notifikasi sebagai dibaca. Mengembalikan False jika bukan milik pengguna."""
+    if notification.is_broadcast:
+        if notification.audience != user.role:
+            return False
+        if notification.id > user.broadcast_read_id:
+            db.session.merge(NotificationRead(id_user=user.id, id_notification=notification.id))
+        return True
+
+    if notification.id_user != user.id:
+        return False
+    notification.is_read = True
+    return True
+
+
+def _latest_broadcast_id(user):
+    return db.session.query(func.max(Notification.id)).filter(
+        Notification.audience == user.role
+    ).scalar() or 0
+
+
+def mark_all_read(user):
+    """Menandai semua notifikasi sebagai dibaca: UPDATE personal + geser watermark broadcast."""
+    Notification.query.filter_by(id_user=user.id, is_read=False).update({'is_read': True})
+    user.broadcast_read_id = max(user.broadcast_read_id, _latest_broadcast_id(user))
+    NotificationRead.query.filter(
+        NotificationRead.id_user == user.id,
+        NotificationRead.id_notification <= user.broadcast_read_id
+    ).delete(synchronize_session=False)
+
+
+def clear_all(user):
+    """Menghapus semua notifikasi personal dan menyembunyikan broadcast yang sudah ada."""
+    Notification.query.filter_by(id_user=user.id).delete(synchronize_session=False)
+    latest = _latest_broadcast_id(user)
+    user.broadcast_cleared_id = max(user.broadcast_cleared_id, latest)
+    user.broadcast_read_id = max(user.broadcast_read_id, latest)
+    NotificationRead.query.filter(
+        NotificationRead.id_user == user.id
+    ).delete(synchronize_session=False)
+
+
+def latest_notification_id(user):
+    """Id notifikasi terbaru yang terlihat oleh pengguna (0 jika tidak ada)."""
+    personal = _personal_query(user).with_entities(func.max(Notification.id)).scalar()
+    broadcast = _broadcast_query(user).with_entities(func.max(Notification.id)).scalar()
+    return max(personal or 0, broadcast or 0)
+
+
+def notify_waiters():
+    """Membangunkan semua wait_for_notifications() di proses ini."""
+    global _generation
+    with _new_notification:
+        _generation += 1
+        _new_notification.notify_all()
+
+
+@event.listens_for(Notification, 'after_insert')
+def _flag_new_notification(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info['new_notifications'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_waiters(session):
+    if session.info.pop('new_notifications', False):
+        notify_waiters()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_new_notification_flag(session):
+    session.info.pop('new_notifications', None)
+
+
+def wait_for_notifications(user, since, timeout, recheck=15):
+    """Menunggu hingga ada notifikasi dengan id > since, paling lama `timeout` detik.
+
+    Mengembalikan tuple (items, latest_id). Notifikasi dari proses ini
+    membangunkan penunggu seketika; notifikasi dari worker lain terdeteksi
+    lewat pengecekan ringan (MAX(id)) setiap `recheck` detik.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        with _new_notification:
+            generation = _generation
+
+        latest = latest_notification_id(user)
+        if latest > since:
+            items = get_user_notifications(user, since=since)
+            db.session.close()
+            return items, latest
+
+        # Lepas koneksi (dan snapshot transaksi) selama menunggu
+        db.session.close()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return [], since
+        with _new_notification:
+            if _generation == generation:
+                _new_notification.wait(min(remaining, recheck))
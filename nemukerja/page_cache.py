@@ -0,0 +1,202 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+
+from nemukerja.caching import TTLCache
+
+
+def normalized_query(args):
+    """Query string kanonik: parameter kosong dibuang, urutan parameter tidak berpengaruh."""
+    pairs = sorted((key, value) for key, values in args.lists() for value in values if value.strip())
+    return urlencode(pairs)
+
+
+class MemoryBackend:
+    """Cache di memori proses (setiap worker punya salinan sendiri)."""
+
+    def __init__(self, maxsize):
+        self._cache = TTLCache(maxsize=maxsize)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value, ttl):
+        self._cache.set(key, value, ttl)
+
+    def clear(self):
+        self._cache.clear()
+
+
+class SQLiteBackend:
+    """Cache bersama antar worker di satu mesin, disimpan di file SQLite lokal (mode WAL)."""
+
+    # Waktu akses untuk LRU hanya diperbarui jika lebih lama dari ini (mengurangi tulis saat hit)
+    TOUCH_INTERVAL = 1.0
+
+    def __init__(self, path, maxsize):
+        self.path = path
+        self.maxsize = maxsize
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS page_cache ('
+                               'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                               'expires REAL NOT NULL, accessed REAL NOT NULL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS ix_page_cache_accessed ON page_cache (accessed)')
+            self._local.connection = connection
+        return connection
+
+    def get(self, key):
+        now = time.time()
+        try:
+            connection = self._connection()
+            row = connection.execute('SELECT value, expires, accessed FROM page_cache WHERE key = ?',
+                                     (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires, accessed = row
+            if expires <= now:
+                connection.execute('DELETE FROM page_cache WHERE key = ?', (key,))
+                return None
+            if now - accessed > self.TOUCH_INTERVAL:
+                connection.execute('UPDATE page_cache SET accessed = ? WHERE key = ?', (now, key))
+            return value
+        except sqlite3.Error:
+            # Cache tidak boleh membuat halaman gagal; anggap miss
+            return None
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute('INSERT OR REPLACE INTO page_cache (key, value, expires, accessed) '
+                               'VALUES (?, ?, ?, ?)', (key, value, now + ttl, now))
+            # Buang entri yang paling lama tidak diakses di atas batas ukuran
+            connection.execute('DELETE FROM page_cache WHERE key IN ('
+                               'SELECT key FROM page_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                               (self.maxsize,))
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        try:
+            self._connection().execute('DELETE FROM page_cache')
+        except sqlite3.Error:
+            pass
+
+
+class FileSystemBackend:
+    """Cache bersama antar worker di satu mesin, satu file per entri (mtime dipakai untuk LRU)."""
+
+    def __init__(self, directory, maxsize):
+        self.directory = directory
+        self.maxsize = maxsize
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.html')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as source:
+                expires = float(source.readline())
+                value = source.read().decode('utf-8')
+        except (OSError, ValueError):
+            return None
+        if expires <= time.time():
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def set(self, key, value, ttl):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+            with os.fdopen(fd, 'wb') as out:
+                out.write(f'{time.time() + ttl}\n'.encode('ascii'))
+                out.write(value.encode('utf-8'))
+            os.replace(temp_path, self._path(key))
+            self._trim()
+        except OSError:
+            pass
+
+    def _trim(self):
+        entries = [entry for entry in os.scandir(self.directory)
+                   if entry.is_file() and entry.name.endswith('.html')]
+        if len(entries) <= self.maxsize:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.maxsize]:
+            self._remove(entry.path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                self._remove(entry.path)
+
+
+class PageCache:
+    """Cache HTML halaman untuk pengunjung anonim.
+
+    Kunci cache memuat nomor versi data (mis. JOBS_VERSION), jadi begitu versi
+    naik entri lama tidak pernah dibaca lagi dan tersingkir oleh batas LRU/TTL.
+    Backend dipilih lewat PAGE_CACHE_BACKEND: 'memory', 'sqlite', 'filesystem' atau 'off'.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.ttl = 0
+
+    def init_app(self, app):
+        config = app.config
+        kind = config['PAGE_CACHE_BACKEND']
+        size = config['PAGE_CACHE_SIZE']
+        self.ttl = config['PAGE_CACHE_TTL']
+        if kind == 'memory':
+            self.backend = MemoryBackend(size)
+        elif kind == 'sqlite':
+            self.backend = SQLiteBackend(os.path.join(config['PAGE_CACHE_DIR'], 'pages.sqlite3'), size)
+        elif kind == 'filesystem':
+            self.backend = FileSystemBackend(config['PAGE_CACHE_DIR'], size)
+        elif kind == 'off':
+            self.backend = None
+        else:
+            raise ValueError(f'Unknown PAGE_CACHE_BACKEND: {kind!r}')
+
+    def get_or_render(self, key, render):
+        """HTML dari cache, atau hasil render() yang kemudian disimpan."""
+        if self.backend is None:
+            return render()
+        html = self.backend.get(key)
+        if html is None:
+            html = render()
+            self.backend.set(key, html, self.ttl)
+        return html
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+
+page_cache = PageCache()
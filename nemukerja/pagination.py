@@ -0,0 +1,232 @@
+import base64
+import json
+from datetime import datetime
+
+from flask_sqlalchemy.pagination import Pagination, QueryPagination
+from sqlalchemy import and_, or_, tuple_, type_coerce, DateTime, String
+
+from nemukerja.caching import TTLCache
+
+# Cache jumlah total per kueri (in-process), supaya halaman dalam tidak menjalankan COUNT(*) terus
+COUNT_CACHE_TTL = 60
+COUNT_CACHE_SIZE = 1024
+
+_count_cache = TTLCache(maxsize=COUNT_CACHE_SIZE, ttl=COUNT_CACHE_TTL)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    # Token berasal dari klien: hanya skalar yang bisa di-bind ke SQL, selain itu token ditolak
+    if isinstance(value, dict) and value.keys() == {'dt'} and isinstance(value['dt'], str):
+        return datetime.fromisoformat(value['dt'])
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise ValueError(f'invalid cursor value: {value!r}')
+
+
+def encode_cursor(values, direction):
+    """Mengubah nilai kunci urutan menjadi token opaque yang aman untuk URL."""
+    payload = json.dumps({'k': [_encode_value(v) for v in values], 'd': direction},
+                         separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Membaca token cursor. Mengembalikan (values, direction) atau None jika token tidak valid."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        direction = payload['d']
+        if direction not in ('next', 'prev') or not isinstance(payload['k'], list):
+            return None
+        return [_decode_value(v) for v in payload['k']], direction
+    except Exception:
+        return None
+
+
+def cached_count(query, ttl=COUNT_CACHE_TTL):
+    """COUNT(*) dari kueri, di-cache selama `ttl` detik berdasarkan SQL dan parameternya."""
+    count_query = query.order_by(None)
+    if ttl <= 0:
+        return count_query.count()
+
+    compiled = count_query.statement.compile()
+    key = (str(compiled), tuple(sorted((k, repr(v)) for k, v in compiled.params.items())))
+    return _count_cache.get_or_set(key, count_query.count, ttl)
+
+
+def _seek_filter(keys, values, reverse):
+    """Kondisi WHERE untuk baris setelah (atau sebelum, jika reverse) nilai kunci `values`."""
+    directions = {direction for _, direction in keys}
+    if len(directions) == 1:
+        # Semua kolom searah: row-value comparison, bisa dilayani langsung oleh indeks komposit
+        descending = (directions.pop() == 'desc') != reverse
+        left = tuple_(*[expr for expr, _ in keys])
+        right = tuple_(*values)
+        return left < right if descending else left > right
+
+    clauses = []
+    for i, (expr, direction) in enumerate(keys):
+        descending = (direction == 'desc') != reverse
+        step = expr < values[i] if descending else expr > values[i]
+        clauses.append(and_(*[keys[j][0] == values[j] for j in range(i)], step))
+    return or_(*clauses)
+
+
+def _order_by(keys, reverse):
+    clauses = []
+    for expr, direction in keys:
+        descending = (direction == 'desc') != reverse
+        clauses.append(expr.desc() if descending else expr.asc())
+    return clauses
+
+
+class KeysetPagination:
+    """Hasil paginasi berbasis cursor (keyset), dipakai oleh _pagination.html.
+
+    `total` dihitung secara lazy (dan di-cache), jadi halaman yang tidak
+    menampilkannya tidak menjalankan COUNT(*) sama sekali.
+    """
+    cursor_mode = True
+
+    def __init__(self, query, items, per_page, next_cursor, prev_cursor, count_ttl):
+        self.query = query
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self._count_ttl = count_ttl
+        self._total = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    @property
+    def total(self):
+        if self._total is None:
+            self._total = cached_count(self.query, self._count_ttl)
+        return self._total
+
+
+def _comparable_key(expr, dialect):
+    # SQLite menyimpan TIMESTAMP sebagai teks dengan format yang bisa berbeda
+    # (CURRENT_TIMESTAMP tanpa mikrodetik, SQLAlchemy dengan mikrodetik). Cursor
+    # memakai teks mentahnya supaya perbandingan sama persis dengan ORDER BY.
+    if dialect == 'sqlite' and isinstance(getattr(expr, 'type', None), DateTime):
+        return type_coerce(expr, String)
+    return expr
+
+
+def keyset_paginate(query, keys, cursor=None, per_page=20, count_ttl=COUNT_CACHE_TTL):
+    """Paginasi keyset untuk `query`.
+
+    `keys` adalah list (ekspresi, 'asc'|'desc') yang urutannya unik (kolom
+    terakhir sebaiknya primary key). Biaya setiap halaman sama, berapapun
+    kedalamannya, karena tidak memakai OFFSET.
+    """
+    dialect = query.session.get_bind().dialect.name
+    keys = [(_comparable_key(expr, dialect), direction) for expr, direction in keys]
+
+    decoded = decode_cursor(cursor) if cursor else None
+    if decoded and len(decoded[0]) != len(keys):
+        decoded = None
+
+    reverse = bool(decoded) and decoded[1] == 'prev'
+    page_query = query.order_by(None)
+    if decoded:
+        page_query = page_query.filter(_seek_filter(keys, decoded[0], reverse))
+
+    # Kueri proyeksi (beberapa kolom) mengembalikan Row utuh, kueri entitas mengembalikan objeknya
+    single_entity = len(query.column_descriptions) == 1
+    rows = (page_query
+            .add_columns(*[expr for expr, _ in keys])
+            .order_by(*_order_by(keys, reverse))
+            .limit(per_page + 1)
+            .all())
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if reverse:
+        rows.reverse()
+
+    items = [row[0] for row in rows] if single_entity else list(rows)
+    next_cursor = prev_cursor = None
+    if reverse:
+        # Mundur dari sebuah halaman: halaman berikutnya pasti ada
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, decoded is not None
+
+    if rows:
+        if has_next:
+            next_cursor = encode_cursor(list(rows[-1][-len(keys):]), 'next')
+        if has_prev:
+            prev_cursor = encode_cursor(list(rows[0][-len(keys):]), 'prev')
+
+    return KeysetPagination(query, items, per_page, next_cursor, prev_cursor, count_ttl)
+
+
+class CachedCountPagination(QueryPagination):
+    """Paginasi bernomor (LIMIT/OFFSET) untuk _pagination.html, dengan total dari cached_count().
+
+    Argumen tambahan: `count_query` (kueri yang lebih ringan untuk menghitung total,
+    default sama dengan `query`) dan `count_ttl`.
+    """
+
+    def _query_count(self):
+        count_query = self._query_args.get('count_query') or self._query_args['query']
+        return cached_count(count_query, self._query_args.get('count_ttl', COUNT_CACHE_TTL))
+
+
+def paginate_query(query, per_page=25, count_query=None, count_ttl=COUNT_CACHE_TTL):
+    """Paginasi bernomor; nomor halaman dibaca dari ?page= pada request."""
+    return CachedCountPagination(query=query, per_page=per_page, error_out=False,
+                                 count_query=count_query, count_ttl=count_ttl)
+
+
+class RankedPagination(Pagination):
+    """Paginasi bernomor atas list id yang sudah diurutkan di Python (mis. skor kecocokan).
+
+    Hanya baris di halaman yang diminta yang dimuat lewat `load(ids)`; hasilnya
+    dikembalikan mengikuti urutan list.
+    """
+
+    def _query_items(self):
+        ids = self._query_args['ids'][self._query_offset:self._query_offset + self.per_page]
+        if not ids:
+            return []
+        rows = {row.id: row for row in self._query_args['load'](ids)}
+        return [rows[row_id] for row_id in ids if row_id in rows]
+
+    def _query_count(self):
+        return len(self._query_args['ids'])
+
+
+def paginate_ids(ids, load, per_page=25):
+    """Paginasi bernomor untuk list id terurut; nomor halaman dibaca dari ?page= pada request."""
+    return RankedPagination(per_page=per_page, error_out=False, ids=ids, load=load)
+
+
+def sort_query(query, columns, sort, direction, default, tiebreaker):
+    """Menambahkan ORDER BY dari parameter URL (?sort=&dir=).
+
+    Hanya kolom yang ada di `columns` (dict nama -> ekspresi) yang bisa dipakai;
+    nilai lain kembali ke `default` (nama, arah). `tiebreaker` (biasanya primary key)
+    membuat urutan stabil antar halaman. Mengembalikan (query, sort, direction).
+    """
+    if sort not in columns:
+        sort, direction = default
+    elif direction not in ('asc', 'desc'):
+        direction = default[1]
+    order = (lambda expr: expr.desc()) if direction == 'desc' else (lambda expr: expr.asc())
+    return query.order_by(order(columns[sort]), order(tiebreaker)), sort, direction
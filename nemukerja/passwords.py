@@ -0,0 +1,104 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from threading import BoundedSemaphore
+
+from nemukerja.extensions import bcrypt
+
+# Hash pembanding untuk email yang tidak terdaftar, supaya waktu respons login sama
+# (tidak membocorkan email mana yang ada)
+_DUMMY_PASSWORD = 'nemukerja-timing-equalizer'
+
+
+class HashingBusy(Exception):
+    """Antrean hashing penuh atau hash melewati PASSWORD_HASH_TIMEOUT; request sebaiknya dijawab 503 + Retry-After."""
+
+
+def hash_rounds(pw_hash):
+    """Cost factor dari hash bcrypt ($2b$12$...), atau None jika bukan hash bcrypt."""
+    parts = pw_hash.split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def calibrate_rounds(target_ms, min_rounds, max_rounds):
+    """Cost factor terbesar yang hash-nya tidak lebih lama dari `target_ms` di mesin ini.
+
+    Setiap kenaikan satu round menggandakan waktu, jadi cukup mengukur satu
+    hash pada `min_rounds` lalu menghitung sisanya.
+    """
+    started = time.perf_counter()
+    bcrypt.generate_password_hash(_DUMMY_PASSWORD, min_rounds)
+    elapsed_ms = max((time.perf_counter() - started) * 1000, 0.001)
+    extra = math.floor(math.log2(target_ms / elapsed_ms)) if target_ms > elapsed_ms else 0
+    return max(min_rounds, min(max_rounds, min_rounds + extra))
+
+
+class PasswordHasher:
+    """Menjalankan bcrypt di thread pool terbatas, terpisah dari thread request.
+
+    Paling banyak `workers` hash berjalan bersamaan dan `queue_size` lainnya
+    menunggu; request berikutnya langsung mendapat HashingBusy alih-alih ikut
+    mengantre, sehingga lonjakan login tidak menghabiskan semua worker web.
+    bcrypt melepas GIL selama hashing, jadi pool ini benar-benar paralel.
+    """
+
+    def __init__(self):
+        self.rounds = None
+        self._pool = None
+        self._slots = None
+        self._dummy_hash = None
+        self.timeout = None
+
+    def init_app(self, app):
+        config = app.config
+        self.rounds = config['PASSWORD_HASH_ROUNDS'] or calibrate_rounds(
+            config['PASSWORD_HASH_TARGET_MS'],
+            config['PASSWORD_HASH_MIN_ROUNDS'],
+            config['PASSWORD_HASH_MAX_ROUNDS']
+        )
+        config['BCRYPT_LOG_ROUNDS'] = self.rounds
+        workers = config['PASSWORD_HASH_WORKERS']
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = BoundedSemaphore(workers + config['PASSWORD_HASH_QUEUE'])
+        self.timeout = config['PASSWORD_HASH_TIMEOUT']
+        # Dibuat saat startup, bukan di thread request pertama yang login dengan email tak terdaftar
+        self._dummy_hash = bcrypt.generate_password_hash(_DUMMY_PASSWORD, self.rounds)
+        app.logger.info('bcrypt cost factor %d, %d hashing threads', self.rounds, workers)
+
+    def _run(self, function, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            future = self._pool.submit(function, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # Hash yang masih antre dibatalkan; yang sudah berjalan tetap memegang slotnya sampai selesai
+            future.cancel()
+            raise HashingBusy()
+
+    def hash(self, password):
+        return self._run(bcrypt.generate_password_hash, password, self.rounds).decode('utf-8')
+
+    def check(self, pw_hash, password):
+        """Mencocokkan password. `pw_hash=None` (email tidak terdaftar) tetap menjalankan satu hash."""
+        if pw_hash is None:
+            self._run(bcrypt.check_password_hash, self._dummy_hash, password)
+            return False
+        return self._run(bcrypt.check_password_hash, pw_hash, password)
+
+    def needs_rehash(self, pw_hash):
+        """True jika hash dibuat dengan cost lebih rendah dari cost saat ini (cost tidak pernah diturunkan)."""
+        rounds = hash_rounds(pw_hash)
+        return rounds is not None and rounds < self.rounds
+
+
+hasher = PasswordHasher()
@@ -0,0 +1,74 @@
+import logging
+
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from nemukerja.metrics import current_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def query_budget(limit):
+    """Menandai batas jumlah statement SQL untuk satu route.
+
+    Letakkan tepat di bawah @app.route supaya tercatat pada fungsi view yang
+    didaftarkan. Pemeriksaan dilakukan oleh init_query_budget().
+    """
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+class QueryCounter:
+    """Context manager penghitung statement SQL, untuk skrip atau shell.
+
+        with QueryCounter() as counter:
+            client.get('/admin/jobs')
+        assert counter.count <= 6, counter.statements
+    """
+
+    def __enter__(self):
+        self.count = 0
+        self.statements = []
+        event.listen(Engine, 'before_cursor_execute', self._record)
+        return self
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+    def __exit__(self, *exc):
+        event.remove(Engine, 'before_cursor_execute', self._record)
+
+
+def init_query_budget(app):
+    """Memeriksa jumlah statement SQL setiap request terhadap @query_budget route-nya.
+
+    QUERY_BUDGET_MODE: 'raise' (request gagal, untuk development/testing),
+    'warn' (hanya log) atau 'off'.
+    """
+    @app.after_request
+    def check_query_budget(response):
+        mode = app.config.get('QUERY_BUDGET_MODE', 'warn')
+        if mode == 'off':
+            return response
+
+        # Dihitung oleh listener SQL di nemukerja/metrics.py
+        count = current_stats().sql_count
+        if app.debug or app.testing:
+            response.headers['X-Query-Count'] = str(count)
+
+        view = app.view_functions.get(request.endpoint)
+        limit = getattr(view, 'query_budget', None)
+        if limit is not None and count > limit:
+            message = f"{request.method} {request.path} ({request.endpoint}) menjalankan {count} query, batas {limit}"
+            if mode == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
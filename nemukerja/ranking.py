@@ -0,0 +1,138 @@
+import math
+from collections import Counter
+
+from sqlalchemy import func, select
+
+from nemukerja.caching import TTLCache
+from nemukerja.extensions import db
+from nemukerja.models import Applicant, Application
+from nemukerja.recommend import TITLE_WEIGHT, tokenize, skill_terms
+
+# Kebutuhan yang hanya disebut di surat lamaran (notes), bukan di skill profil, dihitung sebagian
+NOTES_CREDIT = 0.5
+# Di atas jumlah ini, lamaran yang perlu dihitung ulang diambil sekaligus per lowongan (bukan IN (...))
+FETCH_BATCH_SIZE = 900
+# Skor per lowongan yang disimpan di memori worker
+FIT_CACHE_SIZE = 256
+FIT_CACHE_TTL = 3600
+
+_fit_cache = TTLCache(maxsize=FIT_CACHE_SIZE, ttl=FIT_CACHE_TTL)
+
+
+def requirement_weights(job):
+    """Bobot term kebutuhan lowongan dari judul + kualifikasi (tf sublinear, total 1)."""
+    counts = Counter()
+    for token in tokenize(job.title):
+        counts[token] += TITLE_WEIGHT
+    counts.update(tokenize(job.qualifications))
+    # Angka lepas ("2 tahun", "developer 1") bukan kebutuhan yang bisa dicocokkan
+    weights = {term: 1 + math.log(tf) for term, tf in counts.items() if not term.isdigit()}
+    total = sum(weights.values())
+    return {term: weight / total for term, weight in weights.items()} if total else {}
+
+
+def fit_score(requirements, skills, notes):
+    """Skor 0-100: porsi bobot kebutuhan yang dicakup skill pelamar atau surat lamarannya."""
+    have = skill_terms(skills)
+    mentioned = set(tokenize(notes))
+    score = 0.0
+    for term, weight in requirements.items():
+        if term in have:
+            score += weight
+        elif term in mentioned:
+            score += NOTES_CREDIT * weight
+    return round(100 * score, 1)
+
+
+def fit_breakdown(application):
+    """(skor, term terpenuhi, term belum terpenuhi) untuk halaman detail lamaran."""
+    requirements = requirement_weights(application.job)
+    have = skill_terms(application.applicant.skills) | set(tokenize(application.notes))
+    ranked = sorted(requirements, key=lambda term: (-requirements[term], term))
+    return (fit_score(requirements, application.applicant.skills, application.notes),
+            [term for term in ranked if term in have],
+            [term for term in ranked if term not in have])
+
+
+def _job_entry(job):
+    # Judul/kualifikasi ikut di stempel: edit di detik yang sama dengan updated_at tetap terdeteksi
+    stamp = (job.updated_at, job.title, job.qualifications)
+    entry = _fit_cache.get(job.id)
+    if entry is None or entry['stamp'] != stamp:
+        entry = {'stamp': stamp, 'requirements': requirement_weights(job), 'fingerprint': None,
+                 'checked_at': None, 'stamps': {}, 'scores': {}, 'ranked': []}
+        _fit_cache.set(job.id, entry)
+    return entry
+
+
+def _applications_fingerprint(job_id):
+    """(ringkasan lamaran satu lowongan, waktu database saat ini).
+
+    Ringkasan berubah jika ada lamaran/pelamar yang ditambah, diubah atau dihapus.
+    """
+    *fingerprint, now = db.session.execute(
+        select(func.count(), func.sum(Application.id),
+               func.max(Application.updated_at), func.max(Applicant.updated_at), func.now())
+        .join(Applicant, Applicant.id == Application.id_applicant)
+        .where(Application.id_job == job_id)
+    ).one()
+    return tuple(fingerprint), now
+
+
+def _settled(stamp, checked_at):
+    """True jika stempel lebih tua dari detik `checked_at`.
+
+    updated_at (TIMESTAMP, func.now()) hanya sampai detik: edit berikutnya di detik
+    yang sama dengan perhitungan skor menghasilkan stempel yang sama, jadi skor
+    dengan stempel di detik itu belum bisa dipercaya sampai detiknya lewat.
+    """
+    return checked_at is not None and all(value is None or value < checked_at for value in stamp)
+
+
+def _rescore(job_id, entry, now):
+    """Membaca stempel semua lamaran dan menghitung ulang skor yang stempelnya berubah."""
+    stamps = {application_id: (application_stamp, applicant_stamp)
+              for application_id, application_stamp, applicant_stamp in db.session.execute(
+                  select(Application.id, Application.updated_at, Applicant.updated_at)
+                  .join(Applicant, Applicant.id == Application.id_applicant)
+                  .where(Application.id_job == job_id))}
+    old_stamps, old_scores, checked_at = entry['stamps'], entry['scores'], entry['checked_at']
+    # Lamaran yang sudah dihapus ikut terbuang karena hanya id dari `stamps` yang disimpan
+    scores = {application_id: old_scores[application_id] for application_id, stamp in stamps.items()
+              if old_stamps.get(application_id) == stamp and _settled(stamp, checked_at)}
+    stale = [application_id for application_id in stamps if application_id not in scores]
+
+    if stale:
+        texts = (select(Application.id, Applicant.skills, Application.notes)
+                 .join(Applicant, Applicant.id == Application.id_applicant))
+        if len(stale) > FETCH_BATCH_SIZE:
+            texts = texts.where(Application.id_job == job_id)
+        else:
+            texts = texts.where(Application.id.in_(stale))
+        requirements = entry['requirements']
+        for application_id, skills, notes in db.session.execute(texts):
+            if application_id in stamps and application_id not in scores:
+                scores[application_id] = fit_score(requirements, skills, notes)
+
+    entry['stamps'] = stamps
+    entry['scores'] = scores
+    entry['checked_at'] = now
+    entry['ranked'] = sorted(scores, key=lambda application_id: (-scores[application_id], application_id))
+
+
+def job_fit_scores(job):
+    """({id_application: skor}, list id_application dari skor tertinggi) untuk lamaran ke `job`.
+
+    Skor dihitung per lowongan dalam satu batch dan disimpan bersama stempel
+    (updated_at lamaran, updated_at pelamar). Setiap panggilan hanya menjalankan
+    satu query agregat; jika hasilnya berubah, stempel per lamaran dibaca dan
+    hanya lamaran yang berubah yang dihitung ulang. Karena dicek ke database,
+    perubahan dari worker lain juga ikut terdeteksi. Stempel di detik yang sama
+    dengan perhitungan terakhir selalu dicek ulang (lihat _settled).
+    """
+    entry = _job_entry(job)
+    fingerprint, now = _applications_fingerprint(job.id)
+    if fingerprint != entry['fingerprint'] or not _settled(fingerprint[2:], entry['checked_at']):
+        _rescore(job.id, entry, now)
+        entry['fingerprint'] = fingerprint
+    return entry['scores'], entry['ranked']
@@ -0,0 +1,435 @@
+import heapq
+import math
+import re
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from threading import Lock
+
+from flask import current_app
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, joinedload
+
+from nemukerja.caching import BackgroundRefresh
+from nemukerja.extensions import db
+from nemukerja.models import JobListing, Application
+
+# Bobot BM25 (saturasi tf dan normalisasi panjang dokumen)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Judul lebih menentukan daripada kualifikasi
+TITLE_WEIGHT = 2
+# Posting terbaik per term yang dipakai sebagai kandidat untuk term umum
+TOP_POSTINGS = 2000
+# Term langka (df kecil) dijumlahkan penuh selama total postingnya di bawah batas ini
+EXACT_POSTINGS = 10000
+# tf per posting disimpan satu byte; jauh sebelum batas ini bobot BM25-nya sudah jenuh
+MAX_TF = 255
+# Jumlah baris per batch saat membangun ulang index
+REBUILD_BATCH_SIZE = 5000
+# Rebuild berkala hanya jika posting mati (lowongan diubah/dihapus) atau pergeseran
+# panjang rata-rata terhadap acuan daftar teratas melewati batas ini
+REBUILD_DEAD_RATIO = 0.2
+REBUILD_LENGTH_DRIFT = 0.1
+
+TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+STOPWORDS = frozenset('''
+    a an and or the of in on for to with at by as is are be from
+    dan atau di ke dari yang untuk dengan pada dalam min minimal
+'''.split())
+
+
+def tokenize(text):
+    """Term huruf kecil; c++, c#, node.js dipertahankan utuh."""
+    return [token for token in TOKEN.findall((text or '').lower()) if token not in STOPWORDS]
+
+
+def skill_terms(skills):
+    """Term dari Applicant.skills (teks dipisah koma)."""
+    terms = set()
+    for skill in (skills or '').split(','):
+        terms.update(tokenize(skill))
+    return terms
+
+
+def bm25_tf(tf, length, average_length):
+    """Bobot tf BM25: saturasi tf dan normalisasi panjang terhadap rata-rata panjang dokumen."""
+    return tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length))
+
+
+class Postings:
+    """Posting satu term dalam array ringkas (bukan dict/tuple per lowongan).
+
+    `docs` berisi nomor dokumen JobCorpus (selalu naik, karena dokumen hanya
+    ditambahkan di akhir) dan `tfs` tf mentahnya. Posting dokumen yang sudah
+    dihapus tetap ada sampai rebuild berikutnya dan dilewati saat query
+    (panjang dokumennya 0); `df` hanya menghitung dokumen yang masih ada.
+
+    Term dengan lebih dari TOP_POSTINGS posting juga menyimpan `top`: dokumen
+    terbaik menurut bobot BM25 dengan panjang rata-rata saat index dibangun
+    (`top_keys` berisi -bobot, terurut naik). Daftar ini hanya untuk memilih
+    kandidat; skor selalu dihitung saat query dengan panjang rata-rata terkini.
+    """
+
+    __slots__ = ('id', 'docs', 'tfs', 'df', 'top', 'top_keys')
+
+    def __init__(self, term_id):
+        self.id = term_id
+        self.docs = array('i')
+        self.tfs = array('B')
+        self.df = 0
+        self.top = None
+        self.top_keys = None
+
+    def offer(self, doc, tf, length, reference_length):
+        """Memasukkan dokumen baru ke daftar teratas jika bobotnya cukup besar."""
+        if self.top is None:
+            return
+        key = -bm25_tf(tf, length, reference_length)
+        if len(self.top) < TOP_POSTINGS or key < self.top_keys[-1]:
+            index = bisect_left(self.top_keys, key)
+            self.top_keys.insert(index, key)
+            self.top.insert(index, doc)
+            if len(self.top) > TOP_POSTINGS:
+                self.top_keys.pop()
+                self.top.pop()
+
+    def discard(self, doc, doc_length, reference_length):
+        if self.top is None:
+            return
+        try:
+            index = self.top.index(doc)
+        except ValueError:
+            return
+        del self.top[index]
+        del self.top_keys[index]
+        # Isi ulang jika daftar teratas tinggal setengah sementara posting lain masih ada
+        if len(self.top) < TOP_POSTINGS // 2 and self.df > len(self.top):
+            self.refill(doc_length, reference_length)
+
+    def refill(self, doc_length, reference_length):
+        if self.df <= TOP_POSTINGS:
+            # Term kecil: semua posting sudah menjadi kandidat
+            self.top = self.top_keys = None
+            return
+        best = heapq.nsmallest(TOP_POSTINGS, (
+            (-bm25_tf(tf, doc_length[doc], reference_length), doc)
+            for doc, tf in zip(self.docs, self.tfs) if doc_length[doc]
+        ))
+        self.top_keys = array('f', [key for key, _ in best])
+        self.top = array('i', [doc for _, doc in best])
+
+    def candidates(self, doc_length):
+        docs = self.docs if self.top is None else self.top
+        return [doc for doc in docs if doc_length[doc]]
+
+
+class JobCorpus:
+    """Posting semua lowongan terbuka pada satu waktu (satu versi index).
+
+    Setiap versi lowongan mendapat nomor dokumen baru; semua data per dokumen
+    disimpan dalam array sejajar (id_job, panjang, daftar term), sehingga
+    biayanya sekitar 9 byte per posting ditambah 16 byte per dokumen.
+    """
+
+    def __init__(self):
+        self.postings = {}                    # term -> Postings
+        self.term_postings = []               # id term -> Postings
+        self.doc_job = array('i')             # nomor dokumen -> id_job
+        self.doc_length = array('I')          # nomor dokumen -> panjang (0 = sudah dihapus)
+        self.doc_terms = array('i')           # id term semua dokumen, berurutan per dokumen
+        self.doc_terms_start = array('I', [0])
+        self.job_doc = array('i')             # id_job (autoincrement, rapat) -> nomor dokumen (-1 = tidak ada)
+        self.live = 0
+        self.dead_postings = 0
+        self.total_length = 0
+        self.reference_length = 1.0
+        self.watermark = None
+
+    def average_length(self):
+        return self.total_length / self.live if self.live else 1.0
+
+    def needs_rebuild(self):
+        """True jika korpus perlu dibangun ulang: banyak posting mati atau acuan daftar teratas sudah bergeser."""
+        drift = abs(self.average_length() - self.reference_length) / self.reference_length
+        return self.dead_postings > REBUILD_DEAD_RATIO * len(self.doc_terms) or drift > REBUILD_LENGTH_DRIFT
+
+    def doc_of(self, job_id):
+        return self.job_doc[job_id] if 0 <= job_id < len(self.job_doc) else -1
+
+    def remove_job(self, job_id):
+        doc = self.doc_of(job_id)
+        if doc < 0:
+            return
+        self.job_doc[job_id] = -1
+        self.total_length -= self.doc_length[doc]
+        self.doc_length[doc] = 0
+        self.live -= 1
+        term_ids = self.doc_terms[self.doc_terms_start[doc]:self.doc_terms_start[doc + 1]]
+        self.dead_postings += len(term_ids)
+        for term_id in term_ids:
+            postings = self.term_postings[term_id]
+            postings.df -= 1
+            postings.discard(doc, self.doc_length, self.reference_length)
+
+    def add_job(self, job_id, title, qualifications, loading=False):
+        """Menambah posting satu lowongan. `loading=True` (rebuild) menunda daftar teratas sampai finish_loading()."""
+        counts = Counter()
+        for token in tokenize(title):
+            counts[token] += TITLE_WEIGHT
+        counts.update(tokenize(qualifications))
+        length = sum(counts.values())
+        if not length:
+            return
+        doc = len(self.doc_job)
+        self.doc_job.append(job_id)
+        self.doc_length.append(length)
+        if job_id >= len(self.job_doc):
+            self.job_doc.extend(array('i', [-1]) * (job_id + 1 - len(self.job_doc)))
+        self.job_doc[job_id] = doc
+        self.live += 1
+        self.total_length += length
+        term_ids = []
+        for term, tf in counts.items():
+            if tf > MAX_TF:
+                tf = MAX_TF
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = Postings(len(self.term_postings))
+                self.term_postings.append(postings)
+            postings.docs.append(doc)
+            postings.tfs.append(tf)
+            postings.df += 1
+            term_ids.append(postings.id)
+            if not loading:
+                if postings.top is None and postings.df > TOP_POSTINGS:
+                    postings.refill(self.doc_length, self.reference_length)
+                else:
+                    postings.offer(doc, tf, length, self.reference_length)
+        self.doc_terms.extend(term_ids)
+        self.doc_terms_start.append(len(self.doc_terms))
+
+    def finish_loading(self):
+        """Setelah semua lowongan dimuat: rata-rata panjang seluruh korpus menjadi acuan daftar teratas."""
+        self.reference_length = self.average_length()
+        for postings in self.term_postings:
+            if postings.df > TOP_POSTINGS:
+                postings.refill(self.doc_length, self.reference_length)
+
+    def apply(self, jobs):
+        """`jobs`: {id_job: (is_open, title, qualifications) atau None jika dihapus}."""
+        for job_id, row in jobs.items():
+            self.remove_job(job_id)
+            if row is not None and row[0]:
+                self.add_job(job_id, row[1], row[2])
+
+    def advance(self, *stamps):
+        stamps = [stamp for stamp in stamps if stamp is not None]
+        if self.watermark is not None:
+            stamps.append(self.watermark)
+        if stamps:
+            self.watermark = max(stamps)
+
+
+class RecommendIndex:
+    """Index TF-IDF (BM25) in-memory dari judul + kualifikasi lowongan terbuka.
+
+    Per posting disimpan tf mentah (panjang dokumen disimpan sekali per
+    dokumen); idf dan normalisasi panjang (terhadap rata-rata seluruh korpus)
+    dihitung saat query, jadi menambah atau menghapus satu lowongan hanya
+    mengubah posting miliknya. Sinkronisasi sama seperti nemukerja/suggest.py:
+    event session untuk commit di proses ini, updated_at untuk worker lain, dan
+    rebuild penuh untuk membuang posting mati; sync dan rebuild berjalan di
+    thread latar, rebuild mengisi JobCorpus baru tanpa lock lalu menukarnya.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._refresh = BackgroundRefresh('recommend-index')
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.corpus = JobCorpus()
+            # Perubahan yang masuk selama rebuild, diterapkan ulang ke korpus baru sebelum ditukar
+            self._pending = None
+            self.built_at = None
+            self.synced_at = None
+
+    def _apply(self, jobs):
+        # Dipanggil dengan lock dipegang
+        if self.built_at is not None:
+            self.corpus.apply(jobs)
+        if self._pending is not None:
+            self._pending.append(jobs)
+
+    # --- sinkronisasi dengan database ---
+
+    def rebuild(self):
+        with self._lock:
+            self._pending = []
+        try:
+            corpus = JobCorpus()
+            result = db.session.execute(
+                select(JobListing.id, JobListing.is_open, JobListing.title,
+                       JobListing.qualifications, JobListing.updated_at)
+                .execution_options(yield_per=REBUILD_BATCH_SIZE)
+            )
+            for batch in result.partitions():
+                for job_id, is_open, title, qualifications, updated_at in batch:
+                    if is_open:
+                        corpus.add_job(job_id, title, qualifications, loading=True)
+                    corpus.advance(updated_at)
+            corpus.finish_loading()
+            with self._lock:
+                for jobs in self._pending:
+                    corpus.apply(jobs)
+                self.corpus = corpus
+                self.built_at = self.synced_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def sync(self):
+        """Menerapkan lowongan yang berubah sejak watermark (lihat SuggestIndex.sync)."""
+        watermark = self.corpus.watermark
+        if self.built_at is None or watermark is None:
+            return self.rebuild()
+        rows = db.session.execute(
+            select(JobListing.id, JobListing.is_open, JobListing.title,
+                   JobListing.qualifications, JobListing.updated_at)
+            .where(JobListing.updated_at >= watermark)
+        ).all()
+        with self._lock:
+            self._apply({row[0]: tuple(row[1:4]) for row in rows})
+            self.corpus.advance(*(row[4] for row in rows))
+            self.synced_at = time.monotonic()
+
+    def ensure_fresh(self, sync_seconds, rebuild_seconds):
+        """Menjadwalkan rebuild/sync di thread latar jika sudah waktunya; tidak menunggu hasilnya.
+
+        Setelah rebuild pertama, rebuild berikutnya (paling cepat tiap `rebuild_seconds`)
+        hanya dijalankan jika JobCorpus.needs_rebuild(). Selama rebuild berjalan query
+        memakai korpus lama (kosong sebelum rebuild pertama selesai).
+        """
+        now = time.monotonic()
+        if self.built_at is None or (now - self.built_at > rebuild_seconds and self.corpus.needs_rebuild()):
+            self._refresh.start(self.rebuild)
+        elif now - self.synced_at > sync_seconds:
+            self._refresh.start(self.sync)
+
+    def wait(self, timeout=None):
+        self._refresh.wait(timeout)
+
+    def apply_local(self, jobs):
+        with self._lock:
+            self._apply(jobs)
+
+    def recommend(self, terms, k, exclude=()):
+        """Top-k (id_job, skor) untuk himpunan term skill; skor = sum(idf(term) * bm25_tf).
+
+        Term diproses dari df terkecil. Posting term langka dijumlahkan penuh
+        (selama totalnya <= EXACT_POSTINGS); untuk term umum hanya TOP_POSTINGS
+        posting terbaiknya yang menjadi kandidat. Skor yang dikembalikan selalu
+        lengkap dari semua term; kandidat yang pasti kalah dibuang lebih awal.
+        """
+        with self._lock:
+            corpus = self.corpus
+            total = corpus.live
+            if not total:
+                return []
+            average = corpus.average_length()
+            doc_length = corpus.doc_length
+            weighted = []
+            for term in terms:
+                postings = corpus.postings.get(term)
+                if postings is not None and postings.df:
+                    df = postings.df
+                    idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                    weighted.append((df, idf, postings))
+            weighted.sort(key=lambda item: item[0])
+
+            scores = {}
+            budget = EXACT_POSTINGS
+            common = []
+            for df, idf, postings in weighted:
+                if df > budget:
+                    common.append((idf, postings))
+                    continue
+                budget -= df
+                get = scores.get
+                for doc, tf in zip(postings.docs, postings.tfs):
+                    length = doc_length[doc]
+                    if length:
+                        scores[doc] = get(doc, 0.0) + idf * bm25_tf(tf, length, average)
+            for _, postings in common:
+                for doc in postings.candidates(doc_length):
+                    scores.setdefault(doc, 0.0)
+            for job_id in exclude:
+                scores.pop(corpus.doc_of(job_id), None)
+            # Batas atas sisa skor: bm25_tf selalu < k1 + 1. Kandidat yang tidak mungkin lagi
+            # masuk top-k dibuang sebelum term berikutnya (MaxScore), urutan top-k tetap tepat
+            remaining = sum(idf for idf, _ in common) * (BM25_K1 + 1)
+            for idf, postings in common:
+                if len(scores) > k:
+                    threshold = heapq.nlargest(k, scores.values())[-1] - remaining
+                    scores = {doc: score for doc, score in scores.items() if score >= threshold}
+                remaining -= idf * (BM25_K1 + 1)
+                docs, tfs = postings.docs, postings.tfs
+                size = len(docs)
+                for doc in scores:
+                    index = bisect_left(docs, doc)
+                    if index < size and docs[index] == doc:
+                        scores[doc] += idf * bm25_tf(tfs[index], doc_length[doc], average)
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [(corpus.doc_job[doc], score) for doc, score in best]
+
+
+recommend_index = RecommendIndex()
+
+
+def recommended_jobs(applicant, k):
+    """List (lowongan, skor) paling cocok dengan skill pelamar, tanpa lowongan yang sudah dilamar."""
+    terms = skill_terms(applicant.skills) if applicant else set()
+    if not terms:
+        return []
+    config = current_app.config
+    recommend_index.ensure_fresh(config['RECOMMEND_SYNC_SECONDS'], config['RECOMMEND_REBUILD_SECONDS'])
+    applied = db.session.scalars(
+        select(Application.id_job).where(Application.id_applicant == applicant.id)
+    ).all()
+    ranked = recommend_index.recommend(terms, k, exclude=applied)
+    if not ranked:
+        return []
+    jobs = {job.id: job for job in JobListing.query
+            .options(joinedload(JobListing.company))
+            .filter(JobListing.id.in_([job_id for job_id, _ in ranked]), JobListing.is_open.is_(True))}
+    missing = [job_id for job_id, _ in ranked if job_id not in jobs]
+    if missing:
+        # Dihapus/ditutup di worker lain (sync hanya melihat updated_at): buang tanpa menunggu rebuild
+        recommend_index.apply_local(dict.fromkeys(missing))
+    return [(jobs[job_id], score) for job_id, score in ranked if job_id in jobs]
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_recommend_changes(session, flush_context):
+    jobs = session.info.setdefault('recommend_changes', {})
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, JobListing):
+            jobs[obj.id] = (bool(obj.is_open), obj.title, obj.qualifications)
+    for obj in session.deleted:
+        if isinstance(obj, JobListing):
+            jobs[obj.id] = None
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_recommend_changes(session):
+    jobs = session.info.pop('recommend_changes', None)
+    if jobs:
+        recommend_index.apply_local(jobs)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_recommend_changes(session):
+    session.info.pop('recommend_changes', None)
@@ -0,0 +1,113 @@
+from collections import Counter, defaultdict
+
+from sqlalchemy import insert, select, update
+
+from nemukerja import counters
+from nemukerja.extensions import db
+from nemukerja.models import Applicant, JobListing, Application, Notification
+
+REVIEW_STATUSES = ('accepted', 'rejected')
+# Baris per INSERT multi-row notifikasi (6 kolom per baris, di bawah batas parameter SQLite/MySQL)
+NOTIFICATION_BATCH_SIZE = 1000
+
+
+def status_notification(user_id, application_id, job_title, status):
+    """Baris notifikasi untuk pelamar saat status lamarannya diubah perusahaan."""
+    return {
+        'id_user': user_id,
+        'title': "Application Status Updated",
+        'message': f"Your application for {job_title} has been {status}",
+        'type': 'application_status',
+        'related_id': application_id,
+        'is_read': False,
+    }
+
+
+def _accept_within_slots(rows, session):
+    """Memesan slot untuk lamaran ditolak yang akan diterima (pending/diterima sudah memakai slot).
+
+    Per lowongan hanya sebanyak sisa slot yang diambil, dipesan dengan satu
+    UPDATE bersyarat (counters.reserve_slots). Mengembalikan (baris yang
+    slotnya sudah dipesan, id lamaran yang dilewati karena kuota penuh).
+    """
+    rejected = defaultdict(list)
+    for row in rows:
+        rejected[row.id_job].append(row)
+    reserved, skipped = [], []
+    for job_id, job_rows in rejected.items():
+        free = max(0, job_rows[0].slots - job_rows[0].applications_pending - job_rows[0].applications_accepted)
+        fit = job_rows[:free]
+        if fit and not counters.reserve_slots(job_id, len(fit), 'rejected', session=session):
+            # Slot terpakai transaksi lain sejak dibaca
+            fit = []
+        reserved.extend(fit)
+        skipped.extend(row.id for row in job_rows[len(fit):])
+    return reserved, skipped
+
+
+def bulk_set_status(company_id, status, application_ids=None, job_id=None, from_status=None, session=None):
+    """Mengubah status banyak lamaran milik `company_id` dalam satu transaksi (tanpa commit).
+
+    Lamaran dipilih lewat `application_ids` dan/atau `job_id` (mis. semua lamaran
+    pending satu lowongan dengan from_status='pending'). Lamaran perusahaan lain
+    diabaikan. Status diubah dengan satu UPDATE berbasis himpunan, penghitung
+    lowongan digeser per (lowongan, status lama), dan notifikasi dimasukkan
+    dengan INSERT multi-row. Lamaran ditolak yang diterima lagi butuh slot;
+    yang tidak muat di kuota lowongannya dilewati.
+
+    Mengembalikan (jumlah lamaran yang berubah, list id lamaran yang dilewati).
+    INSERT Core tidak memicu event ORM, jadi pemanggil perlu memanggil
+    notifications.notify_waiters() setelah commit.
+    """
+    if status not in REVIEW_STATUSES:
+        raise ValueError(f'Unknown review status: {status!r}')
+    session = session or db.session
+    if application_ids is None and job_id is None:
+        return 0, []
+
+    selected = (select(Application.id, Application.id_job, Application.status,
+                       Applicant.id_user, JobListing.title, JobListing.slots,
+                       JobListing.applications_pending, JobListing.applications_accepted)
+                .join(JobListing, JobListing.id == Application.id_job)
+                .join(Applicant, Applicant.id == Application.id_applicant)
+                .where(JobListing.id_company == company_id, Application.status != status)
+                .order_by(Application.id))
+    if application_ids is not None:
+        selected = selected.where(Application.id.in_(list(application_ids)))
+    if job_id is not None:
+        selected = selected.where(Application.id_job == job_id)
+    if from_status is not None:
+        selected = selected.where(Application.status == from_status)
+    # Baris terkunci sampai commit (MySQL), jadi status lama yang dibaca tetap benar saat UPDATE
+    rows = session.execute(selected.with_for_update()).all()
+
+    skipped = []
+    if status == 'accepted':
+        reserved, skipped = _accept_within_slots([row for row in rows if row.status == 'rejected'], session)
+        # Penghitung lamaran yang slotnya dipesan sudah digeser oleh reserve_slots()
+        moving = [row for row in rows if row.status != 'rejected']
+        rows = moving + reserved
+    else:
+        moving = rows
+    if not rows:
+        return 0, skipped
+
+    session.execute(
+        update(Application)
+        .where(Application.id.in_([row.id for row in rows]))
+        .values(status=status)
+        .execution_options(synchronize_session=False)
+    )
+    moved = Counter((row.id_job, row.status) for row in moving)
+    for (row_job_id, old_status), count in moved.items():
+        counters.record_status_change(row_job_id, old_status, status, count, session=session)
+
+    notifications = [status_notification(row.id_user, row.id, row.title, status) for row in rows]
+    for start in range(0, len(notifications), NOTIFICATION_BATCH_SIZE):
+        session.execute(insert(Notification).values(notifications[start:start + NOTIFICATION_BATCH_SIZE]))
+
+    # Objek Application yang sudah dimuat di session harus membaca ulang statusnya
+    for obj in session.identity_map.values():
+        if isinstance(obj, Application):
+            session.expire(obj, ['status', 'updated_at'])
+    return len(rows), skipped
@@ -0,0 +1,125 @@
+import re
+
+from sqlalchemy import event, text, or_, Integer, Float
+from sqlalchemy.dialects import mysql
+
+from nemukerja.extensions import db
+from nemukerja.models import JobListing
+
+# Bobot kolom untuk bm25(): judul paling penting, lalu kualifikasi, lalu deskripsi
+BM25_WEIGHTS = (10.0, 1.0, 3.0)
+
+SQLITE_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS job_listings_fts USING fts5(
+        title, description, qualifications,
+        content='job_listings', content_rowid='id_job'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS job_listings_fts_ai AFTER INSERT ON job_listings BEGIN
+        INSERT INTO job_listings_fts(rowid, title, description, qualifications)
+        VALUES (new.id_job, new.title, new.description, new.qualifications);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS job_listings_fts_ad AFTER DELETE ON job_listings BEGIN
+        INSERT INTO job_listings_fts(job_listings_fts, rowid, title, description, qualifications)
+        VALUES ('delete', old.id_job, old.title, old.description, old.qualifications);
+    END""",
+    # Hanya kolom teks yang memicu sinkronisasi, jadi buka/tutup lowongan tidak menyentuh indeks
+    """CREATE TRIGGER IF NOT EXISTS job_listings_fts_au
+    AFTER UPDATE OF title, description, qualifications ON job_listings BEGIN
+        INSERT INTO job_listings_fts(job_listings_fts, rowid, title, description, qualifications)
+        VALUES ('delete', old.id_job, old.title, old.description, old.qualifications);
+        INSERT INTO job_listings_fts(rowid, title, description, qualifications)
+        VALUES (new.id_job, new.title, new.description, new.qualifications);
+    END""",
+]
+
+MYSQL_FULLTEXT_DDL = (
+    "ALTER TABLE job_listings "
+    "ADD FULLTEXT INDEX ft_job_listings (title, description, qualifications)"
+)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def init_search_index(bind):
+    """Membuat indeks full-text untuk job_listings jika belum ada (idempotent)."""
+    dialect = bind.dialect.name
+    if dialect == 'sqlite':
+        exists = bind.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='job_listings_fts'"
+        )).first()
+        for statement in SQLITE_FTS_DDL:
+            bind.execute(text(statement))
+        if not exists:
+            # Isi indeks dari data yang sudah ada (misal database lama)
+            bind.execute(text("INSERT INTO job_listings_fts(job_listings_fts) VALUES ('rebuild')"))
+    elif dialect == 'mysql':
+        exists = bind.execute(text(
+            "SELECT 1 FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = 'job_listings' "
+            "AND index_name = 'ft_job_listings' LIMIT 1"
+        )).first()
+        if not exists:
+            bind.execute(text(MYSQL_FULLTEXT_DDL))
+
+
+def rebuild_search_index(bind):
+    """Membangun ulang seluruh indeks full-text dari tabel job_listings."""
+    init_search_index(bind)
+    if bind.dialect.name == 'sqlite':
+        bind.execute(text("INSERT INTO job_listings_fts(job_listings_fts) VALUES ('rebuild')"))
+    elif bind.dialect.name == 'mysql':
+        bind.execute(text("OPTIMIZE TABLE job_listings"))
+
+
+@event.listens_for(JobListing.__table__, 'after_create')
+def _create_search_index(target, connection, **kw):
+    init_search_index(connection)
+
+
+def _fts5_query(q):
+    """Mengubah input bebas pengguna menjadi ekspresi MATCH FTS5 yang aman.
+
+    Setiap kata dikutip (agar karakter seperti '-' atau '"' tidak dianggap
+    operator) dan diberi prefix '*' supaya 'develop' tetap cocok dengan 'developer'.
+    """
+    tokens = _TOKEN_RE.findall(q.lower())
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def apply_search(query, q):
+    """Memfilter kueri JobListing dengan kata kunci memakai indeks full-text.
+
+    Mengembalikan tuple (query, sort_key). sort_key berupa (ekspresi_skor, arah)
+    untuk mengurutkan berdasarkan relevansi, atau None jika tidak ada skor.
+    """
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        match = _fts5_query(q)
+        if not match:
+            return query, None
+        weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+        hits = text(
+            f"SELECT rowid AS id_job, bm25(job_listings_fts, {weights}) AS score "
+            "FROM job_listings_fts WHERE job_listings_fts MATCH :match"
+        ).bindparams(match=match).columns(id_job=Integer, score=Float).subquery('fts_hits')
+        # bm25() bernilai negatif, semakin kecil semakin relevan
+        query = query.join(hits, hits.c.id_job == JobListing.id)
+        return query, (hits.c.score, 'asc')
+
+    if dialect == 'mysql':
+        score = mysql.match(
+            JobListing.title, JobListing.description, JobListing.qualifications,
+            against=q
+        ).in_natural_language_mode()
+        query = query.filter(score > 0)
+        return query, (score, 'desc')
+
+    # Dialek lain: kembali ke pencarian substring biasa
+    search_term = f"%{q}%"
+    query = query.filter(or_(
+        JobListing.title.ilike(search_term),
+        JobListing.description.ilike(search_term),
+        JobListing.qualifications.ilike(search_term)
+    ))
+    return query, None
@@ -159,8 +159,7 @@ function markNotificationRead(notificationId, scope = '') {
     .then(response => response.json())
     .then(data => {
         if (data.success) {
-            loadNotifications('');
-            loadNotifications('Mobile'); 
+            loadNotifications();
         }
     })
     .catch(error => console.error('Error marking notification read:', error));
@@ -181,8 +180,7 @@ function clearAllNotifications(scope = '') {
     .then(response => response.json())
     .then(data => {
         if (data.success) {
-            loadNotifications('');
-            loadNotifications('Mobile');
+            loadNotifications();
             alert('All notifications have been cleared.'); 
         } else {
             alert('Error clearing notifications.');
@@ -192,22 +190,87 @@ function clearAllNotifications(scope = '') {
 }
 
 
+// Satu cache notifikasi per tab, dipakai bersama oleh UI desktop & mobile
+const NOTIFICATION_LIMIT = 10;
+let notificationCache = [];
+let notificationSource = null;
+let notificationPollTimer = null;
+
+function renderNotifications() {
+    updateNotificationUI(notificationCache, '');
+    updateNotificationUI(notificationCache, 'Mobile');
+}
+
+function latestNotificationId() {
+    return notificationCache.reduce((max, n) => Math.max(max, n.id), 0);
+}
+
 /**
- * Fetches notifications and updates the UI for a specific scope.
- * @param {string} scope - '' for desktop, 'Mobile' for mobile.
+ * Merges new notifications (delta) into the cache and re-renders both UIs.
+ * @param {Array} items - Notifications newer than the cached ones.
  */
-function loadNotifications(scope = '') {
-    fetch('/notifications')
+function mergeNotifications(items) {
+    if (!items || items.length === 0) return;
+    const incomingIds = new Set(items.map(n => n.id));
+    notificationCache = items
+        .concat(notificationCache.filter(n => !incomingIds.has(n.id)))
+        .sort((a, b) => b.id - a.id)
+        .slice(0, NOTIFICATION_LIMIT);
+    renderNotifications();
+}
+
+/**
+ * Fetches the full notification list once and updates both UIs (desktop & mobile).
+ * Used for the initial load and after read/clear actions.
+ * @returns {Promise}
+ */
+function loadNotifications() {
+    return fetch('/notifications')
         .then(response => {
             if (!response.ok) throw new Error('Network response was not ok');
             return response.json();
         })
         .then(notifications => {
-            updateNotificationUI(notifications, scope);
+            notificationCache = notifications;
+            renderNotifications();
         })
         .catch(error => console.error('Error loading notifications:', error));
 }
 
+/**
+ * Opens the single real-time notification channel for this tab.
+ * Uses Server-Sent Events; falls back to polling only the delta (?since=) every 30s
+ * when EventSource is unavailable or the server refuses the stream (503, all stream slots busy).
+ */
+function startNotificationFeed() {
+    if (window.EventSource) {
+        // EventSource menyambung ulang sendiri dan mengirim Last-Event-ID
+        notificationSource = new EventSource(`/notifications/stream?since=${latestNotificationId()}`);
+        notificationSource.addEventListener('notifications', function(e) {
+            mergeNotifications(JSON.parse(e.data));
+        });
+        notificationSource.addEventListener('error', function() {
+            // Respons selain 200 menutup EventSource permanen; jaringan putus hanya CONNECTING
+            if (notificationSource.readyState === EventSource.CLOSED) {
+                notificationSource = null;
+                startNotificationPolling();
+            }
+        });
+        return;
+    }
+    startNotificationPolling();
+}
+
+function startNotificationPolling() {
+    if (notificationPollTimer) return;
+    notificationPollTimer = setInterval(() => {
+        fetch(`/notifications?since=${latestNotificationId()}`)
+            .then(response => response.ok ? response.json() : [])
+            .then(mergeNotifications)
+            .catch(error => console.error('Error polling notifications:', error));
+    }, 30000);
+}
+
 function updateNotificationUI(notifications, scope = '') {
     const listId = `notificationList${scope}`;
     const badgeId = `notificationBadge${scope}`;
@@ -822,18 +885,9 @@ document.addEventListener('DOMContentLoaded', function() {
     };
     
     // --- NOTIFICATION LISTENERS (Desktop & Mobile) ---
-    let notificationCheckInterval;
-
     if (document.getElementById('notificationDropdown') || document.getElementById('notificationDropdownMobile')) {
-        // Initial load for both UIs
-        loadNotifications(''); 
-        loadNotifications('Mobile');
-
-        // Setup polling
-        notificationCheckInterval = setInterval(() => {
-            loadNotifications('');
-            loadNotifications('Mobile');
-        }, 30000);
+        // Initial load for both UIs, then one shared real-time connection per tab
+        loadNotifications().then(startNotificationFeed);
 
         // Event delegation for clicks on list items (Desktop)
         document.getElementById('notificationList')?.addEventListener('click', function(e) {
@@ -889,8 +943,7 @@ document.addEventListener('DOMContentLoaded', function() {
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
-                    loadNotifications('');
-                    loadNotifications('Mobile');
+                    loadNotifications();
                 }
             })
             .catch(error => console.error('Error marking all notifications read:', error));
@@ -912,8 +965,7 @@ document.addEventListener('DOMContentLoaded', function() {
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
-                    loadNotifications('');
-                    loadNotifications('Mobile');
+                    loadNotifications();
                 }
             })
             .catch(error => console.error('Error marking all notifications read:', error));
@@ -928,8 +980,11 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // Cleanup on page unload
     window.addEventListener('beforeunload', function() {
-        if (notificationCheckInterval) {
-            clearInterval(notificationCheckInterval);
+        if (notificationSource) {
+            notificationSource.close();
+        }
+        if (notificationPollTimer) {
+            clearInterval(notificationPollTimer);
         }
     });
 
@@ -1109,4 +1164,40 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
+    // --- Autocomplete lokasi & perusahaan di form filter (/api/suggest) ---
+    document.querySelectorAll('input[data-suggest]').forEach(input => {
+        const list = document.getElementById(input.getAttribute('list'));
+        let timer = null;
+        let controller = null;
+
+        input.addEventListener('input', function() {
+            clearTimeout(timer);
+            const q = input.value.trim();
+            if (!q) {
+                list.innerHTML = '';
+                return;
+            }
+            timer = setTimeout(() => {
+                // Batalkan permintaan sebelumnya yang belum selesai
+                if (controller) controller.abort();
+                controller = new AbortController();
+                const field = encodeURIComponent(input.dataset.suggest);
+                fetch(`/api/suggest?field=${field}&q=${encodeURIComponent(q)}`, { signal: controller.signal })
+                    .then(response => response.json())
+                    .then(items => {
+                        list.innerHTML = '';
+                        items.forEach(item => {
+                            const option = document.createElement('option');
+                            option.value = item.value;
+                            option.label = `${item.value} (${item.count})`;
+                            list.appendChild(option);
+                        });
+                    })
+                    .catch(error => {
+                        if (error.name !== 'AbortError') console.error('Suggest error:', error);
+                    });
+            }, 120);
+        });
+    });
+
 });
\ No newline at end of file
@@ -0,0 +1,251 @@
+import heapq
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+from threading import Lock
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from nemukerja.caching import BackgroundRefresh
+from nemukerja.extensions import db
+from nemukerja.models import Company, JobListing
+
+SUGGEST_FIELDS = ('location', 'company')
+# Batas entri yang diperiksa per prefix (prefix satu huruf bisa cocok dengan ribuan entri)
+SCAN_LIMIT = 512
+
+
+def normalize(text):
+    return ' '.join(text.casefold().split())
+
+
+def _keys(value):
+    """Kunci index: teks ternormalisasi mulai dari setiap awal kata ('dki jakarta', 'jakarta')."""
+    text = normalize(value)
+    words = text.split(' ')
+    return {' '.join(words[index:]) for index in range(len(words))}
+
+
+class PrefixTerms:
+    """Sorted array (kunci, nilai) + jumlah lowongan per nilai; dicari dengan bisect."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.entries = []
+
+    def add(self, value, count=1):
+        if not value or not value.strip():
+            return
+        if self.counts[value] == 0:
+            for key in _keys(value):
+                insort(self.entries, (key, value))
+        self.counts[value] += count
+
+    def remove(self, value, count=1):
+        if not value or self.counts[value] == 0:
+            return
+        self.counts[value] -= count
+        if self.counts[value] <= 0:
+            del self.counts[value]
+            for key in _keys(value):
+                index = bisect_left(self.entries, (key, value))
+                if index < len(self.entries) and self.entries[index] == (key, value):
+                    del self.entries[index]
+
+    def search(self, prefix, limit):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        matches = set()
+        index = bisect_left(self.entries, (prefix,))
+        end = min(len(self.entries), index + SCAN_LIMIT)
+        while index < end and self.entries[index][0].startswith(prefix):
+            matches.add(self.entries[index][1])
+            index += 1
+        # Nilai dengan lowongan terbanyak dulu, lalu alfabetis
+        return heapq.nsmallest(limit, ((-self.counts[value], value) for value in matches))
+
+
+class SuggestSnapshot:
+    """Isi index pada satu waktu: lowongan terbuka, nama perusahaan dan PrefixTerms per field."""
+
+    def __init__(self):
+        self.jobs = {}        # id_job -> (location, id_company), hanya lowongan terbuka
+        self.companies = {}   # id_company -> company_name
+        self.company_jobs = Counter()  # id_company -> jumlah lowongan terbuka
+        self.terms = {field: PrefixTerms() for field in SUGGEST_FIELDS}
+        self.watermark = None
+
+    def set_job(self, job_id, is_open, location, company_id):
+        old = self.jobs.pop(job_id, None)
+        if old is not None:
+            self.terms['location'].remove(old[0])
+            self.company_jobs[old[1]] -= 1
+            self.terms['company'].remove(self.companies.get(old[1]))
+        if is_open:
+            self.jobs[job_id] = (location, company_id)
+            self.terms['location'].add(location)
+            self.company_jobs[company_id] += 1
+            self.terms['company'].add(self.companies.get(company_id))
+
+    def set_company(self, company_id, name):
+        old = self.companies.get(company_id)
+        if old == name:
+            return
+        count = self.company_jobs[company_id]
+        if old is not None and count:
+            self.terms['company'].remove(old, count)
+        if name is None:
+            self.companies.pop(company_id, None)
+        else:
+            self.companies[company_id] = name
+            if count:
+                self.terms['company'].add(name, count)
+
+    def apply(self, jobs, companies):
+        for company_id, name in companies.items():
+            self.set_company(company_id, name)
+        for job_id, row in jobs.items():
+            if row is None:
+                self.set_job(job_id, False, None, None)
+            else:
+                self.set_job(job_id, *row)
+
+    def advance(self, *stamps):
+        stamps = [stamp for stamp in stamps if stamp is not None]
+        if self.watermark is not None:
+            stamps.append(self.watermark)
+        if stamps:
+            self.watermark = max(stamps)
+
+
+class SuggestIndex:
+    """Index prefix in-memory untuk lokasi dan nama perusahaan dari lowongan terbuka.
+
+    Perubahan yang di-commit di proses ini diterapkan langsung (event session).
+    Perubahan dari worker lain diambil secara bertahap lewat updated_at setiap
+    SUGGEST_SYNC_SECONDS, dan index dibangun ulang penuh setiap
+    SUGGEST_REBUILD_SECONDS (menangkap lowongan yang dihapus di worker lain).
+    Keduanya berjalan di thread latar (ensure_fresh); rebuild mengisi snapshot
+    baru tanpa lock lalu menukarnya, jadi search() tidak pernah menunggu database.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._refresh = BackgroundRefresh('suggest-index')
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.snapshot = SuggestSnapshot()
+            # Perubahan yang masuk selama rebuild, diterapkan ulang ke snapshot baru sebelum ditukar
+            self._pending = None
+            self.built_at = None
+            self.synced_at = None
+
+    def _apply(self, jobs, companies):
+        # Dipanggil dengan lock dipegang
+        if self.built_at is not None:
+            self.snapshot.apply(jobs, companies)
+        if self._pending is not None:
+            self._pending.append((jobs, companies))
+
+    # --- sinkronisasi dengan database ---
+
+    def rebuild(self):
+        with self._lock:
+            self._pending = []
+        try:
+            companies = db.session.execute(select(Company.id, Company.company_name, Company.updated_at)).all()
+            jobs = db.session.execute(
+                select(JobListing.id, JobListing.location, JobListing.id_company, JobListing.updated_at)
+                .where(JobListing.is_open.is_(True))
+            ).all()
+            latest_job = db.session.scalar(select(func.max(JobListing.updated_at)))
+            snapshot = SuggestSnapshot()
+            for company_id, name, _ in companies:
+                snapshot.companies[company_id] = name
+            for job_id, location, company_id, _ in jobs:
+                snapshot.set_job(job_id, True, location, company_id)
+            snapshot.advance(latest_job, *(row[2] for row in companies))
+            with self._lock:
+                for changes in self._pending:
+                    snapshot.apply(*changes)
+                self.snapshot = snapshot
+                self.built_at = self.synced_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def sync(self):
+        """Menerapkan baris yang berubah sejak watermark (>= supaya perubahan di detik yang sama ikut)."""
+        watermark = self.snapshot.watermark
+        if self.built_at is None or watermark is None:
+            return self.rebuild()
+        companies = db.session.execute(
+            select(Company.id, Company.company_name, Company.updated_at).where(Company.updated_at >= watermark)
+        ).all()
+        jobs = db.session.execute(
+            select(JobListing.id, JobListing.is_open, JobListing.location, JobListing.id_company, JobListing.updated_at)
+            .where(JobListing.updated_at >= watermark)
+        ).all()
+        with self._lock:
+            self._apply({row[0]: tuple(row[1:4]) for row in jobs}, {row[0]: row[1] for row in companies})
+            self.snapshot.advance(*(row[2] for row in companies), *(row[4] for row in jobs))
+            self.synced_at = time.monotonic()
+
+    def ensure_fresh(self, sync_seconds, rebuild_seconds):
+        """Menjadwalkan rebuild/sync di thread latar jika sudah waktunya; tidak menunggu hasilnya.
+
+        Sebelum rebuild pertama selesai search() mengembalikan list kosong.
+        """
+        now = time.monotonic()
+        if self.built_at is None or now - self.built_at > rebuild_seconds:
+            self._refresh.start(self.rebuild)
+        elif now - self.synced_at > sync_seconds:
+            self._refresh.start(self.sync)
+
+    def wait(self, timeout=None):
+        self._refresh.wait(timeout)
+
+    def apply_local(self, jobs, companies):
+        """Perubahan yang baru di-commit di proses ini (dari event session)."""
+        with self._lock:
+            self._apply(jobs, companies)
+
+    def search(self, field, prefix, limit):
+        with self._lock:
+            return [{'value': value, 'count': -negative}
+                    for negative, value in self.snapshot.terms[field].search(prefix, limit)]
+
+
+suggest_index = SuggestIndex()
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_suggest_changes(session, flush_context):
+    changes = session.info.setdefault('suggest_changes', ({}, {}))
+    jobs, companies = changes
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, JobListing):
+            jobs[obj.id] = (bool(obj.is_open), obj.location, obj.id_company)
+        elif isinstance(obj, Company):
+            companies[obj.id] = obj.company_name
+    for obj in session.deleted:
+        if isinstance(obj, JobListing):
+            jobs[obj.id] = None
+        elif isinstance(obj, Company):
+            companies[obj.id] = None
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_suggest_changes(session):
+    changes = session.info.pop('suggest_changes', None)
+    if changes and (changes[0] or changes[1]):
+        suggest_index.apply_local(*changes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_suggest_changes(session):
+    session.info.pop('suggest_changes', None)
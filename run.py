@@ -1,10 +1,15 @@
-from nemukerja import create_app, db
+from nemukerja import create_app
+from nemukerja.extensions import db
+from nemukerja.search import init_search_index
 import os
 
 app = create_app()
 
 with app.app_context():
     db.create_all()
+    # Database lama yang dibuat sebelum ada indeks full-text
+    with db.engine.begin() as conn:
+        init_search_index(conn)
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 10000))
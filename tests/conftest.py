@@ -0,0 +1,155 @@
+import shutil
+
+import pytest
+
+from nemukerja import create_app
+from nemukerja.config import Config
+from nemukerja.extensions import db
+from nemukerja.models import User, Applicant, Company, JobListing
+from nemukerja.passwords import hasher
+
+PASSWORD = 'secret123'
+
+# Cache per worker dimatikan supaya id yang sama di database test berikutnya tidak membaca data lama
+TEST_CONFIG = {
+    'TESTING': True,
+    'WTF_CSRF_ENABLED': False,
+    'REMEMBER_COOKIE_SECURE': False,
+    'QUERY_BUDGET_MODE': 'raise',
+    'PASSWORD_HASH_ROUNDS': 4,
+    'PASSWORD_HASH_WORKERS': 2,
+    'PAGE_CACHE_BACKEND': 'off',
+    'IDENTITY_CACHE_TTL': 0,
+    'MAIL_SUPPRESS_SEND': True,
+}
+
+
+def make_app(monkeypatch, database_path, **config):
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{database_path}')
+    for key, value in {**TEST_CONFIG, **config}.items():
+        monkeypatch.setattr(Config, key, value, raising=False)
+    return create_app()
+
+
+def clear_caches():
+    """Mengosongkan cache per worker (bukan index in-memory)."""
+    from nemukerja.app import _admin_stats_cache
+    from nemukerja.facets import _base_cache
+    from nemukerja.identity import _identity_cache
+    from nemukerja.pagination import _count_cache
+    from nemukerja.ranking import _fit_cache
+
+    for cache in (_admin_stats_cache, _base_cache, _identity_cache, _count_cache, _fit_cache):
+        cache.clear()
+
+
+def _clear_worker_state():
+    from nemukerja.recommend import recommend_index
+    from nemukerja.suggest import suggest_index
+
+    clear_caches()
+    for index in (suggest_index, recommend_index):
+        index.wait()
+        index.clear()
+
+
+@pytest.fixture(scope='session')
+def schema_db(tmp_path_factory):
+    """Skema lengkap (seperti run.py: create_all + indeks full-text); disalin untuk setiap test."""
+    path = tmp_path_factory.mktemp('template') / 'app.db'
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        app = make_app(monkeypatch, path)
+        with app.app_context():
+            db.create_all()
+            db.engine.dispose()
+    return path
+
+
+@pytest.fixture
+def database_path(tmp_path, schema_db):
+    path = tmp_path / 'app.db'
+    shutil.copyfile(schema_db, path)
+    return path
+
+
+@pytest.fixture
+def app_config():
+    """Override konfigurasi per test (fixture ini bisa ditimpa di modul test)."""
+    return {}
+
+
+@pytest.fixture
+def app(monkeypatch, database_path, app_config):
+    """Aplikasi di atas salinan database test.
+
+    App context tidak dibiarkan terbuka: request dari test client harus membuka
+    context (dan session) sendiri seperti di server, supaya jumlah query terhitung benar.
+    """
+    app = make_app(monkeypatch, database_path, **app_config)
+    _clear_worker_state()
+    yield app
+    _clear_worker_state()
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _saved(obj):
+    """Commit lalu melepas objek dari session; kolom yang sudah dimuat tetap bisa dibaca di test."""
+    db.session.add(obj)
+    db.session.commit()
+    db.session.refresh(obj)
+    db.session.expunge(obj)
+    return obj
+
+
+@pytest.fixture
+def make_company(app):
+    def make_company(name='Acme', email=None):
+        with app.app_context():
+            user = _saved(User(email=email or f'{name.lower().replace(" ", "")}@example.com',
+                               password=hasher.hash(PASSWORD), role='company'))
+            return _saved(Company(id_user=user.id, company_name=name, contact_email=user.email))
+    return make_company
+
+
+@pytest.fixture
+def make_admin(app):
+    def make_admin(email='admin@example.com'):
+        with app.app_context():
+            return _saved(User(email=email, password=hasher.hash(PASSWORD), role='admin'))
+    return make_admin
+
+
+@pytest.fixture
+def make_applicant(app):
+    def make_applicant(name='Ann', email=None, skills='python, flask, sql'):
+        with app.app_context():
+            user = _saved(User(email=email or f'{name.lower().replace(" ", "")}@example.com',
+                               password=hasher.hash(PASSWORD), role='applicant'))
+            return _saved(Applicant(id_user=user.id, full_name=name, skills=skills))
+    return make_applicant
+
+
+@pytest.fixture
+def make_job(app):
+    def make_job(company, title='Python Developer', **fields):
+        values = {'description': 'Build and maintain web applications', 'qualifications': 'python flask',
+                  'location': 'Batam', 'slots': 2, 'salary_min': 1000, 'salary_max': 2000, 'is_open': True}
+        values.update(fields)
+        with app.app_context():
+            return _saved(JobListing(id_company=company.id, title=title, **values))
+    return make_job
+
+
+@pytest.fixture
+def login(client):
+    def login(email, password=PASSWORD):
+        response = client.post('/login', data={'email': email, 'password': password})
+        assert response.status_code == 302, response.get_data(as_text=True)
+        return response
+    return login
@@ -0,0 +1,26 @@
+from sqlalchemy import func
+
+from nemukerja import bench, counters
+from nemukerja.extensions import db
+from nemukerja.models import Application, JobListing
+
+
+def test_concurrent_reservations_never_exceed_slots(app, database_path):
+    # Banyak thread (koneksi sendiri-sendiri) memesan slot di file SQLite yang sama dengan aplikasi
+    stats = bench.stress_reservations(threads=16, applicants=120, slots=25, path=str(database_path))
+    assert stats['reserved'] == stats['rows'] == stats['counter_used'] == 25
+
+    with app.app_context():
+        job = db.session.get(JobListing, 1)
+        by_status = dict(db.session.query(Application.status, func.count(Application.id))
+                         .filter(Application.id_job == job.id).group_by(Application.status).all())
+        assert by_status.get('accepted', 0) + by_status.get('pending', 0) == job.slots
+        assert counters.used_slots(job) == job.slots
+        assert counters.reconcile_counters() == []
+
+
+def test_stress_apply_command(app):
+    result = app.test_cli_runner().invoke(args=['stress-apply', '--threads', '8', '--applicants', '40',
+                                                '--slots', '10'])
+    assert result.exit_code == 0, result.output
+    assert 'Sukses' in result.output
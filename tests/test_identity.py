@@ -0,0 +1,96 @@
+import re
+
+import pytest
+
+from nemukerja.extensions import db
+from nemukerja.identity import _identity_cache
+from nemukerja.models import User, Applicant
+from nemukerja.query_budget import QueryCounter
+
+
+@pytest.fixture
+def app_config():
+    # conftest mematikan cache identitas; modul ini justru mengujinya
+    return {'IDENTITY_CACHE_TTL': 300}
+
+
+def identity_selects(counter):
+    """SELECT ke tabel pengguna/profil (yang seharusnya dilayani cache)."""
+    return [sql for sql in counter.statements
+            if sql.lstrip().upper().startswith('SELECT') and re.search(r'\bFROM (users|applicants|companies)\b', sql)]
+
+
+def get(client, url):
+    with QueryCounter() as counter:
+        response = client.get(url)
+    return response, identity_selects(counter)
+
+
+def test_cache_hit_issues_no_identity_select(client, login, make_applicant):
+    applicant = make_applicant()
+    login('ann@example.com')
+
+    response, selects = get(client, '/profile')
+    assert response.status_code == 200
+    assert len(selects) == 1  # cache kosong: satu query user + profil
+    assert _identity_cache.get(applicant.id_user) is not None
+
+    response, selects = get(client, '/profile')
+    assert response.status_code == 200
+    assert b'Ann' in response.data
+    assert selects == []
+
+
+def test_profile_edit_is_saved_and_invalidates_cache(app, client, login, make_applicant):
+    applicant = make_applicant()
+    login('ann@example.com')
+    client.get('/profile')
+
+    # current_user berasal dari snapshot cache yang di-merge ke session request
+    response = client.post('/profile/edit', data={'full_name': 'Ann Baru', 'phone': '0812',
+                                                  'skills': 'golang, kubernetes'})
+    assert response.status_code == 302
+    assert _identity_cache.get(applicant.id_user) is None
+
+    with app.app_context():
+        profile = db.session.get(Applicant, applicant.id)
+        assert (profile.full_name, profile.phone, profile.skills) == ('Ann Baru', '0812', 'golang, kubernetes')
+
+    response, selects = get(client, '/profile')
+    assert b'Ann Baru' in response.data and b'golang, kubernetes' in response.data
+    assert len(selects) == 1
+    response, selects = get(client, '/profile')
+    assert b'Ann Baru' in response.data
+    assert selects == []
+
+
+def test_role_change_invalidates_cache(app, client, login, make_applicant):
+    applicant = make_applicant()
+    login('ann@example.com')
+    assert client.get('/profile').status_code == 200
+    assert _identity_cache.get(applicant.id_user) is not None
+
+    # Perubahan dari proses/session lain di worker ini (mis. skrip admin)
+    with app.app_context():
+        db.session.get(User, applicant.id_user).role = 'admin'
+        db.session.commit()
+    assert _identity_cache.get(applicant.id_user) is None
+
+    response = client.get('/profile')
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/dashboard')
+
+
+def test_rolled_back_change_keeps_cache(app, client, login, make_applicant):
+    applicant = make_applicant()
+    login('ann@example.com')
+    client.get('/profile')
+
+    with app.app_context():
+        db.session.get(Applicant, applicant.id).full_name = 'Tidak Jadi'
+        db.session.flush()
+        db.session.rollback()
+    assert _identity_cache.get(applicant.id_user) is not None
+    response, selects = get(client, '/profile')
+    assert b'Tidak Jadi' not in response.data
+    assert selects == []
@@ -0,0 +1,60 @@
+from sqlalchemy import update
+
+from nemukerja.app import JOB_SORT_KEYS
+from nemukerja.extensions import db
+from nemukerja.models import JobListing, Application, Notification
+
+
+def query_plan(statement):
+    """Baris detail EXPLAIN QUERY PLAN SQLite untuk satu statement/Query SQLAlchemy."""
+    statement = getattr(statement, 'statement', statement)
+    sql = str(statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    return [row[-1] for row in db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}'))]
+
+
+def assert_uses_index(plan, table, index):
+    steps = [step for step in plan if f' {table} ' in f'{step} ']
+    assert steps, plan
+    assert all(index in step and not step.startswith('SCAN') for step in steps), plan
+
+
+def test_open_job_listing_uses_is_open_posted_at(app):
+    with app.app_context():
+        plan = query_plan(JobListing.query.filter_by(is_open=True)
+                          .order_by(*[getattr(expr, direction)() for expr, direction in JOB_SORT_KEYS])
+                          .limit(20))
+    assert_uses_index(plan, 'job_listings', 'ix_job_listings_is_open_posted_at')
+
+
+def test_company_applications_use_job_indexes(app):
+    with app.app_context():
+        plan = query_plan(db.session.query(Application).join(JobListing)
+                          .filter(JobListing.id_company == 1))
+        # Per lowongan perusahaan, lamarannya dicari lewat (id_job, status)
+        assert_uses_index(plan, 'job_listings', 'ix_job_listings_id_company_posted_at')
+        assert_uses_index(plan, 'applications', 'ix_applications_id_job_status')
+
+        plan = query_plan(Application.query.filter_by(id_job=1, status='pending'))
+    assert_uses_index(plan, 'applications', 'ix_applications_id_job_status')
+
+
+def test_notifications_use_user_index(app):
+    with app.app_context():
+        plan = query_plan(Notification.query.filter_by(id_user=1)
+                          .order_by(Notification.created_at.desc(), Notification.id.desc()).limit(10))
+        assert_uses_index(plan, 'notifications', 'ix_notifications_id_user_is_read_created_at')
+
+        # mark_all_read()
+        plan = query_plan(update(Notification).where(Notification.id_user == 1, Notification.is_read.is_(False))
+                          .values(is_read=True))
+    assert_uses_index(plan, 'notifications', 'ix_notifications_id_user_is_read_created_at')
+
+
+def test_duplicate_application_check_uses_unique_index(app):
+    with app.app_context():
+        plan = query_plan(Application.query.filter_by(id_applicant=1, id_job=1).limit(1))
+    # UNIQUE (id_applicant, id_job); SQLite menamai indeks constraint sebagai sqlite_autoindex_*
+    steps = [step for step in plan if ' applications ' in f'{step} ']
+    assert steps and all(step.startswith('SEARCH') and 'INDEX' in step for step in steps), plan
+    assert any('uq_applications_applicant_job' in step or 'sqlite_autoindex_applications' in step
+               for step in steps), plan
@@ -0,0 +1,109 @@
+import json
+import socket
+from datetime import timedelta
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from nemukerja import mail_queue
+from nemukerja.extensions import db
+from nemukerja.mail_queue import MailWorker
+from nemukerja.models import OutboundMail
+
+
+class RecordingHandler:
+    """Server SMTP lokal: 'busy@' dijawab 451 (sementara), 'gone@' dijawab 550 (permanen)."""
+
+    def __init__(self):
+        self.sessions = set()
+        self.delivered = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        local = address.split('@')[0]
+        if local == 'busy':
+            return '451 4.3.0 Mailbox busy, try again later'
+        if local == 'gone':
+            return '550 5.1.1 No such user'
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        # Setiap koneksi SMTP datang dari port klien yang berbeda
+        self.sessions.add(session.peer)
+        self.delivered.extend(envelope.rcpt_tos)
+        return '250 Message accepted'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname='127.0.0.1', port=free_port())
+    controller.start()
+    yield controller
+    controller.stop()
+
+
+@pytest.fixture
+def app_config(smtp_server):
+    return {'MAIL_SERVER': '127.0.0.1', 'MAIL_PORT': smtp_server.port, 'MAIL_USE_TLS': False,
+            'MAIL_USE_SSL': False, 'MAIL_USERNAME': None, 'MAIL_PASSWORD': None,
+            'MAIL_SUPPRESS_SEND': False, 'MAIL_DEFAULT_SENDER': 'noreply@example.com',
+            'MAIL_QUEUE_BASE_DELAY': 30, 'MAIL_QUEUE_MAX_DELAY': 3600, 'MAIL_QUEUE_MAX_ATTEMPTS': 8}
+
+
+def enqueue_all(addresses):
+    for address in addresses:
+        mail_queue.enqueue('Halo', [address], 'Isi email')
+    db.session.commit()
+
+
+def statuses():
+    return {json.loads(row.recipients)[0]: row for row in db.session.scalars(db.select(OutboundMail))}
+
+
+def test_batch_is_sent_over_one_session(app, smtp_server):
+    addresses = [f'user{i}@example.com' for i in range(5)]
+    with app.app_context():
+        enqueue_all(addresses)
+        stats = MailWorker().run(batch_size=10, poll_interval=0, once=True)
+        assert stats == {'sent': 5, 'retry': 0, 'failed': 0}
+        assert {address: row.status for address, row in statuses().items()} == dict.fromkeys(addresses, 'sent')
+    assert smtp_server.handler.delivered == addresses
+    assert len(smtp_server.handler.sessions) == 1
+
+
+def test_temporary_rejection_is_retried_with_backoff(app, smtp_server):
+    with app.app_context():
+        enqueue_all(['busy@example.com', 'ok@example.com'])
+        before = mail_queue.utcnow()
+        stats = MailWorker().run(batch_size=10, poll_interval=0, once=True)
+        assert stats == {'sent': 1, 'retry': 1, 'failed': 0}
+
+        rows = statuses()
+        busy = rows['busy@example.com']
+        assert (busy.status, busy.attempts) == ('pending', 1)
+        assert '451' in busy.last_error
+        # Percobaan pertama: jeda acak antara BASE_DELAY/2 dan BASE_DELAY
+        assert before + timedelta(seconds=15) <= busy.next_attempt_at <= mail_queue.utcnow() + timedelta(seconds=30)
+        assert rows['ok@example.com'].status == 'sent'
+
+        # Belum waktunya: batch berikutnya tidak mengambilnya lagi
+        assert MailWorker().process_batch(10) == 0
+    assert smtp_server.handler.delivered == ['ok@example.com']
+
+
+def test_permanent_rejection_fails(app, smtp_server):
+    with app.app_context():
+        enqueue_all(['gone@example.com'])
+        stats = MailWorker().run(batch_size=10, poll_interval=0, once=True)
+        assert stats == {'sent': 0, 'retry': 0, 'failed': 1}
+        gone = statuses()['gone@example.com']
+        assert (gone.status, gone.attempts) == ('failed', 1)
+        assert '550' in gone.last_error
+    assert smtp_server.handler.delivered == []
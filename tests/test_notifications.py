@@ -0,0 +1,44 @@
+import pytest
+
+from nemukerja import notifications
+
+
+@pytest.fixture
+def app_config():
+    return {'NOTIFICATION_MAX_STREAMS': 1, 'NOTIFICATION_STREAM_RETRY': 30,
+            'NOTIFICATION_STREAM_TIMEOUT': 1, 'NOTIFICATION_RECHECK_SECONDS': 1}
+
+
+def test_streams_above_limit_get_503_with_retry(client, login, make_applicant):
+    make_applicant()
+    login('ann@example.com')
+
+    stream = client.get('/notifications/stream')
+    assert stream.status_code == 200
+    chunks = iter(stream.response)
+    assert next(chunks) == b'retry: 5000\n\n'
+    assert notifications.open_stream_count() == 1
+
+    # Slot penuh: tidak menahan worker, browser disuruh polling lalu mencoba lagi nanti
+    refused = client.get('/notifications/stream')
+    assert refused.status_code == 503
+    assert refused.headers['Retry-After'] == '30'
+    assert refused.get_data(as_text=True) == 'retry: 30000\n\n'
+    assert notifications.open_stream_count() == 1
+
+    stream.close()
+    assert notifications.open_stream_count() == 0
+    again = client.get('/notifications/stream')
+    assert again.status_code == 200
+    again.close()
+    assert notifications.open_stream_count() == 0
+
+
+def test_stream_slot_released_when_stream_ends(client, login, make_applicant):
+    make_applicant()
+    login('ann@example.com')
+
+    # NOTIFICATION_STREAM_TIMEOUT=1: stream selesai sendiri; server WSGI lalu memanggil close()
+    with client.get('/notifications/stream') as stream:
+        assert stream.get_data(as_text=True).startswith('retry: 5000\n\n')
+    assert notifications.open_stream_count() == 0
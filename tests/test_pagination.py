@@ -0,0 +1,45 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from nemukerja.pagination import decode_cursor, encode_cursor
+
+
+def token(payload):
+    raw = payload if isinstance(payload, str) else json.dumps(payload)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+MALFORMED = [
+    token({'k': [[1], [2]], 'd': 'next'}),
+    token({'k': [{'x': 1}, 2], 'd': 'next'}),
+    token({'k': [{'dt': 1}, 2], 'd': 'next'}),
+    token({'k': [{'dt': '2024-01-01', 'x': 1}, 2], 'd': 'next'}),
+    token({'k': [{'dt': 'kemarin'}, 2], 'd': 'next'}),
+    token({'k': {'a': 1}, 'd': 'next'}),
+    token({'k': [1, 2], 'd': 'sideways'}),
+    token({'k': [1, 2]}),
+    token([1, 2]),
+    token('not json'),
+    '%%%',
+]
+
+
+def test_cursor_round_trip():
+    values = [True, datetime(2024, 5, 1, 8, 30), 42, 'Batam', 1.5, None]
+    assert decode_cursor(encode_cursor(values, 'prev')) == (values, 'prev')
+
+
+@pytest.mark.parametrize('cursor', MALFORMED)
+def test_malformed_cursor_is_rejected(cursor):
+    assert decode_cursor(cursor) is None
+
+
+@pytest.mark.parametrize('cursor', MALFORMED)
+def test_malformed_cursor_shows_first_page(client, make_company, make_job, cursor):
+    make_job(make_company())
+    response = client.get('/', query_string={'cursor': cursor})
+    assert response.status_code == 200
+    assert b'Python Developer' in response.data
@@ -0,0 +1,42 @@
+import threading
+import time
+
+import pytest
+
+from nemukerja.extensions import bcrypt
+from nemukerja.passwords import HashingBusy, hasher
+
+
+def test_timeout_is_reported_as_busy(app, monkeypatch):
+    monkeypatch.setattr(hasher, 'timeout', 0.05)
+    with pytest.raises(HashingBusy):
+        hasher._run(time.sleep, 0.5)
+
+
+def test_login_answers_503_when_hashing_times_out(app, client, monkeypatch, make_applicant):
+    make_applicant()
+    check_password_hash = bcrypt.check_password_hash
+
+    def slow_check(pw_hash, password):
+        time.sleep(0.5)
+        return check_password_hash(pw_hash, password)
+
+    monkeypatch.setattr(hasher, 'timeout', 0.05)
+    monkeypatch.setattr(bcrypt, 'check_password_hash', slow_check)
+    response = client.post('/login', data={'email': 'ann@example.com', 'password': 'secret123'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After']
+
+
+def test_unknown_email_does_not_hash_on_request_thread(app, client, monkeypatch):
+    request_thread = threading.current_thread()
+    generate_password_hash = bcrypt.generate_password_hash
+
+    def generate_off_request_thread(*args):
+        assert threading.current_thread() is not request_thread
+        return generate_password_hash(*args)
+
+    monkeypatch.setattr(bcrypt, 'generate_password_hash', generate_off_request_thread)
+    response = client.post('/login', data={'email': 'nobody@example.com', 'password': 'whatever1'})
+    assert response.status_code == 200
+    assert hasher.check(None, 'whatever1') is False
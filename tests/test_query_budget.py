@@ -0,0 +1,105 @@
+import pytest
+
+from nemukerja.extensions import db
+from nemukerja.models import User, Applicant, Company, JobListing, Application, Notification
+from nemukerja.query_budget import QueryCounter
+from nemukerja.recommend import recommend_index
+from nemukerja.suggest import suggest_index
+from tests.conftest import clear_caches
+
+STATUSES = ('pending', 'accepted', 'rejected')
+
+# (role yang login, method, url, data form) untuk setiap route ber-@query_budget
+ENDPOINTS = [
+    ('admin', 'GET', '/admin/users', None),
+    ('admin', 'GET', '/admin/companies', None),
+    ('admin', 'GET', '/admin/jobs', None),
+    ('admin', 'GET', '/export/jobs.csv', None),
+    ('admin', 'GET', '/export/applications.ndjson', None),
+    ('applicant', 'GET', '/my-applications', None),
+    ('applicant', 'GET', '/my-pending', None),
+    ('applicant', 'GET', '/my-accepted', None),
+    ('applicant', 'GET', '/dashboard', None),
+    ('applicant', 'GET', '/dashboard?q=python&location=batam', None),
+    ('applicant', 'GET', '/api/suggest?field=location&q=ba', None),
+    ('company', 'GET', '/dashboard', None),
+    ('company', 'GET', '/company/applications', None),
+    ('company', 'GET', '/company/applications?job_id={job_id}&sort=fit', None),
+    ('company', 'GET', '/export/applications.csv', None),
+    ('company', 'GET', '/export/jobs.ndjson', None),
+    ('company', 'POST', '/company/applications/status',
+     {'status': 'rejected', 'job_id': '{job_id}', 'scope': 'pending'}),
+]
+
+
+@pytest.fixture
+def app_config():
+    # Index dibangun sekali di test; sync/rebuild latar tidak boleh ikut terhitung
+    return {'SUGGEST_SYNC_SECONDS': 3600, 'SUGGEST_REBUILD_SECONDS': 3600,
+            'RECOMMEND_SYNC_SECONDS': 3600, 'RECOMMEND_REBUILD_SECONDS': 3600}
+
+
+def grow(app, company, applicant, job_id, n):
+    """Menambah n baris ke setiap tabel yang dibaca route di ENDPOINTS."""
+    with app.app_context():
+        offset = db.session.query(User).count()
+        users = [User(email=f'{role}{offset + i}@example.com', password='-', role=role)
+                 for i in range(n) for role in ('applicant', 'company')]
+        db.session.add_all(users)
+        db.session.flush()
+        others = [Applicant(id_user=user.id, full_name=f'Pelamar {user.id}', skills='python, sql')
+                  for user in users if user.role == 'applicant']
+        companies = [Company(id_user=user.id, company_name=f'Perusahaan {user.id}')
+                     for user in users if user.role == 'company']
+        db.session.add_all(others + companies)
+        db.session.flush()
+        own_jobs = [JobListing(id_company=company.id, title=f'Backend Developer {i}', description='-',
+                               qualifications='python sql', location='Batam', slots=5) for i in range(n)]
+        other_jobs = [JobListing(id_company=other.id, title=f'Python Engineer {other.id}', description='-',
+                                 qualifications='python flask', location='Bandung', slots=5) for other in companies]
+        db.session.add_all(own_jobs + other_jobs)
+        db.session.flush()
+        for i, other in enumerate(others):
+            db.session.add_all([
+                Application(id_applicant=other.id, id_job=job_id, status='pending', notes='python'),
+                Application(id_applicant=other.id, id_job=own_jobs[i].id, status=STATUSES[i % 3]),
+                Application(id_applicant=applicant.id, id_job=other_jobs[i].id, status=STATUSES[i % 3]),
+                Notification(id_user=applicant.id_user, title='-', message='-', type='application_status'),
+                Notification(id_user=company.id_user, title='-', message='-', type='application_received'),
+                Notification(audience='applicant', title='-', message='-', type='job_posted'),
+            ])
+        db.session.commit()
+
+
+def measure(client, method, url, data):
+    clear_caches()
+    with QueryCounter() as counter:
+        response = client.open(url, method=method, data=data)
+        # Export di-stream: query di dalam body ikut dihitung
+        response.get_data()
+    assert response.status_code in (200, 302), response.status_code
+    return counter.count
+
+
+@pytest.mark.parametrize('role, method, url, data', ENDPOINTS,
+                         ids=[f'{method} {url}' for _, method, url, _ in ENDPOINTS])
+def test_query_count_does_not_grow_with_rows(app, client, login, make_admin, make_company, make_applicant,
+                                             make_job, role, method, url, data):
+    make_admin()
+    company = make_company()
+    applicant = make_applicant()
+    job = make_job(company)
+    url = url.format(job_id=job.id)
+    data = {key: value.format(job_id=job.id) for key, value in data.items()} if data else None
+    login({'admin': 'admin@example.com', 'company': 'acme@example.com', 'applicant': 'ann@example.com'}[role])
+
+    grow(app, company, applicant, job.id, 3)
+    with app.app_context():
+        suggest_index.rebuild()
+        recommend_index.rebuild()
+    small = measure(client, method, url, data)
+
+    grow(app, company, applicant, job.id, 30)
+    large = measure(client, method, url, data)
+    # QUERY_BUDGET_MODE='raise': route yang melewati batasnya sudah gagal di measure()
+    assert small == large
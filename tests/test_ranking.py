@@ -0,0 +1,63 @@
+from datetime import datetime
+
+from sqlalchemy import update
+
+from nemukerja.extensions import db
+from nemukerja.models import Applicant, Application, JobListing
+from nemukerja.query_budget import QueryCounter
+from nemukerja.ranking import job_fit_scores
+
+PAST = datetime(2000, 1, 1)
+# Stempel yang belum lewat dari waktu database: seperti edit di detik yang sama dengan perhitungan skor
+CURRENT_SECOND = datetime(2999, 1, 1)
+
+
+def apply_to(job, applicant, notes=''):
+    application = Application(id_applicant=applicant.id, id_job=job.id, status='pending', notes=notes)
+    db.session.add(application)
+    db.session.commit()
+    return application.id
+
+
+def edit_skills(applicant_id, skills, stamp):
+    """Edit skill dengan updated_at ditentukan (Core UPDATE tidak menjalankan onupdate=func.now())."""
+    db.session.execute(update(Applicant).where(Applicant.id == applicant_id)
+                       .values(skills=skills, updated_at=stamp))
+    db.session.execute(update(Application).where(Application.id_applicant == applicant_id)
+                       .values(updated_at=stamp))
+    db.session.commit()
+
+
+def scores_for(job_id):
+    return job_fit_scores(db.session.get(JobListing, job_id))[0]
+
+
+def test_edit_in_same_second_as_rescore_is_detected(app, make_company, make_job, make_applicant):
+    job = make_job(make_company(), title='Python Flask', qualifications='python flask')
+    applicant = make_applicant(skills='java')
+    with app.app_context():
+        application_id = apply_to(job, applicant)
+        edit_skills(applicant.id, 'java', CURRENT_SECOND)
+        assert scores_for(job.id)[application_id] == 0
+
+        # Stempel (updated_at) sama persis dengan saat skor dihitung
+        edit_skills(applicant.id, 'python, flask', CURRENT_SECOND)
+        assert scores_for(job.id)[application_id] == 100
+
+
+def test_settled_stamps_use_cache(app, make_company, make_job, make_applicant):
+    job = make_job(make_company(), title='Python Flask', qualifications='python flask')
+    applicant = make_applicant(skills='python')
+    with app.app_context():
+        application_id = apply_to(job, applicant)
+        edit_skills(applicant.id, 'python', PAST)
+        first = scores_for(job.id)[application_id]
+        job = db.session.get(JobListing, job.id)
+
+        with QueryCounter() as counter:
+            assert job_fit_scores(job)[0][application_id] == first
+        # Hanya query agregat (fingerprint); stempel per lamaran tidak dibaca ulang
+        assert counter.count == 1
+
+        edit_skills(applicant.id, 'python, flask', datetime(2000, 1, 2))
+        assert scores_for(job.id)[application_id] == 100
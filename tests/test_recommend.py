@@ -0,0 +1,183 @@
+import math
+import threading
+
+import pytest
+from sqlalchemy import delete
+
+from nemukerja.extensions import db
+from nemukerja.models import Applicant, JobListing
+from nemukerja.recommend import (BM25_K1, BM25_B, JobCorpus, RecommendIndex, recommend_index,
+                                 recommended_jobs)
+
+
+def expected_score(tf, length, average, df, total):
+    idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+    return idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average))
+
+
+def test_length_norm_uses_average_of_whole_corpus(app, make_company, make_job):
+    company = make_company()
+    # Lowongan pertama pendek, sisanya panjang: rata-rata saat insert pertama jauh dari rata-rata akhir
+    short = make_job(company, title='Rust', qualifications='')
+    for i in range(4):
+        make_job(company, title=f'Engineer {i}', qualifications='rust ' + 'distributed systems kubernetes ' * 5)
+    with app.app_context():
+        recommend_index.rebuild()
+    corpus = recommend_index.corpus
+    average = corpus.average_length()
+    scores = dict(recommend_index.recommend({'rust'}, 10))
+    # Judul dihitung TITLE_WEIGHT (2) kali: tf=2, panjang dokumen 2
+    assert scores[short.id] == pytest.approx(expected_score(2, 2, average, 5, 5))
+
+    # Lowongan baru lewat sync/commit lokal tidak mengubah bobot yang lama; skor memakai rata-rata terbaru
+    make_job(company, title='Rust Rust Rust', qualifications='')
+    average = corpus.average_length()
+    scores = dict(recommend_index.recommend({'rust'}, 10))
+    assert scores[short.id] == pytest.approx(expected_score(2, 2, average, 6, 6))
+
+
+def live_postings(corpus):
+    """{term: {id_job: tf}} tanpa posting dokumen yang sudah dihapus."""
+    return {term: {corpus.doc_job[doc]: tf for doc, tf in zip(postings.docs, postings.tfs)
+                   if corpus.doc_length[doc]}
+            for term, postings in corpus.postings.items() if postings.df}
+
+
+def test_insert_order_does_not_change_scores():
+    jobs = [(1, 'Python Developer', 'python django'), (2, 'Data Engineer', 'python spark sql ' * 4),
+            (3, 'Python', ''), (4, 'Nurse', 'care')]
+    loaded = JobCorpus()
+    for job in jobs:
+        loaded.add_job(*job, loading=True)
+    loaded.finish_loading()
+    incremental = JobCorpus()
+    for job in reversed(jobs):
+        incremental.add_job(*job)
+    assert live_postings(incremental) == live_postings(loaded)
+    assert incremental.average_length() == loaded.average_length()
+
+
+def test_updates_and_removals_keep_postings_exact(monkeypatch):
+    # Daftar teratas kecil supaya jalur top/refill ikut teruji
+    monkeypatch.setattr('nemukerja.recommend.TOP_POSTINGS', 4)
+    monkeypatch.setattr('nemukerja.recommend.EXACT_POSTINGS', 3)
+    jobs = {job_id: (True, f'Python Developer {job_id}', 'python sql ' * (job_id % 4 + 1)) for job_id in range(1, 21)}
+    corpus = JobCorpus()
+    for job_id, (_, title, qualifications) in jobs.items():
+        corpus.add_job(job_id, title, qualifications, loading=True)
+    corpus.finish_loading()
+
+    changes = {job_id: None for job_id in range(1, 13)}
+    changes.update({13: (False, 'Closed', ''), 14: (True, 'Nurse', 'care'), 21: (True, 'Python', 'python')})
+    corpus.apply(changes)
+    fresh = JobCorpus()
+    for job_id, row in {**jobs, **changes}.items():
+        if row is not None and row[0]:
+            fresh.add_job(job_id, row[1], row[2])
+    assert live_postings(corpus) == live_postings(fresh)
+    assert corpus.postings['python'].df == fresh.postings['python'].df == 7
+    assert corpus.average_length() == fresh.average_length()
+    # Kandidat term umum tidak pernah berisi dokumen yang sudah dihapus
+    assert all(corpus.doc_length[doc] for doc in corpus.postings['python'].candidates(corpus.doc_length))
+
+    # Jalur tepat (semua posting dijumlahkan): hasilnya harus sama dengan korpus yang dibangun dari nol
+    monkeypatch.setattr('nemukerja.recommend.EXACT_POSTINGS', 100)
+    index = RecommendIndex()
+    index.corpus, index.built_at = corpus, 0
+    rebuilt = RecommendIndex()
+    rebuilt.corpus, rebuilt.built_at = fresh, 0
+    assert index.recommend({'python', 'sql'}, 5, exclude=[15]) == rebuilt.recommend({'python', 'sql'}, 5, exclude=[15])
+
+
+def test_rebuild_does_not_block_queries(app, monkeypatch, make_company, make_job):
+    company = make_company()
+    make_job(company, title='Python Developer')
+    with app.app_context():
+        recommend_index.rebuild()
+    add_job = JobCorpus.add_job
+    answered = []
+
+    def add_job_while_querying(corpus, *args, **kwargs):
+        # Di tengah rebuild (setelah membaca database) query lain harus tetap dijawab dari korpus lama
+        monkeypatch.setattr(JobCorpus, 'add_job', add_job)
+        reader = threading.Thread(target=lambda: answered.append(recommend_index.recommend({'python'}, 5)))
+        reader.start()
+        reader.join(timeout=5)
+        return add_job(corpus, *args, **kwargs)
+
+    monkeypatch.setattr(JobCorpus, 'add_job', add_job_while_querying)
+    with app.app_context():
+        recommend_index.rebuild()
+    assert len(answered) == 1 and len(answered[0]) == 1
+
+
+def test_dashboard_does_not_wait_for_rebuild(app, client, monkeypatch, make_company, make_applicant, make_job,
+                                             login):
+    company = make_company()
+    job = make_job(company, title='Flask Developer', qualifications='python flask sql')
+    make_applicant(skills='python, flask')
+    login('ann@example.com')
+    rebuild = RecommendIndex.rebuild
+    released = threading.Event()
+
+    def slow_rebuild(index):
+        assert released.wait(timeout=5)
+        return rebuild(index)
+
+    # Worker baru: dashboard tampil tanpa rekomendasi selama index dibangun di thread latar
+    monkeypatch.setattr(RecommendIndex, 'rebuild', slow_rebuild)
+    response = client.get('/dashboard')
+    assert response.status_code == 200
+    assert b'dashboard_user_recommended_en' not in response.data
+
+    released.set()
+    recommend_index.wait()
+    assert [job_id for job_id, _ in recommend_index.recommend({'python', 'flask'}, 5)] == [job.id]
+    response = client.get('/dashboard')
+    assert b'dashboard_user_recommended_en' in response.data
+
+
+def test_bench_recommend_command(app):
+    result = app.test_cli_runner().invoke(args=['bench-recommend', '--jobs', '3000', '--queries', '20'])
+    assert result.exit_code == 0, result.output
+    assert 'recall 1.00' in result.output
+
+
+def test_periodic_rebuild_only_when_needed(app, monkeypatch, make_company, make_job):
+    company = make_company()
+    jobs = [make_job(company, title=f'Python Developer {i}') for i in range(10)]
+    with app.app_context():
+        recommend_index.rebuild()
+    started = []
+    monkeypatch.setattr(recommend_index._refresh, 'start', lambda work: started.append(work.__name__))
+
+    # Rebuild sudah "jatuh tempo", tapi korpus masih rapat: cukup sync
+    recommend_index.ensure_fresh(sync_seconds=0, rebuild_seconds=0)
+    assert started == ['sync']
+
+    with app.app_context():
+        for job in jobs[:3]:
+            db.session.get(JobListing, job.id).qualifications = 'python django rest'
+        db.session.commit()
+    assert recommend_index.corpus.needs_rebuild()
+    recommend_index.ensure_fresh(sync_seconds=0, rebuild_seconds=0)
+    assert started == ['sync', 'rebuild']
+
+
+def test_job_deleted_by_another_worker_is_dropped(app, make_company, make_job, make_applicant):
+    company = make_company()
+    kept = make_job(company, title='Flask Developer', qualifications='python flask')
+    deleted = make_job(company, title='Python Flask Engineer', qualifications='python flask')
+    applicant = make_applicant(skills='python, flask')
+    with app.app_context():
+        recommend_index.rebuild()
+        # DELETE lewat Core: tidak melewati event session proses ini, seperti worker lain
+        db.session.execute(delete(JobListing).where(JobListing.id == deleted.id))
+        db.session.commit()
+        assert recommend_index.corpus.doc_of(deleted.id) >= 0
+
+        app.config['RECOMMEND_SYNC_SECONDS'] = app.config['RECOMMEND_REBUILD_SECONDS'] = 3600
+        profile = db.session.get(Applicant, applicant.id)
+        assert [job.id for job, _ in recommended_jobs(profile, 5)] == [kept.id]
+    assert recommend_index.corpus.doc_of(deleted.id) == -1
+    assert [job_id for job_id, _ in recommend_index.recommend({'python', 'flask'}, 5)] == [kept.id]
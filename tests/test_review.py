@@ -0,0 +1,89 @@
+from nemukerja.bench import benchmark_bulk_status
+from nemukerja.counters import reconcile_counters, used_slots
+from nemukerja.extensions import db
+from nemukerja.models import User, Applicant, Application, JobListing
+from nemukerja.query_budget import QueryCounter
+from nemukerja.review import bulk_set_status
+
+
+def add_applications(job, statuses):
+    """Lamaran ke `job` dengan status berurutan; penghitung lowongan disesuaikan lewat reconcile_counters()."""
+    offset = db.session.query(User).count()
+    users = [User(email=f'bulk{offset + i}@example.com', password='-', role='applicant')
+             for i in range(len(statuses))]
+    db.session.add_all(users)
+    db.session.flush()
+    applicants = [Applicant(id_user=user.id, full_name=f'Pelamar {user.id}') for user in users]
+    db.session.add_all(applicants)
+    db.session.flush()
+    applications = [Application(id_applicant=applicant.id, id_job=job.id, status=status)
+                    for applicant, status in zip(applicants, statuses)]
+    db.session.add_all(applications)
+    db.session.flush()
+    reconcile_counters()
+    db.session.commit()
+    return [application.id for application in applications]
+
+
+def status_counts(job_id):
+    return dict(db.session.query(Application.status, db.func.count(Application.id))
+                .filter(Application.id_job == job_id).group_by(Application.status).all())
+
+
+def test_bulk_accept_does_not_exceed_slots(app, make_company, make_job):
+    company = make_company()
+    job = make_job(company, slots=5)
+    with app.app_context():
+        ids = add_applications(job, ['pending'] * 3 + ['rejected'] * 4)
+        changed, skipped = bulk_set_status(company.id, 'accepted', application_ids=ids)
+        db.session.commit()
+
+        # 3 pending sudah memegang slot; dari 4 yang ditolak hanya 2 yang muat
+        assert changed == 5
+        assert skipped == ids[5:]
+        assert status_counts(job.id) == {'accepted': 5, 'rejected': 2}
+        assert used_slots(db.session.get(JobListing, job.id)) == 5
+        assert reconcile_counters() == []
+
+        # Kuota penuh: tidak ada lagi yang bisa diterima
+        changed, skipped = bulk_set_status(company.id, 'accepted', application_ids=ids)
+        db.session.commit()
+        assert (changed, skipped) == (0, ids[5:])
+        assert reconcile_counters() == []
+
+
+def test_bulk_reject_then_accept_keeps_counters(app, make_company, make_job):
+    company = make_company()
+    job = make_job(company, slots=10)
+    with app.app_context():
+        ids = add_applications(job, ['pending'] * 6 + ['accepted'] * 2)
+        assert bulk_set_status(company.id, 'rejected', job_id=job.id, from_status='pending') == (6, [])
+        db.session.commit()
+        assert bulk_set_status(company.id, 'accepted', application_ids=ids[:4]) == (4, [])
+        db.session.commit()
+        assert status_counts(job.id) == {'accepted': 6, 'rejected': 2}
+        assert reconcile_counters() == []
+
+
+def test_statement_count_does_not_grow_with_applications(app, make_company, make_job):
+    company = make_company()
+    counts = []
+    for size in (5, 60):
+        job = make_job(company, title=f'Job {size}', slots=size)
+        with app.app_context():
+            statuses = ['pending', 'rejected'] * (size // 2)
+            ids = add_applications(job, statuses)
+            with QueryCounter() as counter:
+                changed, skipped = bulk_set_status(company.id, 'accepted', application_ids=ids)
+                db.session.commit()
+            assert (changed, skipped) == (len(ids), [])
+            assert reconcile_counters() == []
+        counts.append(counter.count)
+    assert counts[0] == counts[1]
+
+
+def test_benchmark_bulk_status_paths_agree(tmp_path):
+    stats = benchmark_bulk_status(applications=20, path=str(tmp_path / 'bench.db'))
+    assert stats['bulk']['changed'] == 20
+    for path in ('per_row', 'bulk'):
+        assert (stats[path]['counter_rejected'], stats[path]['notifications']) == (20, 20)
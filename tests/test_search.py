@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from nemukerja.app import build_job_query
+from nemukerja.bench import benchmark_search
+from nemukerja.extensions import db
+from nemukerja.models import JobListing
+from nemukerja.query_budget import QueryCounter
+
+FILLER = 'python flask react marketing finance design data backend mobile cloud'.split()
+
+
+def seed_jobs(company, size):
+    """`size` lowongan tanpa kata 'kubernetes', ditambah satu yang cocok di judul dan satu di deskripsi."""
+    posted = datetime(2024, 1, 1)
+    jobs = [JobListing(id_company=company.id, title=f'{FILLER[i % 10]} {FILLER[(i * 3) % 10]}',
+                       description=' '.join(FILLER[(i + k) % 10] for k in range(30)),
+                       qualifications='sql', location='Batam', slots=1, posted_at=posted)
+            for i in range(size)]
+    # Kecocokan judul lebih lama: tanpa skor relevansi, posted_at DESC akan menaruhnya di bawah
+    title_match = JobListing(id_company=company.id, title='Kubernetes Engineer', description='Mengelola cluster',
+                             qualifications='linux', location='Batam', slots=1, posted_at=posted)
+    description_match = JobListing(id_company=company.id, title='Backend Developer',
+                                   description='Deploy layanan ke kubernetes setiap hari',
+                                   qualifications='linux', location='Batam', slots=1,
+                                   posted_at=posted + timedelta(days=1))
+    db.session.add_all(jobs + [title_match, description_match])
+    db.session.commit()
+    return title_match.id, description_match.id
+
+
+def search_ids(q):
+    query, sort_keys = build_job_query({'q': q})
+    return [job.id for job in query.order_by(*[getattr(expr, direction)() for expr, direction in sort_keys])]
+
+
+@pytest.mark.parametrize('size', [20, 2000])
+def test_keyword_search_uses_fts_and_ranks_title_first(app, make_company, size):
+    company = make_company()
+    with app.app_context():
+        title_match, description_match = seed_jobs(company, size)
+
+        with QueryCounter() as counter:
+            ids = search_ids('kubernetes')
+        # Jalur FTS5 (MATCH + bm25), bukan LIKE yang memindai seluruh tabel
+        assert counter.count == 1
+        assert 'job_listings_fts MATCH' in counter.statements[0]
+        assert 'LIKE' not in counter.statements[0]
+        assert ids == [title_match, description_match]
+
+        # Awalan kata tetap cocok ('kube' -> 'kubernetes')
+        assert search_ids('kube') == ids
+
+
+def test_benchmark_search_two_sizes(tmp_path):
+    rows = benchmark_search([300, 1200], needles=30, repeat=2, path=str(tmp_path / 'bench.db'))
+    assert [(row['size'], row['query']) for row in rows] == [
+        (size, q) for size in (300, 1200) for q in ('kubernetes', 'phlebotomist', 'geodesi')
+    ]
+    assert all(row['fts_ms'] >= 0 and row['like_ms'] >= 0 for row in rows)
+
+
+def test_bench_search_command(app):
+    result = app.test_cli_runner().invoke(args=['bench-search', '--sizes', '200,400', '--repeat', '1'])
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0].split() == ['rows', 'query', 'fts', '(ms)', 'like', '(ms)']
+    assert [line.split()[0] for line in lines[1:]] == ['200'] * 3 + ['400'] * 3
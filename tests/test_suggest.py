@@ -0,0 +1,47 @@
+import threading
+
+from nemukerja.suggest import SuggestIndex, SuggestSnapshot, suggest_index
+
+
+def test_cold_index_builds_in_background(app, client, monkeypatch, make_company, make_job):
+    company = make_company('Batam Digital')
+    make_job(company, location='Batam')
+    make_job(company, location='Bandung')
+    rebuild = SuggestIndex.rebuild
+    released = threading.Event()
+
+    def slow_rebuild(index):
+        assert released.wait(timeout=5)
+        return rebuild(index)
+
+    # Worker baru: request tidak menunggu rebuild, jawaban kosong dan tidak di-cache
+    monkeypatch.setattr(SuggestIndex, 'rebuild', slow_rebuild)
+    response = client.get('/api/suggest?field=location&q=ba')
+    assert response.status_code == 200
+    assert response.get_json() == []
+    assert int(response.headers['X-Query-Count']) <= 3
+    assert response.headers['Cache-Control'] == 'no-store'
+
+    released.set()
+    suggest_index.wait()
+    response = client.get('/api/suggest?field=location&q=ba')
+    assert [row['value'] for row in response.get_json()] == ['Bandung', 'Batam']
+    assert response.headers['X-Query-Count'] == '0'
+    assert 'public' in response.headers['Cache-Control']
+
+
+def test_commit_during_rebuild_is_not_lost(app, monkeypatch, make_company, make_job):
+    company = make_company('Acme')
+    make_job(company, location='Jakarta')
+    set_job = SuggestSnapshot.set_job
+
+    def set_job_with_concurrent_commit(snapshot, *args):
+        # Lowongan baru di-commit setelah rebuild membaca database, sebelum snapshot ditukar
+        monkeypatch.setattr(SuggestSnapshot, 'set_job', set_job)
+        make_job(company, location='Jayapura')
+        return set_job(snapshot, *args)
+
+    monkeypatch.setattr(SuggestSnapshot, 'set_job', set_job_with_concurrent_commit)
+    with app.app_context():
+        suggest_index.rebuild()
+    assert [row['value'] for row in suggest_index.search('location', 'ja', 10)] == ['Jakarta', 'Jayapura']